@@ -1,13 +1,25 @@
 from flask import Flask, jsonify
-from flask_migrate import Migrate
-from app.models import db, Department, Employee, Dependent  
+from app.models import db, ReplicaRouter, SlowQueryLogger, Department, Employee, Dependent, DepartmentStats
 from app.routes import routes_blueprint
+from app.routes.autocomplete import autocomplete_service
+from app.routes.employee import employee_repository, employee_service, department_id_cache
+from app.routes.jobs import job_service
+from app.repositories import GroupCommitWriter
+from app.cache import read_cache, invalidation_channel
+from app.commands import register_commands
+from app.middleware import AdmissionController, RequestProfiler, StructuredLogging
 from config import DevelopmentConfig, ProductionConfig, TestingConfig
-from flask_swagger import swagger
 from flask_cors import CORS, cross_origin
+import click
 import os
 
-def create_app():
+def _serves_requests():
+    """Indica se o processo atende requisições: servidor WSGI (fora do click) ou `flask run`."""
+    context = click.get_current_context(silent=True)
+    return context is None or context.info_name == 'run'
+
+
+def create_app(config_overrides=None):
     app = Flask(__name__)
     CORS(app)
 
@@ -19,18 +31,58 @@ def create_app():
         env_config = DevelopmentConfig
 
     app.config.from_object(env_config)
+    app.config.update(config_overrides or {})
+
+    ReplicaRouter.configure_binds(app)
     db.init_app(app)
+    ReplicaRouter(app, db)
+    SlowQueryLogger(app, db)
+    StructuredLogging(app)
+    AdmissionController(app, db)
+    RequestProfiler(app)
 
-    migrate = Migrate(app, db)
-    
     app.register_blueprint(routes_blueprint)
+    register_commands(app)
+
+    # O serviço é compartilhado pelas aplicações do processo: o writer da aplicação anterior é encerrado
+    if employee_service.group_writer is not None:
+        employee_service.group_writer.stop()
+        employee_service.group_writer = None
+    if app.config['GROUP_COMMIT_ENABLED']:
+        group_writer = GroupCommitWriter(app, employee_repository,
+                                         app.config['GROUP_COMMIT_MAX_ITEMS'], app.config['GROUP_COMMIT_MAX_WAIT_MS'],
+                                         app.config['GROUP_COMMIT_RESULT_TIMEOUT_SECONDS'])
+        group_writer.start()
+        employee_service.group_writer = group_writer
+
+    # Os IDs de departamentos são recarregados na primeira validação feita por esta aplicação
+    department_id_cache.invalidate()
+    read_cache.init_app(app)
+    invalidation_channel.init_app(app, db)
+    # Retoma as tarefas de fundo interrompidas e passa a executar as novas. Um comando `flask` de curta duração
+    # não assume tarefas: ao sair, o processo esperaria que todas terminassem
+    if _serves_requests():
+        job_service.init_app(app)
+    else:
+        job_service.shutdown()
+
+    # Índice de autocompletar montado na inicialização (ou na primeira busca, se o banco ainda não estiver pronto)
+    with app.app_context():
+        autocomplete_service.build()
+        db.session.remove()
 
     # Configuração do Swagger
     @app.route('/swagger')
     def swagger_api():
+        # Importados só quando a documentação é pedida
+        from flask_swagger import swagger
+        from app.swagger import attach_docstrings
+        attach_docstrings()
         swag = swagger(app)
         swag['info']['version'] = "1.0"
         swag['info']['title'] = "ACME API"
+        swag['consumes'] = ['application/json', 'application/msgpack']
+        swag['produces'] = ['application/json', 'application/msgpack']
         return jsonify(swag)
 
     return app
@@ -0,0 +1,9 @@
+from .prefix_index import PrefixIndex
+from .department_ids import DepartmentIdCache
+from .tiered import TieredCache, LRUCache, SQLiteCache, NetworkCache
+from .notifications import InvalidationChannel
+
+# Cache das leituras de departamentos e colaboradores, configurado em create_app
+read_cache = TieredCache()
+# Canal de invalidação entre processos; reconfigurado (e reiniciado) a cada create_app
+invalidation_channel = InvalidationChannel()
@@ -0,0 +1,130 @@
+from ..repositories.signals import department_changed, caches_flush
+from threading import Lock
+import time
+
+
+class DepartmentIdCache:
+    """
+    Conjunto em memória dos IDs de departamentos existentes, para validar department_id sem ir ao banco.
+
+    É carregado na primeira consulta e mantido pelos sinais de DepartamentRepository (criação e exclusão).
+    Um ID ausente do conjunto pode ser um departamento criado por outro processo, mesmo que menor que IDs já
+    conhecidos (valores da sequência são obtidos antes do commit, e os commits chegam fora de ordem). Por isso
+    qualquer ID ausente recarrega o conjunto, no máximo uma vez a cada `min_reload_interval` segundos: entre
+    recargas, um departamento recém-criado por outro processo pode ser rejeitado por até esse intervalo.
+
+    O conjunto nunca é alterado no lugar: os sinais (inclusive os da thread do canal de invalidação) trocam a
+    referência por uma cópia, e cada consulta usa a referência lida sob o lock. As alterações recebidas durante
+    uma carga são reaplicadas sobre o resultado dela, que foi lido antes delas; uma invalidação durante a carga
+    impede que o resultado seja guardado.
+    """
+
+    def __init__(self, loader, min_reload_interval: float = 1.0):
+        self.loader = loader
+        self.min_reload_interval = min_reload_interval
+        self._ids = None
+        self._loaded_at = 0.0
+        # Incrementada a cada invalidação; alterações recebidas durante a carga em andamento
+        self._generation = 0
+        self._changes = None
+        self._lock = Lock()
+        self._load_lock = Lock()
+
+        department_changed.connect(self._on_department_changed)
+        caches_flush.connect(self._on_caches_flush)
+
+    def contains(self, department_id) -> bool:
+        """
+        Indica se o departamento existe.
+
+        Args:
+            department_id: ID do departamento (int ou string numérica).
+
+        Returns:
+            bool: True se o departamento existe, False caso contrário.
+        """
+        return not self.missing([department_id])
+
+    def missing(self, department_ids):
+        """
+        Retorna os IDs, entre os informados, que não correspondem a um departamento existente.
+
+        Pode ser usada por operações em lote para validar todos os IDs de uma vez.
+
+        Args:
+            department_ids (iterable): IDs a serem validados.
+
+        Returns:
+            set: IDs inexistentes (ou inválidos), na forma recebida.
+        """
+        with self._lock:
+            ids = self._ids
+        if ids is None:
+            ids = self._load()
+        unknown = {department_id for department_id in department_ids if self._as_id(department_id) not in ids}
+        if not unknown:
+            return unknown
+
+        if self._reload_allowed():
+            ids = self._load()
+            unknown = {department_id for department_id in unknown if self._as_id(department_id) not in ids}
+        return unknown
+
+    def invalidate(self):
+        """Descarta o conjunto; ele será recarregado na próxima consulta."""
+        with self._lock:
+            self._ids = None
+            self._generation += 1
+
+    def _reload_allowed(self):
+        return time.monotonic() - self._loaded_at >= self.min_reload_interval
+
+    def _load(self):
+        """Carrega o conjunto do banco, guarda-o (se nada o invalidou durante a carga) e o retorna."""
+        with self._load_lock:
+            with self._lock:
+                generation = self._generation
+                self._changes = []
+            try:
+                loaded = self.loader()
+                if loaded is None:
+                    raise RuntimeError('Erro ao carregar os IDs de departamentos')
+                with self._lock:
+                    ids = set(loaded)
+                    for action, department_id in self._changes:
+                        self._apply(ids, action, department_id)
+                    if self._generation == generation:
+                        self._ids = ids
+                        self._loaded_at = time.monotonic()
+                    return ids
+            finally:
+                with self._lock:
+                    self._changes = None
+
+    @staticmethod
+    def _apply(ids, action, department_id):
+        if action == 'deleted':
+            ids.discard(department_id)
+        else:
+            ids.add(department_id)
+
+    @staticmethod
+    def _as_id(department_id):
+        try:
+            return int(department_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _on_caches_flush(self, sender, **kwargs):
+        self.invalidate()
+
+    def _on_department_changed(self, action, items=(), **kwargs):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.extend((action, department_id) for department_id, _ in items)
+            if self._ids is None:
+                return
+            ids = set(self._ids)
+            for department_id, _ in items:
+                self._apply(ids, action, department_id)
+            self._ids = ids
@@ -0,0 +1,211 @@
+from ..repositories.signals import department_changed, employee_changed, caches_flush, changes_committing, notify
+from sqlalchemy import text
+from threading import Thread, Event
+import atexit
+import json
+import logging
+import os
+import select
+import time
+import uuid
+
+
+SIGNALS = {'department': department_changed, 'employee': employee_changed}
+ENTITIES = {signal: entity for entity, signal in SIGNALS.items()}
+
+
+class InvalidationChannel:
+    """
+    Propaga as alterações de departamentos e colaboradores para os outros processos via LISTEN/NOTIFY do Postgres.
+
+    Publicação: a cada alteração anunciada pelos repositórios (changes_committing), envia um NOTIFY no canal
+    CACHE_NOTIFY_CHANNEL com o tipo da entidade, a ação, os pares (id, name) e os departamentos envolvidos. O NOTIFY
+    é emitido na transação que grava a alteração: o Postgres só o entrega se ela for confirmada, e uma falha ao
+    emiti-lo desfaz a escrita, sem alteração confirmada que os outros processos não fiquem sabendo.
+
+    Recepção: uma thread por processo mantém uma conexão dedicada com LISTEN e redispara os sinais recebidos
+    com `remote=True`, para que caches e índices em memória deste processo sejam atualizados; notificações
+    do próprio processo são ignoradas. Se a conexão cair, tenta reconectar com espera exponencial
+    (CACHE_NOTIFY_RECONNECT_MIN_SECONDS até CACHE_NOTIFY_RECONNECT_MAX_SECONDS) e, ao reconectar, dispara
+    caches_flush: as notificações do intervalo podem ter sido perdidas.
+
+    Só funciona com Postgres; com outros bancos (ou CACHE_NOTIFY_ENABLED desligado) não é instalado.
+
+    Há um canal por processo (`invalidation_channel`, configurado em create_app): a última aplicação criada é a
+    que escuta, e a thread e a conexão da anterior são encerradas. A conexão é fechada também na saída do processo.
+    """
+
+    # O payload do NOTIFY é limitado a 8000 bytes
+    MAX_PAYLOAD_BYTES = 7900
+    ITEMS_PER_NOTIFY = 100
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self.app = None
+        self.origin = uuid.uuid4().hex
+        self.listening = Event()
+        self._stop = Event()
+        self._thread = None
+        self._wakeup = None
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        # A última aplicação criada no processo é a que escuta
+        self.stop()
+        if self.app is not None:
+            self.app.extensions.pop('invalidation_channel', None)
+        changes_committing.disconnect(self._on_changes_committing)
+        self.app = None
+
+        if db is not None:
+            self.db = db
+        if not app.config.get('CACHE_NOTIFY_ENABLED', False):
+            return
+        with app.app_context():
+            if self.db.engine.dialect.name != 'postgresql':
+                return
+
+        self.app = app
+        self.channel = app.config['CACHE_NOTIFY_CHANNEL']
+        self.reconnect_min = app.config['CACHE_NOTIFY_RECONNECT_MIN_SECONDS']
+        self.reconnect_max = app.config['CACHE_NOTIFY_RECONNECT_MAX_SECONDS']
+        self.keepalive = app.config['CACHE_NOTIFY_KEEPALIVE_SECONDS']
+
+        changes_committing.connect(self._on_changes_committing)
+        app.extensions['invalidation_channel'] = self
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+        self.start()
+
+    def start(self):
+        self._stop.clear()
+        # Acorda o select do LISTEN quando o canal é encerrado
+        self._wakeup = os.pipe()
+        self._thread = Thread(target=self._run, name='cache-invalidation-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Encerra a thread de escuta e fecha a sua conexão."""
+        self._stop.set()
+        if self._wakeup is not None:
+            os.write(self._wakeup[1], b'x')
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._wakeup is not None:
+            for fd in self._wakeup:
+                os.close(fd)
+            self._wakeup = None
+
+    # Publicação
+
+    def _on_changes_committing(self, signal, connection, action, items=(), department_ids=(), **kwargs):
+        entity = ENTITIES.get(signal)
+        if entity is not None:
+            self.publish(connection, entity, action, items, department_ids)
+
+    def payloads(self, entity: str, action: str, items, department_ids=()):
+        """Monta os payloads do NOTIFY, em lotes; um lote grande demais vira um pedido de descarte total."""
+        items = [list(item) for item in items]
+        for start in range(0, max(len(items), 1), self.ITEMS_PER_NOTIFY):
+            payload = json.dumps({'origin': self.origin, 'entity': entity, 'action': action,
+                                  'items': items[start:start + self.ITEMS_PER_NOTIFY],
+                                  'department_ids': list(department_ids)}, ensure_ascii=False)
+            if len(payload.encode()) > self.MAX_PAYLOAD_BYTES:
+                yield json.dumps({'origin': self.origin, 'flush': True})
+                return
+            yield payload
+
+    def publish(self, connection, entity: str, action: str, items, department_ids=()):
+        """Emite os NOTIFY da alteração na transação de `connection`; são entregues no commit dela."""
+        # Um único comando para todos os lotes
+        connection.execute(text('SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload'),
+                           {'channel': self.channel, 'payloads': list(self.payloads(entity, action, items, department_ids))})
+
+    # Recepção
+
+    def handle(self, payload: str):
+        """Redispara localmente, com remote=True, uma alteração recebida de outro processo."""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logging.error(f"Notificação de cache inválida: {payload[:200]}")
+            return
+        if message.get('origin') == self.origin:
+            return
+        if message.get('flush'):
+            notify(caches_flush, 'flush')
+            return
+
+        signal = SIGNALS.get(message.get('entity'))
+        if signal is None:
+            return
+        kwargs = {'items': [tuple(item) for item in message.get('items', [])], 'remote': True}
+        if message.get('entity') == 'employee':
+            kwargs['department_ids'] = message.get('department_ids', [])
+        notify(signal, message.get('action'), **kwargs)
+
+    def _run(self):
+        delay = self.reconnect_min
+        connected_before = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                if connected_before:
+                    # Notificações enviadas enquanto estávamos desconectados foram perdidas
+                    notify(caches_flush, 'flush')
+                connected_before = True
+                delay = self.reconnect_min
+                self.listening.set()
+                self._listen(connection)
+            except Exception as e:
+                logging.error(f"Erro no canal de invalidação de cache, reconectando em {delay:.1f}s: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.reconnect_max)
+            finally:
+                self.listening.clear()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _connect(self):
+        with self.app.app_context():
+            pooled = self.db.engine.raw_connection()
+        # Fora do pool: a conexão fica dedicada ao LISTEN. A conexão do driver é obtida antes do detach,
+        # que desassocia o proxy dela
+        connection = pooled.driver_connection
+        pooled.detach()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    def _listen(self, connection):
+        last_activity = time.monotonic()
+        while not self._stop.is_set():
+            payloads = self._wait(connection, self.keepalive)
+            if payloads:
+                with self.app.app_context():
+                    for payload in payloads:
+                        self.handle(payload)
+                last_activity = time.monotonic()
+            elif time.monotonic() - last_activity >= self.keepalive:
+                # Uma conexão morta sem aviso (rede, failover) só é percebida ao enviar algo
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                last_activity = time.monotonic()
+
+    def _wait(self, connection, timeout: float):
+        readable, _, _ = select.select([connection, self._wakeup[0]], [], [], timeout)
+        if connection not in readable:
+            return []
+        connection.poll()
+        payloads = [notification.payload for notification in connection.notifies]
+        connection.notifies.clear()
+        return payloads
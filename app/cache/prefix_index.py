@@ -0,0 +1,110 @@
+from bisect import bisect_left, insort
+from threading import RLock
+import sys
+import unicodedata
+
+
+def normalize(text: str) -> str:
+    """Normaliza um nome para comparação: sem acentos, sem espaços nas pontas e em caixa baixa."""
+    decomposed = unicodedata.normalize('NFKD', text.strip())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class PrefixIndex:
+    """
+    Índice em memória para busca por prefixo de nomes.
+
+    Mantém um array ordenado de chaves (nome_normalizado, id) e resolve as buscas com bisect:
+    a primeira chave maior ou igual ao prefixo é encontrada em O(log n) e as seguintes são
+    percorridas enquanto ainda começarem com o prefixo. Inserções e remoções custam O(n) pelo
+    deslocamento do array, o que é aceitável porque escritas são muito mais raras que buscas.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, items):
+        """
+        Substitui todo o conteúdo do índice.
+
+        Args:
+            items (iterable of tuple): Pares (id, name) a serem indexados.
+        """
+        entries = {item_id: (normalize(name), name) for item_id, name in items}
+        keys = sorted((key, item_id) for item_id, (key, _) in entries.items())
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+
+    def add(self, item_id: int, name: str):
+        """Inclui ou atualiza o nome associado a um ID."""
+        with self._lock:
+            self.remove(item_id)
+            key = normalize(name)
+            self._entries[item_id] = (key, name)
+            insort(self._keys, (key, item_id))
+
+    def remove(self, item_id: int):
+        """Remove um ID do índice, se existir."""
+        with self._lock:
+            entry = self._entries.pop(item_id, None)
+            if entry is None:
+                return
+            position = bisect_left(self._keys, (entry[0], item_id))
+            if position < len(self._keys) and self._keys[position] == (entry[0], item_id):
+                del self._keys[position]
+
+    def search(self, prefix: str, limit: int = 10):
+        """
+        Busca os nomes que começam com o prefixo informado, ignorando acentos e caixa.
+
+        Args:
+            prefix (str): O prefixo a ser buscado.
+            limit (int): Quantidade máxima de resultados.
+
+        Returns:
+            list of dict: Lista de {'id', 'name'} em ordem alfabética.
+        """
+        key = normalize(prefix)
+        results = []
+        with self._lock:
+            position = bisect_left(self._keys, (key,))
+            while position < len(self._keys) and len(results) < limit:
+                name_key, item_id = self._keys[position]
+                if not name_key.startswith(key):
+                    break
+                results.append({'id': item_id, 'name': self._entries[item_id][1]})
+                position += 1
+        return results
+
+    def memory_footprint(self) -> int:
+        """
+        Estima, em bytes, a memória ocupada pelo índice.
+
+        Soma o array de chaves, o dicionário de entradas e os objetos referenciados por eles
+        (tuplas, strings e inteiros). Strings compartilhadas são contadas apenas uma vez.
+        """
+        with self._lock:
+            seen = set()
+            total = sys.getsizeof(self._keys) + sys.getsizeof(self._entries)
+            for obj in self._walk():
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    total += sys.getsizeof(obj)
+            return total
+
+    def _walk(self):
+        for key in self._keys:
+            yield key
+            yield key[0]
+            yield key[1]
+        for item_id, entry in self._entries.items():
+            yield item_id
+            yield entry
+            yield entry[0]
+            yield entry[1]
@@ -0,0 +1,292 @@
+from ..models.routing import primary_reads, has_write_marker
+from collections import OrderedDict
+from threading import Lock, local
+import hashlib
+import logging
+import msgpack
+import os
+import random
+import sqlite3
+import stat
+import tempfile
+import time
+
+
+class LRUCache:
+    """
+    Cache em memória do processo (L1): LRU limitado a `max_items` entradas, cada uma válida por `ttl` segundos.
+
+    Os valores são guardados como objetos, sem cópia; quem lê não deve alterá-los.
+    """
+
+    def __init__(self, max_items: int = 1024, ttl: float = 5):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._lock = Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [key for key in self._items if key.startswith(prefix)]:
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _pack(value):
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(raw):
+    # MessagePack só reconstrói tipos simples: um valor adulterado na camada não executa código, ao contrário do pickle
+    return msgpack.unpackb(raw, raw=False)
+
+
+class SQLiteCache:
+    """
+    Cache compartilhado pelos processos do mesmo host (L2), em um arquivo SQLite em modo WAL.
+
+    Cada thread usa a sua própria conexão. Os valores são serializados em MessagePack (dicionários, listas e
+    tipos simples). As entradas expiram após `ttl` segundos; as expiradas são removidas de tempos em tempos
+    durante as escritas.
+    """
+
+    PURGE_PROBABILITY = 0.01
+
+    def __init__(self, path: str, ttl: float = 60, busy_timeout: float = 0.05):
+        self.path = path
+        self.ttl = ttl
+        self.busy_timeout = busy_timeout
+        self._local = local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return _unpack(row[0])
+
+    def set(self, key, value):
+        connection = self._connection()
+        now = time.time()
+        connection.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                           (key, _pack(value), now + self.ttl))
+        if random.random() < self.PURGE_PROBABILITY:
+            connection.execute('DELETE FROM cache WHERE expires_at < ?', (now,))
+
+    def delete(self, *keys):
+        if keys:
+            self._connection().execute(f"DELETE FROM cache WHERE key IN ({', '.join('?' * len(keys))})", keys)
+
+    def delete_prefix(self, prefix: str):
+        # Faixa [prefix, prefix + U+10FFFF) em vez de LIKE, que trataria '_' e '%' como curingas
+        self._connection().execute('DELETE FROM cache WHERE key >= ? AND key < ?', (prefix, prefix + '\U0010ffff'))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+
+class NetworkCache:
+    """
+    Cache em rede (ex.: Redis), compartilhado entre hosts.
+
+    Recebe um cliente já criado com a interface do redis-py (get, set com `ex`, delete e scan_iter);
+    os testes podem passar um substituto em memória. As chaves recebem o prefixo `namespace`.
+    """
+
+    def __init__(self, client, ttl: float = 60, namespace: str = 'telavita:'):
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def get(self, key):
+        value = self.client.get(self.namespace + key)
+        return _unpack(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.namespace + key, _pack(value), ex=max(1, int(self.ttl)))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self.namespace + key for key in keys])
+
+    def delete_prefix(self, prefix: str):
+        keys = list(self.client.scan_iter(match=self._escape(self.namespace + prefix) + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self):
+        self.delete_prefix('')
+
+    @staticmethod
+    def _escape(pattern: str):
+        for char in '\\*?[]':
+            pattern = pattern.replace(char, '\\' + char)
+        return pattern
+
+
+class TieredCache:
+    """
+    Cache em camadas para as leituras de departamentos e colaboradores.
+
+    A leitura consulta as camadas em ordem (L1 em memória, L2 SQLite no host e, se configurado, o cache em
+    rede) e preenche as camadas anteriores com o valor encontrado. Escritas e invalidações vão para todas
+    as camadas. Falhas de uma camada (arquivo bloqueado, rede fora) são logadas e tratadas como ausência
+    do valor: o cache nunca derruba uma leitura que o banco consegue atender.
+
+    Um valor carregado só é guardado se nenhuma invalidação aconteceu durante a carga (`generation`): uma
+    escrita confirmada entre a leitura e o `set` não deixa o valor antigo em cache. As cargas leem do primário,
+    e uma requisição com a marca de escrita (read-your-writes) não usa o cache.
+
+    Sem init_app (ou com CACHE_ENABLED desligado), não há camadas e toda leitura vai direto ao banco.
+    """
+
+    def __init__(self):
+        self.tiers = []
+        self.generation = 0
+        self._generation_lock = Lock()
+
+    def init_app(self, app):
+        self.tiers = []
+        if not app.config.get('CACHE_ENABLED', False):
+            return
+
+        ttl = app.config['CACHE_TTL_SECONDS']
+        self.tiers.append(LRUCache(app.config['CACHE_L1_MAX_ITEMS'], app.config['CACHE_L1_TTL_SECONDS']))
+        l2_path = app.config.get('CACHE_L2_PATH') or self.default_l2_path(app)
+        if l2_path:
+            self.tiers.append(SQLiteCache(l2_path, ttl))
+
+        client = app.config.get('CACHE_NETWORK_CLIENT')
+        if client is None and app.config.get('CACHE_REDIS_URL'):
+            # Dependência opcional: só é necessária quando o cache em rede é configurado
+            import redis
+            client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+        if client is not None:
+            self.tiers.append(NetworkCache(client, ttl))
+
+        app.extensions['read_cache'] = self
+        # O banco pode ter sido alterado sem passar pela aplicação (migrações, outra instalação): começa vazio
+        self.clear()
+
+    @staticmethod
+    def default_l2_path(app):
+        """
+        Um arquivo por banco de dados, para que ambientes diferentes no mesmo host não se misturem.
+
+        O diretório temporário é de todos os usuários do host: o arquivo fica em um subdiretório do usuário,
+        criado com permissão 0700. Se esse subdiretório existir com outro dono ou outras permissões (ou for
+        um link), retorna None e a aplicação segue sem o L2.
+        """
+        directory = os.path.join(tempfile.gettempdir(), f'telavita-cache-{os.getuid()}')
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o700:
+            logging.error(f"Diretório do cache L2 {directory} não é privado do usuário; defina CACHE_L2_PATH")
+            return None
+        database = hashlib.sha1(app.config['SQLALCHEMY_DATABASE_URI'].encode()).hexdigest()[:12]
+        return os.path.join(directory, f'{database}.sqlite3')
+
+    def get(self, key):
+        for index, tier in enumerate(self.tiers):
+            value = self._call(tier, 'get', key)
+            if value is not None:
+                for upper in self.tiers[:index]:
+                    self._call(upper, 'set', key, value)
+                return value
+        return None
+
+    def get_or_load(self, key, loader):
+        """
+        Retorna o valor em cache ou, na ausência, o resultado de `loader()`, guardando-o em todas as camadas.
+
+        Resultados vazios (None, lista vazia) não são guardados: os repositórios também os usam para falhas.
+        Nem os carregados enquanto uma invalidação acontecia, que podem ser anteriores à escrita.
+        """
+        if not self.tiers or has_write_marker():
+            return loader()
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation
+        with primary_reads():
+            value = loader()
+        if value:
+            self.set_if_current(key, value, generation)
+        return value
+
+    def set_if_current(self, key, value, generation: int):
+        """Guarda o valor se não houve invalidação desde `generation`, lida antes de carregá-lo."""
+        if generation == self.generation:
+            self.set(key, value)
+
+    def set(self, key, value):
+        for tier in self.tiers:
+            self._call(tier, 'set', key, value)
+
+    def delete(self, *keys):
+        self._invalidated()
+        for tier in self.tiers:
+            self._call(tier, 'delete', *keys)
+
+    def delete_prefix(self, prefix: str):
+        self._invalidated()
+        for tier in self.tiers:
+            self._call(tier, 'delete_prefix', prefix)
+
+    def clear(self):
+        self._invalidated()
+        for tier in self.tiers:
+            self._call(tier, 'clear')
+
+    def _invalidated(self):
+        with self._generation_lock:
+            self.generation += 1
+
+    @staticmethod
+    def _call(tier, operation, *args):
+        try:
+            return getattr(tier, operation)(*args)
+        except Exception as e:
+            logging.error(f"Erro no cache {type(tier).__name__} ({operation}): {e}")
+            return None
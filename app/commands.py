@@ -0,0 +1,98 @@
+from .models import db
+from .repositories import DepartmentStatsRepository, ExportRepository, ChangeLogRepository, IdempotencyRepository
+from .services import ExportService, ChangeFeedService
+from datetime import timedelta
+import click
+
+
+class _MigrateGroup(click.Group):
+    """
+    O grupo `flask db` do Flask-Migrate, carregado só quando é usado.
+
+    Flask-Migrate (e o Alembic) é importado e registrado na aplicação ao listar ou resolver um subcomando
+    de `flask db`: nenhum outro comando, nem `flask run`, paga essa importação.
+    """
+
+    def __init__(self, app):
+        super().__init__('db', help='Perform database migrations.')
+        self.app = app
+
+    def _migrate_group(self):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as migrate_group
+        if 'migrate' not in self.app.extensions:
+            Migrate(self.app, db)
+        return migrate_group
+
+    def list_commands(self, ctx):
+        return self._migrate_group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._migrate_group().get_command(ctx, name)
+
+
+def register_commands(app):
+    """Registra os comandos de linha de comando da aplicação (executados com `flask <comando>`)."""
+
+    app.cli.add_command(_MigrateGroup(app))
+
+    @app.cli.command('rebuild-department-stats')
+    def rebuild_department_stats():
+        """Recalcula a tabela department_stats do zero e informa os departamentos que estavam divergentes."""
+        drifted = DepartmentStatsRepository(db).rebuild()
+        if drifted is None:
+            raise click.ClickException('Erro ao reconstruir as estatísticas dos departamentos')
+
+        if drifted:
+            click.echo(f"Estatísticas divergentes corrigidas em {len(drifted)} departamento(s): {drifted}")
+        else:
+            click.echo('Estatísticas dos departamentos consistentes')
+
+    @app.cli.command('export-org')
+    @click.option('--format', 'output_format', type=click.Choice(['csv', 'parquet']), default='csv', show_default=True)
+    @click.option('--output', required=True, type=click.Path(dir_okay=False, writable=True), help='Arquivo de saída.')
+    @click.option('--batch-size', default=1000, show_default=True, help='Linhas lidas do banco por vez.')
+    @click.option('--row-group-size', default=50000, show_default=True, help='Linhas por row group (Parquet).')
+    def export_org(output_format, output, batch_size, row_group_size):
+        """Exporta departamentos, colaboradores e dependentes para CSV ou Parquet e informa linhas/s."""
+        export_service = ExportService(ExportRepository(db))
+        try:
+            if output_format == 'parquet':
+                report = export_service.write_parquet(output, batch_size, row_group_size)
+            else:
+                report = export_service.write_csv(output, batch_size)
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+
+        click.echo(f"{report['rows']} linhas exportadas para {output} em {report['seconds']}s "
+                   f"({report['rows_per_second']} linhas/s)")
+
+    @app.cli.command('compact-change-log')
+    @click.option('--retention-days', type=int, default=None,
+                  help='Dias mantidos no histórico (padrão: CHANGE_LOG_RETENTION_DAYS).')
+    def compact_change_log(retention_days):
+        """Remove do change_log as alterações mais antigas que a janela de retenção."""
+        if retention_days is None:
+            retention_days = app.config['CHANGE_LOG_RETENTION_DAYS']
+
+        removed = ChangeFeedService(ChangeLogRepository(db)).compact(retention_days)
+        if removed is None:
+            raise click.ClickException('Erro ao compactar o change_log')
+        click.echo(f"{removed} alteração(ões) com mais de {retention_days} dia(s) removida(s)")
+
+    @app.cli.command('purge-idempotency-keys')
+    def purge_idempotency_keys():
+        """Remove as Idempotency-Keys mais antigas que IDEMPOTENCY_TTL_SECONDS."""
+        ttl = timedelta(seconds=app.config['IDEMPOTENCY_TTL_SECONDS'])
+        removed = IdempotencyRepository(db).purge_expired(ttl)
+        if removed is None:
+            raise click.ClickException('Erro ao remover as Idempotency-Keys expiradas')
+        click.echo(f"{removed} Idempotency-Key(s) expirada(s) removida(s)")
+
+    @app.cli.command('profile-token')
+    def profile_token():
+        """Gera um token para perfilar requisições (cabeçalho PROFILING_HEADER), quando PROFILING_ENABLED."""
+        profiler = app.extensions.get('request_profiler')
+        if profiler is None:
+            raise click.ClickException('Perfil de requisições desativado (PROFILING_ENABLED)')
+        click.echo(f"{app.config['PROFILING_HEADER']}: {profiler.create_token()}")
@@ -0,0 +1,3 @@
+from .admission import AdmissionController, TokenBucket, client_key
+from .profiling import RequestProfiler
+from .structured_logging import StructuredLogging
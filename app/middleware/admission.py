@@ -0,0 +1,149 @@
+from flask import g, request, jsonify
+from collections import OrderedDict
+from threading import Lock
+import math
+import time
+
+
+READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class TokenBucket:
+    """Token bucket simples: `rate` fichas por segundo, acumulando no máximo `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """
+        Tenta consumir uma ficha.
+
+        Returns:
+            float: 0 se a ficha foi consumida; caso contrário, quantos segundos faltam para a próxima.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+def client_key(api_keys=frozenset()):
+    """
+    Identifica o cliente da requisição para o rate limit.
+
+    O cabeçalho X-API-Key só é usado se for uma das chaves conhecidas (RATE_LIMIT_API_KEYS): uma chave
+    arbitrária não identifica ninguém, e trocá-la a cada requisição daria um burst novo por requisição
+    (e, pelo limite de clientes rastreados, descartaria os buckets dos demais). Nos outros casos vale o IP.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in api_keys:
+        return f'key:{api_key}'
+    return f'ip:{request.remote_addr or "anonymous"}'
+
+
+class AdmissionController:
+    """
+    Controle de admissão e descarte de carga para as requisições da aplicação.
+
+    Antes de cada requisição verifica, nesta ordem:
+      1. o token bucket do cliente (IP ou X-API-Key conhecida; RATE_LIMIT_PER_SECOND / RATE_LIMIT_BURST),
+         respondendo 429;
+      2. quantas requisições do mesmo tipo (leitura ou escrita) já estão em andamento neste processo,
+         respondendo 503 acima de ADMISSION_MAX_INFLIGHT_READ / ADMISSION_MAX_INFLIGHT_WRITE;
+      3. a ocupação do pool de conexões do banco, respondendo 503 acima de
+         ADMISSION_POOL_SATURATION_READ / ADMISSION_POOL_SATURATION_WRITE.
+    As respostas de descarte incluem Retry-After e são devolvidas sem tocar no banco, então, quando o
+    Postgres fica lento, as threads não se acumulam esperando uma conexão até o timeout.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self._lock = Lock()
+        self._in_flight = {'read': 0, 'write': 0}
+        self._buckets = OrderedDict()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        if db is not None:
+            self.db = db
+        if not app.config.get('ADMISSION_CONTROL_ENABLED', False):
+            return
+
+        self.app = app
+        app.extensions['admission_control'] = self
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    def in_flight(self):
+        """Quantidade de requisições de leitura e de escrita em andamento neste processo."""
+        with self._lock:
+            return dict(self._in_flight)
+
+    def pool_utilization(self):
+        """
+        Ocupação do pool de conexões do banco principal, de 0 a 1.
+
+        Considera o tamanho do pool mais o overflow permitido. Retorna None quando o pool não tem
+        limite conhecido (por exemplo, NullPool ou overflow ilimitado).
+        """
+        pool = self.db.engine.pool
+        size = getattr(pool, 'size', None)
+        max_overflow = getattr(pool, '_max_overflow', None)
+        if not callable(size) or max_overflow is None or max_overflow < 0:
+            return None
+        capacity = size() + max_overflow
+        return pool.checkedout() / capacity if capacity else None
+
+    def _before_request(self):
+        config = self.app.config
+        kind = 'read' if request.method in READ_METHODS else 'write'
+
+        if config['RATE_LIMIT_PER_SECOND'] > 0:
+            wait = self._take_token(client_key(config['RATE_LIMIT_API_KEYS']))
+            if wait:
+                return self._reject(429, 'Limite de requisições excedido', wait)
+
+        with self._lock:
+            if self._in_flight[kind] >= config[f'ADMISSION_MAX_INFLIGHT_{kind.upper()}']:
+                return self._reject(503, 'Servidor sobrecarregado, tente novamente', config['ADMISSION_RETRY_AFTER_SECONDS'])
+
+            utilization = self.pool_utilization()
+            if utilization is not None and utilization >= config[f'ADMISSION_POOL_SATURATION_{kind.upper()}']:
+                return self._reject(503, 'Banco de dados sobrecarregado, tente novamente', config['ADMISSION_RETRY_AFTER_SECONDS'])
+
+            self._in_flight[kind] += 1
+        g.admission_kind = kind
+
+    def _teardown_request(self, exception=None):
+        kind = g.pop('admission_kind', None)
+        if kind is not None:
+            with self._lock:
+                self._in_flight[kind] -= 1
+
+    def _take_token(self, key):
+        config = self.app.config
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(config['RATE_LIMIT_PER_SECOND'], config['RATE_LIMIT_BURST'])
+                self._buckets[key] = bucket
+                # Mantém a quantidade de clientes rastreados limitada, descartando os menos recentes
+                if len(self._buckets) > config['RATE_LIMIT_MAX_CLIENTS']:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take()
+
+    @staticmethod
+    def _reject(status_code, message, retry_after):
+        response = jsonify({'error': message})
+        response.status_code = status_code
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
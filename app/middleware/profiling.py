@@ -0,0 +1,99 @@
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from threading import Lock
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+import uuid
+
+
+class RequestProfiler:
+    """
+    Perfil de requisições individuais com cProfile, sob demanda.
+
+    Só é instalado com PROFILING_ENABLED; desligado, a aplicação não é envolvida e não há custo algum.
+    Ligado, envolve o WSGI da aplicação (todas as rotas, de todos os blueprints) e perfila uma requisição quando:
+      - ela traz no cabeçalho PROFILING_HEADER um token assinado com a SECRET_KEY e ainda válido
+        (gerado com `flask profile-token`), ou
+      - ela é sorteada pela amostragem PROFILING_SAMPLE_RATE (0 desliga a amostragem).
+    Cada perfil é gravado em PROFILING_DIR (formato pstats, legível com `python -m pstats` ou snakeviz) e o
+    nome do arquivo volta no cabeçalho X-Profile-Dump. Apenas os PROFILING_MAX_DUMPS mais recentes são mantidos.
+    O perfil cobre a execução da aplicação até a resposta ser devolvida; corpos em streaming não entram.
+    """
+
+    def __init__(self, app=None):
+        self._lock = Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED', False):
+            return
+
+        self.directory = app.config['PROFILING_DIR']
+        self.max_dumps = app.config['PROFILING_MAX_DUMPS']
+        self.sample_rate = app.config['PROFILING_SAMPLE_RATE']
+        self.token_max_age = app.config['PROFILING_TOKEN_MAX_AGE']
+        self.header_key = 'HTTP_' + app.config['PROFILING_HEADER'].upper().replace('-', '_')
+        self.serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='request-profiling')
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.wsgi_app = app.wsgi_app
+        app.wsgi_app = self
+        app.extensions['request_profiler'] = self
+
+    def create_token(self):
+        """Gera um token assinado para o cabeçalho de perfil, válido por PROFILING_TOKEN_MAX_AGE segundos."""
+        return self.serializer.dumps('profile')
+
+    def __call__(self, environ, start_response):
+        if not self._should_profile(environ):
+            return self.wsgi_app(environ, start_response)
+
+        dump_name = self._dump_name(environ)
+
+        def start_profiled_response(status, headers, exc_info=None):
+            headers.append(('X-Profile-Dump', dump_name))
+            return start_response(status, headers, exc_info)
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.wsgi_app, environ, start_profiled_response)
+        finally:
+            self._dump(profiler, dump_name)
+
+    def _should_profile(self, environ):
+        token = environ.get(self.header_key)
+        if token:
+            try:
+                self.serializer.loads(token, max_age=self.token_max_age)
+                return True
+            except BadSignature:
+                logging.error(f"Token de perfil inválido ou expirado em {environ.get('PATH_INFO')}")
+                return False
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @staticmethod
+    def _dump_name(environ):
+        path = re.sub(r'[^A-Za-z0-9]+', '_', environ.get('PATH_INFO', '')).strip('_')[:80]
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}-{environ.get('REQUEST_METHOD', '')}-{path}.prof"
+
+    def _dump(self, profiler, dump_name):
+        try:
+            profiler.dump_stats(os.path.join(self.directory, dump_name))
+            with self._lock:
+                self._prune()
+        except Exception as e:
+            logging.error(f"Erro ao gravar o perfil da requisição {dump_name}: {e}")
+
+    def _prune(self):
+        """Remove os perfis mais antigos além de PROFILING_MAX_DUMPS."""
+        dumps = [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith('.prof')]
+        dumps.sort(key=lambda entry: (entry.stat().st_mtime, entry.name))
+        for entry in dumps[:max(0, len(dumps) - self.max_dumps)]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,182 @@
+from flask import g, request, has_request_context
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
+from datetime import datetime, timezone
+from queue import Queue, Full
+from threading import Lock
+import atexit
+import json
+import logging
+import sys
+import time
+import uuid
+
+
+class RequestContextFilter(logging.Filter):
+    """Anota o registro com o id, a rota e o tempo decorrido da requisição corrente (na thread que logou)."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.route = request.endpoint
+            record.method = request.method
+            started = g.get('request_started')
+            record.duration_ms = round((time.perf_counter() - started) * 1000, 3) if started else None
+        else:
+            record.request_id = record.route = record.method = record.duration_ms = None
+        return True
+
+
+class RepeatedErrorFilter(logging.Filter):
+    """
+    Deixa passar cada erro idêntico (mesmo logger, nível e mensagem) no máximo uma vez a cada `interval` segundos.
+
+    O registro que passa depois de uma janela com descartes leva em `suppressed` quantos foram descartados.
+    Registros abaixo de ERROR não são limitados.
+    """
+
+    def __init__(self, interval: float, max_keys: int = 1000):
+        super().__init__()
+        self.interval = interval
+        self.max_keys = max_keys
+        self._lock = Lock()
+        self._seen = OrderedDict()
+
+    def filter(self, record):
+        if record.levelno < logging.ERROR or self.interval <= 0:
+            return True
+
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._seen.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._seen[key] = (last, suppressed + 1)
+                return False
+            self._seen[key] = (now, 0)
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos da requisição anotados pelo RequestContextFilter."""
+
+    FIELDS = ('request_id', 'route', 'method', 'duration_ms', 'status', 'path', 'suppressed', 'dropped')
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler com fila limitada: com a fila cheia o registro é descartado em vez de bloquear a requisição."""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Só o necessário na thread da requisição: mensagem já interpolada e traceback em texto
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.dropped:
+            record.dropped, self.dropped = self.dropped, 0
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+class StructuredLogging:
+    """
+    Logging assíncrono e estruturado da aplicação.
+
+    O logger raiz passa a ter um único handler, que só anota o registro (id da requisição, rota e duração),
+    aplica o limite de erros repetidos (LOG_ERROR_RATE_LIMIT_SECONDS) e o coloca em uma fila limitada
+    (LOG_QUEUE_MAX_SIZE). A formatação em JSON e a escrita (stderr ou LOG_FILE) ficam com um QueueListener
+    em uma thread de fundo, então um incidente no banco que gere uma enxurrada de `logging.error` não
+    adiciona latência às requisições. Cada requisição recebe um X-Request-ID (o do cliente, se enviado) e,
+    com LOG_REQUESTS, gera uma linha com status e duração ao terminar.
+
+    O logging é global no processo: a última aplicação criada define a configuração do logger raiz.
+    """
+
+    _listener = None
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('LOG_QUEUE_ENABLED', False):
+            return
+
+        self.log_requests = app.config['LOG_REQUESTS']
+        self.queue = Queue(app.config['LOG_QUEUE_MAX_SIZE'])
+        self.queue_handler = NonBlockingQueueHandler(self.queue)
+        self.queue_handler.addFilter(RepeatedErrorFilter(app.config['LOG_ERROR_RATE_LIMIT_SECONDS']))
+        self.queue_handler.addFilter(RequestContextFilter())
+
+        if app.config.get('LOG_FILE'):
+            output = logging.FileHandler(app.config['LOG_FILE'], encoding='utf-8')
+        else:
+            output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(JsonFormatter())
+        self._install(QueueListener(self.queue, output, respect_handler_level=True), app.config['LOG_LEVEL'])
+
+        app.extensions['structured_logging'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _install(self, listener, level):
+        root = logging.getLogger()
+        previous = StructuredLogging._listener
+        if previous is not None:
+            previous.stop()
+        root.handlers = [self.queue_handler]
+        root.setLevel(level)
+        listener.start()
+        if previous is None:
+            atexit.register(lambda: StructuredLogging._listener and StructuredLogging._listener.stop())
+        StructuredLogging._listener = listener
+        self.listener = listener
+
+    def flush(self):
+        """Aguarda até que os registros já enfileirados tenham sido escritos."""
+        self.queue.join()
+
+    def _before_request(self):
+        g.request_started = time.perf_counter()
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+
+    def _after_request(self, response):
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        if self.log_requests:
+            logging.getLogger('app.request').info(f"{request.method} {request.path} {response.status_code}",
+                                                  extra={'status': response.status_code, 'path': request.path})
+        return response
@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
+from .routing import RoutingSession, ReplicaRouter, read_only, primary_reads, has_write_marker
+from .slow_query import SlowQueryLogger
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
-from .models import Department, Employee, Dependent
\ No newline at end of file
+from .models import Department, Employee, Dependent, DepartmentStats, ChangeLog, ChangeLogCompaction, IdempotencyKey, Job
\ No newline at end of file
@@ -1,23 +1,94 @@
 from . import db
+from datetime import datetime
 
 class Department(db.Model):
     __tablename__ = "department"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
+    # Incrementada a cada UPDATE pelo SQLAlchemy; usada como ETag e no controle de concorrência otimista
+    version = db.Column(db.Integer, nullable=False, server_default='1')
     employees = db.relationship('Employee', backref='department', lazy=True)
 
+    __mapper_args__ = {'version_id_col': version}
+
 class Employee(db.Model):
     __tablename__ = "employee"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     department_id = db.Column(db.Integer, db.ForeignKey('department.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
     dependents = db.relationship('Dependent', backref='employee', lazy=True, cascade="all, delete-orphan")
 
+    __mapper_args__ = {'version_id_col': version}
+    # Listagem paginada de colaboradores por departamento, ordenada por id ou por nome
+    __table_args__ = (
+        db.Index('ix_employee_department_id', 'department_id', 'id'),
+        db.Index('ix_employee_department_name', 'department_id', 'name', 'id'),
+        # Filtro name_prefix (LIKE 'prefixo%'): no Postgres só usa índice com varchar_pattern_ops, qualquer que
+        # seja a collation. Declarado na tabela para que o `flask db migrate` o gere
+        db.Index('ix_employee_department_name_pattern', 'department_id', 'name',
+                 postgresql_ops={'name': 'varchar_pattern_ops'}).ddl_if(dialect='postgresql'),
+    )
+
 class Dependent(db.Model):
     __tablename__ = "dependent"
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False, index=True)
+
+class DepartmentStats(db.Model):
+    __tablename__ = "department_stats"
+    department_id = db.Column(db.Integer, db.ForeignKey('department.id', ondelete='CASCADE'), primary_key=True)
+    employee_count = db.Column(db.Integer, nullable=False, default=0)
+    employees_with_dependents = db.Column(db.Integer, nullable=False, default=0)
+    dependent_count = db.Column(db.Integer, nullable=False, default=0)
 
+class ChangeLog(db.Model):
+    __tablename__ = "change_log"
+    seq = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    # Transação que registrou a alteração (só no Postgres)
+    txid = db.Column(db.BigInteger, nullable=True)
+    # Posição no feed (o `seq` de /changes), atribuída quando a transação que registrou a alteração já terminou
+    position = db.Column(db.BigInteger, nullable=True, unique=True)
+
+class ChangeLogCompaction(db.Model):
+    __tablename__ = "change_log_compaction"
+    id = db.Column(db.Integer, primary_key=True)
+    trimmed_through_seq = db.Column(db.Integer, nullable=False)
+    compacted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
+class IdempotencyKey(db.Model):
+    __tablename__ = "idempotency_key"
+    key = db.Column(db.String(255), primary_key=True)
+    method = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)
+    content_type = db.Column(db.String(100), nullable=True)
+    response_body = db.Column(db.LargeBinary, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    # Fim da reserva de uma requisição em andamento; depois disso (o processo caiu) a chave pode ser retomada
+    locked_until = db.Column(db.DateTime, nullable=True)
 
+class Job(db.Model):
+    __tablename__ = "job"
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    # pending, running, succeeded, failed ou cancelled
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)
+    params = db.Column(db.JSON, nullable=False)
+    # Itens já processados e confirmados: uma tarefa retomada após uma queda continua daqui
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
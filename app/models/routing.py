@@ -0,0 +1,189 @@
+from flask import current_app, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, InterfaceError
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+import itertools
+import logging
+import time
+
+
+READ_METHODS = frozenset(['GET', 'HEAD'])
+
+# Marca de escrita devolvida ao cliente (cookie e cabeçalho): até quando (epoch, em segundos) ele lê do primário
+PRIMARY_UNTIL_COOKIE = 'read_primary_until'
+PRIMARY_UNTIL_HEADER = 'X-Read-Primary-Until'
+
+# Ligado enquanto um método de leitura marcado com @read_only executa; desligado no retry pelo primário
+_use_replica = ContextVar('use_replica', default=False)
+# Marcado pelo evento handle_error quando a réplica em uso falha durante a leitura corrente
+_replica_failed = ContextVar('replica_failed', default=False)
+# Ligado por primary_reads: as leituras do bloco vão para o primário mesmo em um GET
+_primary_only = ContextVar('primary_only', default=False)
+
+
+class RoutingSession(Session):
+    """Sessão que envia as leituras marcadas com @read_only para uma réplica, quando houver uma disponível."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _use_replica.get() and not self._flushing and has_app_context():
+            router = current_app.extensions.get('replica_router')
+            engine = router.pick() if router is not None else None
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Envia ao primário as leituras @read_only do bloco.
+
+    Usado por quem guarda o resultado em um cache compartilhado: um valor lido de uma réplica atrasada ficaria
+    em cache (para todos os clientes) mesmo depois da escrita que o invalidou.
+    """
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def has_write_marker():
+    """Indica se a requisição corrente traz uma marca de escrita vigente: o cliente acabou de escrever."""
+    if not has_request_context():
+        return False
+    marker = request.headers.get(PRIMARY_UNTIL_HEADER) or request.cookies.get(PRIMARY_UNTIL_COOKIE)
+    if not marker:
+        return False
+    try:
+        primary_until = float(marker)
+    except ValueError:
+        return False
+    now = time.time()
+    # Uma marca forjada além da janela não prende o cliente ao primário
+    return now < primary_until <= now + current_app.config.get('READ_REPLICA_STICKY_SECONDS', 0)
+
+
+def read_only(method):
+    """
+    Marca um método de repositório como leitura pura, que pode ser atendida por uma réplica.
+
+    A réplica só é usada em requisições GET/HEAD sem uma marca de escrita vigente (read-your-writes). Se a réplica falhar durante a leitura, ela é
+    marcada como indisponível e o método é executado novamente no primário.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        router = current_app.extensions.get('replica_router') if has_app_context() else None
+        if router is None or _use_replica.get() or _primary_only.get() or not router.should_route():
+            return method(self, *args, **kwargs)
+
+        use_token = _use_replica.set(True)
+        failed_token = _replica_failed.set(False)
+        try:
+            result = method(self, *args, **kwargs)
+            if not _replica_failed.get():
+                router.count('replica')
+                return result
+
+            # Os repositórios tratam as próprias exceções; a falha da réplica chega aqui pelo evento handle_error
+            self.db.session.rollback()
+            _use_replica.set(False)
+            router.count('primary_fallback')
+            return method(self, *args, **kwargs)
+        finally:
+            _replica_failed.reset(failed_token)
+            _use_replica.reset(use_token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de leitura de cada consulta e controla a disponibilidade e a aderência ao primário.
+
+    As réplicas são binds do Flask-SQLAlchemy (READ_REPLICA_URIS vira SQLALCHEMY_BINDS replica_0,
+    replica_1, ...) usadas em rodízio. Uma réplica que falha fica fora do rodízio por
+    READ_REPLICA_RETRY_SECONDS.
+
+    Um cliente que acabou de escrever lê do primário por READ_REPLICA_STICKY_SECONDS, para enxergar a própria
+    escrita mesmo com atraso de replicação. A marca vai para o cliente (cookie PRIMARY_UNTIL_COOKIE e cabeçalho
+    PRIMARY_UNTIL_HEADER, que clientes sem cookies devolvem nas leituras), e não para a memória do processo: a
+    próxima leitura pode cair em qualquer worker. Uma marca além da janela é ignorada.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self.bind_keys = []
+        self._down_until = {}
+        self._cycle = None
+        self._lock = Lock()
+        self.counters = Counter()
+        if app is not None:
+            self.init_app(app, db)
+
+    @staticmethod
+    def configure_binds(app):
+        """Converte READ_REPLICA_URIS em binds; precisa rodar antes de db.init_app."""
+        uris = app.config.get('READ_REPLICA_URIS') or []
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        for index, uri in enumerate(uris):
+            binds[f'replica_{index}'] = uri
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+    def init_app(self, app, db=None):
+        if db is not None:
+            self.db = db
+        self.bind_keys = [key for key in (app.config.get('SQLALCHEMY_BINDS') or {}) if key.startswith('replica_')]
+        if not self.bind_keys:
+            return
+
+        self.app = app
+        self._cycle = itertools.cycle(self.bind_keys)
+        app.extensions['replica_router'] = self
+        app.after_request(self._after_request)
+
+        with app.app_context():
+            for key in self.bind_keys:
+                event.listen(self.db.engines[key], 'handle_error', self._make_error_handler(key))
+
+    def should_route(self):
+        """Indica se a leitura corrente pode ir para uma réplica."""
+        if not has_request_context() or request.method not in READ_METHODS:
+            return False
+        return not has_write_marker()
+
+    def pick(self):
+        """Retorna o engine da próxima réplica disponível, ou None para usar o primário."""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.bind_keys)):
+                key = next(self._cycle)
+                if self._down_until.get(key, 0) <= now:
+                    return self.db.engines[key]
+        return None
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def _after_request(self, response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            window = self.app.config['READ_REPLICA_STICKY_SECONDS']
+            primary_until = f'{time.time() + window:.3f}'
+            response.set_cookie(PRIMARY_UNTIL_COOKIE, primary_until, max_age=window, httponly=True, samesite='Lax')
+            response.headers[PRIMARY_UNTIL_HEADER] = primary_until
+        return response
+
+    def _make_error_handler(self, key):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, (OperationalError, InterfaceError)):
+                with self._lock:
+                    self._down_until[key] = time.monotonic() + self.app.config['READ_REPLICA_RETRY_SECONDS']
+                _replica_failed.set(True)
+                logging.error(f"Réplica {key} indisponível, leituras voltam para o primário: {context.original_exception}")
+        return handle_error
@@ -0,0 +1,138 @@
+from flask import has_request_context, request
+from sqlalchemy import event
+from logging.handlers import RotatingFileHandler
+from datetime import datetime
+from queue import Queue
+from threading import Thread
+import json
+import logging
+import random
+import sys
+import time
+
+
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+
+class SlowQueryLogger:
+    """
+    Registra as consultas que passam de SLOW_QUERY_THRESHOLD_MS em um log rotativo, uma entrada JSON por linha.
+
+    Usa os eventos before/after_cursor_execute de cada engine (primário e réplicas). Cada entrada traz a
+    duração, o SQL, os parâmetros, o método de repositório que originou a consulta (pela pilha de chamadas)
+    e a rota da requisição. Uma amostra das consultas lentas (SLOW_QUERY_EXPLAIN_SAMPLE_RATE) leva também o
+    plano do `EXPLAIN (FORMAT JSON)` no Postgres.
+
+    O EXPLAIN e a escrita no arquivo ficam em uma thread de fundo, com uma conexão própria do pool: a
+    requisição lenta não espera por eles e a sua transação não é tocada.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self._queue = Queue()
+        self._thread = None
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        if db is not None:
+            self.db = db
+        if not app.config.get('SLOW_QUERY_ENABLED', False):
+            return
+
+        self.app = app
+        self.threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+        self.explain_sample_rate = app.config['SLOW_QUERY_EXPLAIN_SAMPLE_RATE']
+
+        handler = RotatingFileHandler(app.config['SLOW_QUERY_LOG_FILE'], maxBytes=app.config['SLOW_QUERY_LOG_MAX_BYTES'],
+                                      backupCount=app.config['SLOW_QUERY_LOG_BACKUP_COUNT'], encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        # Logger próprio, fora da hierarquia: as entradas vão só para o arquivo de consultas lentas
+        self.logger = logging.Logger('app.slow_query')
+        self.logger.addHandler(handler)
+
+        app.extensions['slow_query_logger'] = self
+        with app.app_context():
+            for engine in self.db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+                event.listen(engine, 'handle_error', self._handle_error)
+
+        self._thread = Thread(target=self._run, name='slow-query-logger', daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """Aguarda até que as entradas pendentes (e seus EXPLAIN) tenham sido gravadas."""
+        self._queue.join()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_started', []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        # Consulta que falhou não passa pelo after_cursor_execute; descarta o seu início
+        started = exception_context.connection.info.get('slow_query_started') if exception_context.connection else None
+        if started:
+            started.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('slow_query_started')
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+        if duration < self.threshold or statement.lstrip().upper().startswith('EXPLAIN'):
+            return
+
+        entry = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'database': conn.engine.url.database,
+            'statement': statement,
+            'parameters': repr(parameters)[:2000],
+            'repository_method': _repository_method(),
+            'route': _route(),
+        }
+        explain = (not executemany and conn.dialect.name == 'postgresql'
+                   and statement.lstrip().upper().startswith(EXPLAINABLE)
+                   and random.random() < self.explain_sample_rate)
+        self._queue.put((entry, conn.engine if explain else None, parameters))
+
+    def _run(self):
+        while True:
+            entry, engine, parameters = self._queue.get()
+            try:
+                if engine is not None:
+                    entry['explain'] = self._explain(engine, entry['statement'], parameters)
+                self.logger.warning(json.dumps(entry, default=str))
+            except Exception as e:
+                logging.error(f"Erro ao registrar consulta lenta: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _explain(engine, statement, parameters):
+        try:
+            with engine.connect() as connection:
+                plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+                connection.rollback()
+            return json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as e:
+            return {'error': str(e)}
+
+
+def _repository_method():
+    """Procura na pilha o método de repositório (app.repositories.*) que executou a consulta."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('app.repositories.'):
+            owner = frame.f_locals.get('self')
+            name = frame.f_code.co_name
+            return f'{type(owner).__name__}.{name}' if owner is not None else f'{module}.{name}'
+        frame = frame.f_back
+    return None
+
+
+def _route():
+    if not has_request_context():
+        return None
+    return {'endpoint': request.endpoint, 'method': request.method, 'path': request.path}
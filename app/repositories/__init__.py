@@ -1,2 +1,8 @@
 from .depatarment_repository import DepartamentRepository
-from .employee_repository import EmployeeRepository
\ No newline at end of file
+from .employee_repository import EmployeeRepository
+from .department_stats_repository import DepartmentStatsRepository
+from .export_repository import ExportRepository
+from .change_log_repository import ChangeLogRepository
+from .group_commit import GroupCommitWriter
+from .idempotency_repository import IdempotencyRepository
+from .job_repository import JobRepository, JobLeaseLost
\ No newline at end of file
@@ -0,0 +1,167 @@
+from sqlalchemy import event, insert, select, update, delete, func, cast, BigInteger, Text
+from sqlalchemy.orm import object_session
+from ..models import Department, Employee, ChangeLog, ChangeLogCompaction
+from datetime import datetime, timedelta
+import logging
+
+
+# Chave do advisory lock que serializa a atribuição de posições do feed
+POSITION_LOCK_KEY = 7_300_029
+
+
+def _xid(expression):
+    return cast(cast(expression, Text), BigInteger)
+
+
+def record_changes(connection, entity: str, entity_ids, action: str):
+    """
+    Registra alterações no change_log usando a conexão (e a transação) de quem alterou os dados.
+
+    Chamada pelos eventos do ORM abaixo e pelas operações em lote, que não passam pelo ORM.
+
+    Args:
+        connection: Conexão da transação corrente.
+        entity (str): Tipo da entidade ('department' ou 'employee').
+        entity_ids (iterable of int): IDs das entidades alteradas.
+        action (str): A ação executada ('created', 'updated' ou 'deleted').
+    """
+    rows = [{'entity': entity, 'entity_id': entity_id, 'action': action} for entity_id in entity_ids]
+    if rows:
+        statement = insert(ChangeLog)
+        if connection.dialect.name == 'postgresql':
+            statement = statement.values(txid=_xid(func.pg_current_xact_id()))
+        connection.execute(statement, rows)
+
+
+def _register_change_events(model, entity: str):
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        record_changes(connection, entity, [target.id], 'created')
+
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        # after_update também é chamado para objetos "sujos" apenas por coleções; esses não mudaram a linha
+        session = object_session(target)
+        if session is None or session.is_modified(target, include_collections=False):
+            record_changes(connection, entity, [target.id], 'updated')
+
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        record_changes(connection, entity, [target.id], 'deleted')
+
+
+_register_change_events(Department, 'department')
+_register_change_events(Employee, 'employee')
+
+
+class ChangeLogRepository():
+    def __init__(self, db):
+        self.db = db
+
+    def assign_positions(self):
+        """
+        Atribui posições no feed às alterações cujas transações já terminaram.
+
+        A sequência de inserção (`seq`) é obtida antes do commit: uma transação longa (lote, mesclagem, importação)
+        pode confirmar uma sequência menor depois que o feed já entregou uma maior, e o cliente a perderia. Por isso o
+        feed é ordenado pela posição, atribuída em ordem crescente só às alterações de transações anteriores ao
+        xmin do snapshot atual (todas já encerradas); alterações de transações futuras recebem posições maiores.
+
+        No SQLite as escritas são serializadas pelo lock do banco, e toda alteração visível já pode ser publicada.
+
+        Chamada por quem escreve, depois do commit (ChangeFeedService, a cada alteração local), e pela compactação:
+        a última transação a terminar atribui as posições das anteriores. A leitura do feed não escreve.
+        """
+        try:
+            self._assign_positions()
+        except Exception:
+            self.db.session.rollback()
+            raise
+
+    def _assign_positions(self):
+        postgres = self.db.session.get_bind().dialect.name == 'postgresql'
+        if postgres:
+            self.db.session.execute(select(func.pg_advisory_xact_lock(POSITION_LOCK_KEY)))
+
+        base = select(func.coalesce(func.max(ChangeLog.position), 0)).scalar_subquery()
+        stable = select(
+            ChangeLog.seq,
+            (base + func.row_number().over(order_by=(ChangeLog.txid, ChangeLog.seq))).label('position')
+        ).where(ChangeLog.position.is_(None))
+        if postgres:
+            stable = stable.where(ChangeLog.txid < _xid(func.pg_snapshot_xmin(func.pg_current_snapshot())))
+        stable = stable.subquery()
+
+        self.db.session.execute(
+            update(ChangeLog).where(ChangeLog.seq == stable.c.seq).values(position=stable.c.position)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.session.commit()
+
+    def list_changes(self, since: int, limit: int):
+        """
+        Lista as alterações com posição no feed maior que `since`, em ordem crescente.
+
+        Args:
+            since (int): Última posição já processada pelo cliente.
+            limit (int): Quantidade máxima de alterações retornadas.
+
+        Returns:
+            list of tuple or None: Tuplas (position, entity, entity_id, action, changed_at); None em caso de falha.
+        """
+        try:
+            rows = self.db.session.execute(
+                select(ChangeLog.position, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.action, ChangeLog.changed_at)
+                .where(ChangeLog.position > since)
+                .order_by(ChangeLog.position)
+                .limit(limit)
+            ).all()
+            return [tuple(row) for row in rows]
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao listar alterações a partir de {since}: {e}")
+            return None
+
+    def get_compacted_through(self):
+        """
+        Retorna a maior posição do feed já removida pela compactação.
+
+        Clientes com `since` menor que esse valor perderam alterações e precisam de uma sincronização completa.
+
+        Returns:
+            int: A maior sequência removida, ou 0 se o histórico nunca foi compactado.
+        """
+        return self.db.session.execute(
+            select(func.coalesce(func.max(ChangeLogCompaction.trimmed_through_seq), 0))
+        ).scalar()
+
+    def compact(self, retention: timedelta):
+        """
+        Remove as alterações mais antigas que a janela de retenção.
+
+        A maior posição removida é guardada em change_log_compaction, para que o feed saiba quando
+        um cliente está atrasado demais.
+
+        Args:
+            retention (timedelta): Por quanto tempo as alterações são mantidas.
+
+        Returns:
+            int or None: Quantidade de alterações removidas; None em caso de falha.
+        """
+        try:
+            self.assign_positions()
+            cutoff = datetime.utcnow() - retention
+            trimmed_through = self.db.session.execute(
+                select(func.max(ChangeLog.position)).where(ChangeLog.changed_at < cutoff)
+            ).scalar()
+            if trimmed_through is None:
+                return 0
+
+            result = self.db.session.execute(delete(ChangeLog).where(ChangeLog.position <= trimmed_through))
+            self.db.session.add(ChangeLogCompaction(trimmed_through_seq=trimmed_through))
+            self.db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao compactar o change_log: {e}")
+            return None
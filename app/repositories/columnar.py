@@ -0,0 +1,18 @@
+def rows_to_columns(result):
+    """
+    Transforma o resultado de uma consulta em colunas: {"coluna": [valores...], ...}.
+
+    As colunas são montadas direto das tuplas retornadas pelo banco (zip), sem criar um dicionário
+    por linha. Os nomes vêm dos rótulos das colunas selecionadas.
+
+    Args:
+        result (Result): Resultado de session.execute(select(...)).
+
+    Returns:
+        dict: Um dicionário com uma lista por coluna, todas com o mesmo tamanho.
+    """
+    names = list(result.keys())
+    rows = result.all()
+    if not rows:
+        return {name: [] for name in names}
+    return dict(zip(names, map(list, zip(*rows))))
@@ -0,0 +1,211 @@
+from sqlalchemy import func, case, select, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..models import Department, Employee, Dependent, DepartmentStats
+import logging
+
+
+class DepartmentStatsRepository():
+    def __init__(self, db):
+        self.db = db
+
+    def apply_delta(self, department_id: int, employees: int = 0, with_dependents: int = 0, dependents: int = 0):
+        """
+        Aplica um incremento (ou decremento) ao resumo de um departamento, dentro da transação corrente.
+
+        Não faz commit: deve ser chamada pelos métodos de escrita de EmployeeRepository antes do commit
+        deles, para que o resumo e os dados de origem sejam confirmados juntos. Se o departamento ainda
+        não tiver linha de resumo (dados anteriores a esta tabela, por exemplo), a linha é calculada do
+        zero a partir de employee e dependent, o que já inclui as alterações pendentes da transação.
+
+        Args:
+            department_id (int): ID do departamento afetado.
+            employees (int): Variação na quantidade de colaboradores.
+            with_dependents (int): Variação na quantidade de colaboradores com dependentes.
+            dependents (int): Variação na quantidade de dependentes.
+        """
+        if not (employees or with_dependents or dependents):
+            return
+
+        self.db.session.flush()
+        result = self.db.session.execute(
+            update(DepartmentStats)
+            .where(DepartmentStats.department_id == department_id)
+            .values(
+                employee_count=DepartmentStats.employee_count + employees,
+                employees_with_dependents=DepartmentStats.employees_with_dependents + with_dependents,
+                dependent_count=DepartmentStats.dependent_count + dependents
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self._insert_computed(department_id, employees, with_dependents, dependents)
+
+    def create_empty(self, department_id: int):
+        """Cria o resumo zerado de um departamento recém-criado, dentro da transação corrente."""
+        self.db.session.add(DepartmentStats(department_id=department_id, employee_count=0,
+                                            employees_with_dependents=0, dependent_count=0))
+
+    def delete(self, department_id: int):
+        """Remove o resumo de um departamento, dentro da transação corrente."""
+        self.db.session.execute(delete(DepartmentStats).where(DepartmentStats.department_id == department_id))
+
+    def get_counts(self, department_id: int):
+        """
+        Lê os contadores de colaboradores de um departamento no resumo, sem contar as linhas de employee.
+
+        Returns:
+            tuple or None: (employee_count, employees_with_dependents); None se o departamento não tiver
+                linha de resumo ou em caso de falha na consulta.
+        """
+        try:
+            row = self.db.session.execute(
+                select(DepartmentStats.employee_count, DepartmentStats.employees_with_dependents)
+                .where(DepartmentStats.department_id == department_id)
+            ).first()
+            return tuple(row) if row is not None else None
+        except Exception as e:
+            logging.error(f"Erro ao ler os contadores do departamento {department_id}: {e}")
+            return None
+
+    def get_totals(self, department_id: int):
+        """
+        Lê os três contadores de um departamento dentro da transação corrente, para transferi-los a outro.
+
+        Sem linha de resumo, calcula os valores a partir de employee e dependent.
+
+        Returns:
+            tuple: (employee_count, employees_with_dependents, dependent_count).
+        """
+        row = self.db.session.execute(
+            select(DepartmentStats.employee_count, DepartmentStats.employees_with_dependents,
+                   DepartmentStats.dependent_count)
+            .where(DepartmentStats.department_id == department_id)
+        ).first()
+        if row is None:
+            row = self.db.session.execute(self._aggregate_query(department_id)).first()
+            return tuple(row[1:]) if row is not None else (0, 0, 0)
+        return tuple(row)
+
+    def list_stats(self):
+        """
+        Lista o resumo de todos os departamentos ordenados pelo ID.
+
+        Departamentos sem linha de resumo (sem colaboradores) aparecem zerados.
+
+        Returns:
+            list of tuple or None: Tuplas (id, name, employee_count, employees_with_dependents, dependent_count);
+                None em caso de falha na consulta.
+        """
+        try:
+            rows = self.db.session.execute(
+                select(
+                    Department.id,
+                    Department.name,
+                    func.coalesce(DepartmentStats.employee_count, 0),
+                    func.coalesce(DepartmentStats.employees_with_dependents, 0),
+                    func.coalesce(DepartmentStats.dependent_count, 0)
+                )
+                .outerjoin(DepartmentStats, DepartmentStats.department_id == Department.id)
+                .order_by(Department.id)
+            ).all()
+            return [tuple(row) for row in rows]
+        except Exception as e:
+            logging.error(f"Erro ao listar estatísticas dos departamentos: {e}")
+            return None
+
+    def rebuild(self):
+        """
+        Recalcula todo o resumo a partir de employee e dependent e substitui o conteúdo da tabela.
+
+        Usado pelo comando de linha de comando para checagens de consistência. Compara o resumo
+        armazenado com o recalculado antes de substituí-lo.
+
+        Returns:
+            list of int or None: IDs dos departamentos cujo resumo estava divergente; None em caso de falha.
+        """
+        try:
+            aggregated = {row[0]: tuple(row[1:]) for row in self.db.session.execute(self._aggregate_query())}
+            computed = {
+                department_id: aggregated.get(department_id, (0, 0, 0))
+                for department_id in self.db.session.execute(select(Department.id)).scalars()
+            }
+            stored = {
+                row[0]: tuple(row[1:]) for row in self.db.session.execute(
+                    select(
+                        DepartmentStats.department_id,
+                        DepartmentStats.employee_count,
+                        DepartmentStats.employees_with_dependents,
+                        DepartmentStats.dependent_count
+                    )
+                )
+            }
+            drifted = sorted(
+                department_id for department_id in computed.keys() | stored.keys()
+                if computed.get(department_id, (0, 0, 0)) != stored.get(department_id, (0, 0, 0))
+            )
+
+            self.db.session.execute(delete(DepartmentStats))
+            self.db.session.add_all([
+                DepartmentStats(
+                    department_id=department_id,
+                    employee_count=values[0],
+                    employees_with_dependents=values[1],
+                    dependent_count=values[2]
+                ) for department_id, values in computed.items()
+            ])
+            self.db.session.commit()
+            return drifted
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao reconstruir estatísticas dos departamentos: {e}")
+            return None
+
+    def _insert_computed(self, department_id: int, employees: int, with_dependents: int, dependents: int):
+        """
+        Cria o resumo calculado do departamento ou, se outra transação o criou nesse meio tempo, aplica o incremento.
+
+        No Postgres, duas primeiras escritas concorrentes no mesmo departamento não enxergam a linha uma da
+        outra: a segunda espera a primeira no INSERT ... ON CONFLICT e soma apenas o próprio incremento à linha
+        criada por ela, que já contém todos os dados confirmados. No SQLite as escritas são serializadas pelo
+        lock do banco e o INSERT simples basta.
+        """
+        row = self.db.session.execute(self._aggregate_query(department_id)).first()
+        values = {
+            'department_id': department_id,
+            'employee_count': row[1] if row else 0,
+            'employees_with_dependents': row[2] if row else 0,
+            'dependent_count': row[3] if row else 0
+        }
+        if self.db.session.get_bind().dialect.name != 'postgresql':
+            self.db.session.add(DepartmentStats(**values))
+            return
+
+        statement = pg_insert(DepartmentStats).values(**values)
+        self.db.session.execute(statement.on_conflict_do_update(
+            index_elements=[DepartmentStats.department_id],
+            set_={
+                'employee_count': DepartmentStats.employee_count + employees,
+                'employees_with_dependents': DepartmentStats.employees_with_dependents + with_dependents,
+                'dependent_count': DepartmentStats.dependent_count + dependents
+            }
+        ).execution_options(synchronize_session=False))
+
+    def _aggregate_query(self, department_id: int = None):
+        per_employee = (
+            select(Employee.department_id, func.count(Dependent.id).label('dependents'))
+            .outerjoin(Dependent, Employee.id == Dependent.employee_id)
+            .group_by(Employee.id, Employee.department_id)
+        )
+        if department_id is not None:
+            per_employee = per_employee.where(Employee.department_id == department_id)
+        per_employee = per_employee.subquery()
+
+        return (
+            select(
+                per_employee.c.department_id,
+                func.count(),
+                func.coalesce(func.sum(case((per_employee.c.dependents > 0, 1), else_=0)), 0),
+                func.coalesce(func.sum(per_employee.c.dependents), 0)
+            )
+            .group_by(per_employee.c.department_id)
+        )
@@ -1,11 +1,17 @@
 from sqlalchemy.exc import SQLAlchemyError
-from ..models import Department
+from sqlalchemy import select, update, delete
+from ..models import Department, Employee, read_only
+from .department_stats_repository import DepartmentStatsRepository
+from .change_log_repository import record_changes
+from .signals import department_changed, employee_changed, announce
+from .columnar import rows_to_columns
 import logging
 
 
 class DepartamentRepository():
     def __init__(self, db):
         self.db = db
+        self.stats = DepartmentStatsRepository(db)
 
     def create_department(self, name: str):
         """
@@ -24,8 +30,14 @@ class DepartamentRepository():
         try:
             new_department = Department(name=name)
             self.db.session.add(new_department)
+            self.db.session.flush()
+            self.stats.create_empty(new_department.id)
+            department_id = new_department.id
+            changed = announce(self.db.session.connection(), department_changed, 'created',
+                               items=[(department_id, name)])
             self.db.session.commit()
-            return new_department.id
+            changed()
+            return department_id
         except Exception as e:
             self.db.session.rollback()
             logging.error(f"Erro ao cadastrar o departamento: {e}")
@@ -35,26 +47,92 @@ class DepartamentRepository():
         """Verifica se um departamento com o dado nome já existe no banco de dados."""
         return Department.query.filter_by(name=name).first() is not None
         
+    @read_only
     def list_departments(self):
         """
         Lista todos os departamentos ordenados pelo ID.
 
         Esta função recupera todos os departamentos do banco de dados, ordenados pelo
-        ID de forma ascendente. Em caso de falha na consulta ao banco, loga o erro e
-        retorna uma lista vazia.
+        ID de forma ascendente. Seleciona apenas id e name e monta os dicionários direto
+        das tuplas, sem carregar objetos Department na sessão. Em caso de falha na consulta
+        ao banco, loga o erro e retorna uma lista vazia.
 
         Returns:
-            list: Uma lista de objetos Department se a consulta for bem-sucedida,
+            list of dict: Uma lista de dicionários {'id', 'name'} se a consulta for bem-sucedida,
                 ou uma lista vazia se houver falha na consulta.
         """
         try:
-            departments = Department.query.order_by(Department.id).all()
-            return departments
+            result = self.db.session.execute(select(Department.id, Department.name).order_by(Department.id))
+            return [{'id': id, 'name': name} for id, name in result]
         except Exception as e:
             logging.error(f"Erro ao listar departamentos: {e}")
             return []
+
+    @read_only
+    def list_department_columns(self):
+        """
+        Lista todos os departamentos ordenados pelo ID, em formato colunar.
+
+        Seleciona apenas as colunas id e name e monta as listas direto das tuplas do resultado,
+        sem carregar objetos Department nem criar um dicionário por departamento.
+
+        Returns:
+            dict or None: {'id': [...], 'name': [...]} se a consulta for bem-sucedida; None em caso de falha.
+        """
+        try:
+            result = self.db.session.execute(select(Department.id, Department.name).order_by(Department.id))
+            return rows_to_columns(result)
+        except Exception as e:
+            logging.error(f"Erro ao listar departamentos em formato colunar: {e}")
+            return None
+
+    @read_only
+    def list_department_names(self):
+        """
+        Lista o ID e o nome de todos os departamentos, sem carregar os objetos Department.
+
+        Usado para montar índices em memória, como o de autocompletar.
+
+        Returns:
+            list of tuple or None: Pares (id, name) se a consulta for bem-sucedida; None em caso de falha.
+        """
+        try:
+            return [tuple(row) for row in self.db.session.query(Department.id, Department.name).all()]
+        except Exception as e:
+            logging.error(f"Erro ao listar nomes de departamentos: {e}")
+            return None
         
-    def update_department(self, department_id: int, new_name: str):
+    def list_department_ids(self):
+        """
+        Lista os IDs de todos os departamentos.
+
+        Lê sempre do primário: é usado pelo cache de validação de department_id, que não pode
+        perder um departamento recém-criado por atraso de replicação.
+
+        Returns:
+            list of int or None: IDs dos departamentos; None em caso de falha.
+        """
+        try:
+            return [row.id for row in self.db.session.query(Department.id).all()]
+        except Exception as e:
+            logging.error(f"Erro ao listar IDs de departamentos: {e}")
+            return None
+
+    @read_only
+    def get_department_stats(self):
+        """
+        Lista o resumo (colaboradores, dependentes) de todos os departamentos.
+
+        Lê a tabela department_stats, mantida incrementalmente pelas escritas de EmployeeRepository,
+        em vez de agrupar employee e dependent a cada chamada.
+
+        Returns:
+            list of tuple or None: Tuplas (id, name, employee_count, employees_with_dependents, dependent_count);
+                None em caso de falha.
+        """
+        return self.stats.list_stats()
+
+    def update_department(self, department_id: int, new_name: str, expected_version: int = None):
         """
         Atualiza o nome de um departamento existente.
 
@@ -66,15 +144,20 @@ class DepartamentRepository():
         Args:
             department_id (int): O ID do departamento a ser atualizado.
             new_name (str): O novo nome a ser atribuído ao departamento.
+            expected_version (int, optional): Versão que o departamento deve ter para ser atualizado. O UPDATE
+                                              também é condicionado a ela (version_id_col).
 
         Returns:
             bool: True se o departamento for atualizado com sucesso, False caso contrário.
         """
         try:
             department = Department.query.get(department_id)
-            if department:
+            if department and (expected_version is None or department.version == expected_version):
                 department.name = new_name
+                changed = announce(self.db.session.connection(), department_changed, 'updated',
+                                   items=[(department_id, new_name)])
                 self.db.session.commit()
+                changed()
                 return True
             return False
         except Exception as e:
@@ -82,7 +165,7 @@ class DepartamentRepository():
             logging.error(f"Erro ao atualizar o departamento: {e}")
             return False
         
-    def delete_department(self, department_id: int):
+    def delete_department(self, department_id: int, expected_version: int = None):
         """
         Exclui um departamento específico pelo ID.
 
@@ -93,15 +176,21 @@ class DepartamentRepository():
 
         Args:
             department_id (int): O ID do departamento a ser excluído.
+            expected_version (int, optional): Versão que o departamento deve ter para ser excluído.
 
         Returns:
             bool: True se o departamento for excluído com sucesso, False caso contrário.
         """
         try:
             department = Department.query.get(department_id)
-            if department:
+            if department and (expected_version is None or department.version == expected_version):
+                name = department.name
+                self.stats.delete(department_id)
                 self.db.session.delete(department)
+                changed = announce(self.db.session.connection(), department_changed, 'deleted',
+                                   items=[(department_id, name)])
                 self.db.session.commit()
+                changed()
                 return True
             return False
         except Exception as e:
@@ -109,6 +198,74 @@ class DepartamentRepository():
             logging.error(f"Erro ao excluir o departamento: {e}")
             return False
         
+    def merge_departments(self, source_id: int, target_id: int, expected_version: int = None):
+        """
+        Mescla um departamento em outro: move todos os colaboradores da origem para o destino e exclui a origem.
+
+        Tudo acontece em uma única transação e com um número fixo de comandos, qualquer que seja a quantidade
+        de colaboradores: trava os dois departamentos (SELECT ... FOR UPDATE, em ordem de ID), move os
+        colaboradores com um único UPDATE ... RETURNING, transfere o resumo da origem para o destino, registra
+        as alterações no change_log e exclui a origem.
+
+        Args:
+            source_id (int): ID do departamento a ser mesclado (e excluído).
+            target_id (int): ID do departamento que recebe os colaboradores.
+            expected_version (int, optional): Versão que o departamento de origem deve ter para ser mesclado.
+
+        Returns:
+            list of int or None: IDs dos colaboradores movidos se bem-sucedido; None se algum dos departamentos
+                não existir, se a origem estiver em outra versão ou em caso de falha.
+        """
+        try:
+            departments = {
+                id: (name, version) for id, name, version in self.db.session.execute(
+                    select(Department.id, Department.name, Department.version)
+                    .where(Department.id.in_([source_id, target_id]))
+                    .order_by(Department.id)
+                    .with_for_update()
+                )
+            }
+            if source_id not in departments or target_id not in departments:
+                self.db.session.rollback()
+                return None
+            source_name, source_version = departments[source_id]
+            if expected_version is not None and source_version != expected_version:
+                self.db.session.rollback()
+                return None
+
+            # Lidos antes do UPDATE: depois dele, os colaboradores já não aparecem na origem
+            totals = self.stats.get_totals(source_id)
+            moved = self.db.session.execute(
+                update(Employee)
+                .where(Employee.department_id == source_id)
+                .values(department_id=target_id, version=Employee.version + 1)
+                .returning(Employee.id, Employee.name)
+                .execution_options(synchronize_session=False)
+            ).all()
+            self.stats.apply_delta(target_id, *totals)
+            self.stats.delete(source_id)
+
+            connection = self.db.session.connection()
+            record_changes(connection, 'employee', [id for id, name in moved], 'updated')
+            record_changes(connection, 'department', [source_id], 'deleted')
+            self.db.session.execute(delete(Department).where(Department.id == source_id)
+                                    .execution_options(synchronize_session=False))
+            changes = []
+            if moved:
+                changes.append(announce(connection, employee_changed, 'updated', items=[tuple(row) for row in moved],
+                                        department_ids=[source_id, target_id]))
+            changes.append(announce(connection, department_changed, 'deleted', items=[(source_id, source_name)]))
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao mesclar o departamento {source_id} no departamento {target_id}: {e}")
+            return None
+
+        for changed in changes:
+            changed()
+        return sorted(id for id, name in moved)
+
+    @read_only
     def get_department_by_id(self, department_id: int):
         """
         Busca um departamento pelo seu ID.
@@ -131,3 +288,22 @@ class DepartamentRepository():
         except Exception as e:
             logging.error(f"Erro ao buscar o departamento: {e}")
             return None
+
+    @read_only
+    def get_department_version(self, department_id: int):
+        """
+        Busca apenas a versão de um departamento, para responder requisições condicionais.
+
+        Args:
+            department_id (int): O ID do departamento.
+
+        Returns:
+            int or None: A versão do departamento; None se não for encontrado ou em caso de erro.
+        """
+        try:
+            return self.db.session.execute(
+                select(Department.version).where(Department.id == department_id)
+            ).scalar_one_or_none()
+        except Exception as e:
+            logging.error(f"Erro ao buscar a versão do departamento {department_id}: {e}")
+            return None
@@ -1,13 +1,22 @@
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
-from ..models import Employee, Dependent
+from sqlalchemy import func, select, exists, tuple_, update, delete, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Integer
+from ..models import Department, Employee, Dependent, read_only
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import flag_modified
+from .department_stats_repository import DepartmentStatsRepository
+from .signals import employee_changed, announce
+from .change_log_repository import record_changes
+from collections import defaultdict
+from .columnar import rows_to_columns
 import logging
 
 
 class EmployeeRepository():
     def __init__(self, db):
         self.db = db
+        self.stats = DepartmentStatsRepository(db)
 
     def create_employee(self, name: str, department_id: int, dependents=None):
         """
@@ -27,22 +36,78 @@ class EmployeeRepository():
             int or None: Retorna o ID do novo colaborador se bem-sucedido; None em caso de falha.
         """
         try:
-            new_employee = Employee(name=name, department_id=department_id)
-            self.db.session.add(new_employee)
-            self.db.session.flush()  # Flush para obter o ID antes do commit
-
-            if dependents:
-                for dependent_name in dependents:
-                    new_dependent = Dependent(name=dependent_name, employee_id=new_employee.id)
-                    self.db.session.add(new_dependent)
-
+            employee_id = self._add_employee(name, department_id, dependents)
+            changed = announce(self.db.session.connection(), employee_changed, 'created',
+                               items=[(employee_id, name)], department_ids=[department_id])
             self.db.session.commit()
-            return new_employee.id  
+            changed()
+            return employee_id
         except Exception as e:
             self.db.session.rollback()
             logging.error(f"Erro ao adicionar o colaborador: {e}")
             return None  
 
+    def create_employees(self, employees, before_commit=None):
+        """
+        Adiciona vários colaboradores (e seus dependentes) em uma única transação.
+
+        Usada pelo modo de group commit: cada colaborador é inserido dentro de um savepoint, então a
+        falha de um deles desfaz apenas aquele item, e todos os demais são confirmados com um único commit.
+
+        Args:
+            employees (list of tuple): Tuplas (name, department_id, dependents), no formato de create_employee.
+            before_commit (callable, optional): Chamada com os resultados antes do commit, dentro da mesma
+                transação; usada pelas importações para gravar o progresso junto com o lote.
+
+        Returns:
+            list: Para cada item, na mesma ordem, o ID do colaborador criado ou None em caso de falha.
+        """
+        results = []
+        created = []
+        try:
+            for name, department_id, dependents in employees:
+                try:
+                    with self.db.session.begin_nested():
+                        employee_id = self._add_employee(name, department_id, dependents)
+                    results.append(employee_id)
+                    created.append((employee_id, name, department_id))
+                except Exception as e:
+                    logging.error(f"Erro ao adicionar o colaborador {name} no lote: {e}")
+                    results.append(None)
+
+            if before_commit is not None:
+                before_commit(results)
+            changed = None
+            if created:
+                changed = announce(self.db.session.connection(), employee_changed, 'created',
+                                   items=[(employee_id, name) for employee_id, name, _ in created],
+                                   department_ids=sorted({department_id for _, _, department_id in created}))
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao confirmar o lote de colaboradores: {e}")
+            return [None] * len(employees)
+
+        if changed is not None:
+            changed()
+        return results
+
+    def _add_employee(self, name: str, department_id: int, dependents=None):
+        """Insere o colaborador e seus dependentes na transação corrente, sem commit, e retorna o ID."""
+        new_employee = Employee(name=name, department_id=department_id)
+        self.db.session.add(new_employee)
+        self.db.session.flush()  # Flush para obter o ID antes do commit
+
+        if dependents:
+            for dependent_name in dependents:
+                new_dependent = Dependent(name=dependent_name, employee_id=new_employee.id)
+                self.db.session.add(new_dependent)
+
+        dependents_count = len(dependents) if dependents else 0
+        self.stats.apply_delta(department_id, 1, int(dependents_count > 0), dependents_count)
+        return new_employee.id
+
+    @read_only
     def get_employees_by_department(self, department_id: int):
         """
         Retorna uma lista de colaboradores de um determinado departamento, indicando se têm dependentes.
@@ -60,27 +125,134 @@ class EmployeeRepository():
                         se nenhum colaborador for encontrado.
         """
         try:
-            employees = (self.db.session.query(Employee, func.count(Dependent.id).label('dependents_count'))
-                        .outerjoin(Dependent, Employee.id == Dependent.employee_id)
-                        .filter(Employee.department_id == department_id)
-                        .group_by(Employee.id)
-                        .all())
-            if not employees: 
-                return []  
-            return [{
-                'id': emp.Employee.id,
-                'name': emp.Employee.name,
-                'have_dependents': emp.dependents_count > 0
-            } for emp in employees]
+            result = self.db.session.execute(self._employees_by_department(department_id))
+            return [{'id': id, 'name': name, 'have_dependents': have_dependents}
+                    for id, name, have_dependents in result]
         except Exception as e:
             logging.error(f"Erro ao buscar colaboradores do departamento {department_id}: {e}")
             return None  
 
+    @read_only
+    def get_employee_columns_by_department(self, department_id: int):
+        """
+        Retorna os colaboradores de um departamento em formato colunar, indicando se têm dependentes.
+
+        Mesma consulta de get_employees_by_department, mas selecionando apenas id, name e a flag de
+        dependentes, e montando as listas direto das tuplas do resultado, sem um dicionário por colaborador.
+
+        Args:
+            department_id (int): ID do departamento do qual se deseja listar colaboradores.
+
+        Returns:
+            dict or None: {'id': [...], 'name': [...], 'have_dependents': [...]} (listas vazias se o
+                departamento não tiver colaboradores); None em caso de falha.
+        """
+        try:
+            result = self.db.session.execute(self._employees_by_department(department_id))
+            return rows_to_columns(result)
+        except Exception as e:
+            logging.error(f"Erro ao buscar colaboradores do departamento {department_id} em formato colunar: {e}")
+            return None
+
+    @read_only
+    def get_employees_page(self, department_id: int, limit: int, sort: str = 'id', after=None,
+                           have_dependents: bool = None, name_prefix: str = None):
+        """
+        Retorna uma página dos colaboradores de um departamento, com paginação por cursor (keyset).
+
+        A página começa logo depois da chave `after` na ordem pedida, então o custo não cresce com o número
+        da página. As consultas são atendidas pelos índices (department_id, id) e (department_id, name, id)
+        de employee e pelo índice de dependent.employee_id, usado no EXISTS de have_dependents.
+
+        Args:
+            department_id (int): ID do departamento do qual se deseja listar colaboradores.
+            limit (int): Tamanho da página. É lida uma linha a mais, para saber se há próxima página.
+            sort (str): 'id' ou 'name' (desempate pelo id).
+            after (tuple, optional): Chave da última linha da página anterior: (id,) ou (name, id).
+            have_dependents (bool, optional): Filtra colaboradores com (True) ou sem (False) dependentes.
+            name_prefix (str, optional): Filtra pelo início do nome.
+
+        Returns:
+            list of tuple or None: Até limit + 1 tuplas (id, name, have_dependents); None em caso de falha.
+        """
+        try:
+            has_dependents = exists().where(Dependent.employee_id == Employee.id)
+            query = (select(Employee.id, Employee.name, has_dependents.label('have_dependents'))
+                     .where(Employee.department_id == department_id))
+            if have_dependents is not None:
+                query = query.where(has_dependents if have_dependents else ~has_dependents)
+            if name_prefix:
+                query = query.where(Employee.name.startswith(name_prefix, autoescape=True))
+
+            if sort == 'name':
+                if after is not None:
+                    query = query.where(tuple_(Employee.name, Employee.id) > tuple_(*after))
+                query = query.order_by(Employee.name, Employee.id)
+            else:
+                if after is not None:
+                    query = query.where(Employee.id > after[0])
+                query = query.order_by(Employee.id)
+
+            return [tuple(row) for row in self.db.session.execute(query.limit(limit + 1))]
+        except Exception as e:
+            logging.error(f"Erro ao buscar a página de colaboradores do departamento {department_id}: {e}")
+            return None
+
+    @read_only
+    def count_employees(self, department_id: int, have_dependents: bool = None, name_prefix: str = None):
+        """
+        Conta os colaboradores de um departamento que atendem aos filtros, para quando o resumo não basta (name_prefix).
+
+        Returns:
+            int or None: A quantidade de colaboradores; None em caso de falha.
+        """
+        try:
+            has_dependents = exists().where(Dependent.employee_id == Employee.id)
+            query = select(func.count(Employee.id)).where(Employee.department_id == department_id)
+            if have_dependents is not None:
+                query = query.where(has_dependents if have_dependents else ~has_dependents)
+            if name_prefix:
+                query = query.where(Employee.name.startswith(name_prefix, autoescape=True))
+            return self.db.session.execute(query).scalar()
+        except Exception as e:
+            logging.error(f"Erro ao contar os colaboradores do departamento {department_id}: {e}")
+            return None
+
+    @read_only
+    def get_department_counts(self, department_id: int):
+        """Contadores (employee_count, employees_with_dependents) do departamento, lidos de department_stats."""
+        return self.stats.get_counts(department_id)
+
+    @staticmethod
+    def _employees_by_department(department_id: int):
+        """Consulta das tuplas (id, name, have_dependents) de um departamento, sem carregar objetos Employee."""
+        return (select(Employee.id, Employee.name, (func.count(Dependent.id) > 0).label('have_dependents'))
+                .outerjoin(Dependent, Employee.id == Dependent.employee_id)
+                .where(Employee.department_id == department_id)
+                .group_by(Employee.id))
+
+    @read_only
+    def list_employee_names(self):
+        """
+        Lista o ID e o nome de todos os colaboradores, sem carregar os objetos Employee.
+
+        Usado para montar índices em memória, como o de autocompletar.
+
+        Returns:
+            list of tuple or None: Pares (id, name) se a consulta for bem-sucedida; None em caso de falha.
+        """
+        try:
+            return [tuple(row) for row in self.db.session.query(Employee.id, Employee.name).all()]
+        except Exception as e:
+            logging.error(f"Erro ao listar nomes de colaboradores: {e}")
+            return None
+
     def exists_employee(self, name: str):
         """Verifica se um colaborador com o dado nome já existe no banco de dados."""
         return Employee.query.filter_by(name=name).first() is not None
         
-    def update_employee(self, employee_id: int, new_name: str = None, new_department_id: int = None, new_dependents: list = None):
+    def update_employee(self, employee_id: int, new_name: str = None, new_department_id: int = None, new_dependents: list = None,
+                        expected_version: int = None):
         """
         Atualiza os dados de um colaborador existente no banco de dados.
 
@@ -94,10 +266,13 @@ class EmployeeRepository():
             new_department_id (int, optional): O novo ID do departamento, se uma mudança for necessária.
             new_dependents (list of str, optional): Uma nova lista de nomes de dependentes para substituir
                                                     os atuais, se uma mudança for necessária.
+            expected_version (int, optional): Versão que o colaborador deve ter para ser atualizado. O UPDATE
+                                              também é condicionado a ela, o que protege contra uma escrita
+                                              concorrente entre a leitura e o commit.
 
         Returns:
-            bool: True se a atualização for bem-sucedida, False se falhar devido a um erro ou se o colaborador
-                não for encontrado.
+            bool: True se a atualização for bem-sucedida, False se falhar devido a um erro, se o colaborador
+                não for encontrado ou se a versão não for a esperada.
 
         Raises:
             Exception: Captura e loga qualquer exceção que ocorra durante a operação de atualização,
@@ -107,14 +282,28 @@ class EmployeeRepository():
             employee = Employee.query.get(employee_id)
             if not employee:
                 return False  
+            if expected_version is not None and employee.version != expected_version:
+                return False
+
+            department_ids = [employee.department_id]
+
+            # Contagem anterior de dependentes, necessária para manter o resumo do departamento
+            old_dependents_count = None
+            if new_department_id is not None or new_dependents is not None:
+                old_dependents_count = Dependent.query.filter_by(employee_id=employee_id).count()
 
             if new_name:
                 employee.name = new_name
             
             if new_department_id is not None:
                 employee.department_id = new_department_id
+                if new_department_id not in department_ids:
+                    department_ids.append(new_department_id)
 
             if new_dependents is not None:
+                # Marca o colaborador como alterado mesmo que só os dependentes mudem (registra no change_log
+                # e incrementa a versão)
+                flag_modified(employee, 'name')
                 # Remover dependentes atuais
                 Dependent.query.filter_by(employee_id=employee_id).delete()
                 # Adicionar novos dependentes
@@ -122,19 +311,203 @@ class EmployeeRepository():
                     new_dependent = Dependent(name=dependent_name, employee_id=employee_id)
                     self.db.session.add(new_dependent)
 
+            if old_dependents_count is not None:
+                new_dependents_count = len(new_dependents) if new_dependents is not None else old_dependents_count
+                self._move_department_stats(department_ids[0], old_dependents_count,
+                                            employee.department_id, new_dependents_count)
+
+            changed = announce(self.db.session.connection(), employee_changed, 'updated',
+                               items=[(employee_id, employee.name)], department_ids=department_ids)
             self.db.session.commit()
+            changed()
             return True
         except Exception as e:
             self.db.session.rollback()
             logging.error(f"Erro ao atualizar dados do colaborador: {e}")
             return False
             
+    def _move_department_stats(self, old_department_id: int, old_dependents_count: int,
+                               new_department_id: int, new_dependents_count: int):
+        """Ajusta o resumo dos departamentos quando um colaborador troca de departamento e/ou de dependentes."""
+        old_has, new_has = int(old_dependents_count > 0), int(new_dependents_count > 0)
+        if old_department_id == new_department_id:
+            self.stats.apply_delta(new_department_id, 0, new_has - old_has, new_dependents_count - old_dependents_count)
+        else:
+            self.stats.apply_delta(old_department_id, -1, -old_has, -old_dependents_count)
+            self.stats.apply_delta(new_department_id, 1, new_has, new_dependents_count)
+
+    def move_employees(self, target_department_id: int, employee_ids=None, source_department_id: int = None,
+                       have_dependents: bool = None, name_prefix: str = None):
+        """
+        Move vários colaboradores para outro departamento em uma única transação.
+
+        Os colaboradores são escolhidos pela lista `employee_ids` ou, sem ela, pelo filtro (departamento de
+        origem obrigatório, have_dependents e name_prefix opcionais). Um SELECT ... FOR UPDATE trava as linhas e
+        lê o departamento e a quantidade de dependentes de cada uma (o RETURNING do UPDATE só enxerga os valores
+        novos), e um único UPDATE ... WHERE id = ANY(...) RETURNING id move todas, incrementando a versão.
+        O resumo dos departamentos e o change_log são atualizados na mesma transação.
+
+        Args:
+            target_department_id (int): Departamento de destino, já validado pelo chamador.
+            employee_ids (list of int, optional): IDs dos colaboradores a mover.
+            source_department_id (int, optional): Departamento de origem, quando a seleção é por filtro.
+            have_dependents (bool, optional): Filtro por colaboradores com ou sem dependentes.
+            name_prefix (str, optional): Filtro pelo início do nome.
+
+        Returns:
+            tuple or None: (moved, unchanged), com os IDs movidos e os que já estavam no destino;
+                None em caso de falha (nada é alterado).
+        """
+        try:
+            rows = self._lock_for_bulk(employee_ids, source_department_id, have_dependents, name_prefix)
+
+            candidates = {id: (name, department_id, count) for id, name, department_id, count in rows
+                          if department_id != target_department_id}
+            unchanged = sorted(id for id, _, department_id, _ in rows if department_id == target_department_id)
+            if not candidates:
+                self.db.session.commit()
+                return [], unchanged
+
+            moved = self.db.session.execute(
+                update(Employee)
+                .where(self._id_in(Employee.id, list(candidates)))
+                .values(department_id=target_department_id, version=Employee.version + 1)
+                .returning(Employee.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+
+            deltas = defaultdict(lambda: [0, 0, 0])
+            for employee_id in moved:
+                _, department_id, count = candidates[employee_id]
+                for department, sign in ((department_id, -1), (target_department_id, 1)):
+                    delta = deltas[department]
+                    delta[0] += sign
+                    delta[1] += sign * int(count > 0)
+                    delta[2] += sign * count
+            # Resumos atualizados em ordem de departamento, pelo mesmo motivo das linhas de colaboradores
+            for department_id, (employees, with_dependents, dependents) in sorted(deltas.items()):
+                self.stats.apply_delta(department_id, employees, with_dependents, dependents)
+            connection = self.db.session.connection()
+            record_changes(connection, 'employee', moved, 'updated')
+            changed = None
+            if moved:
+                changed = announce(connection, employee_changed, 'updated',
+                                   items=[(id, candidates[id][0]) for id in moved],
+                                   department_ids=sorted({candidates[id][1] for id in moved} | {target_department_id}))
+
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao mover colaboradores para o departamento {target_department_id}: {e}")
+            return None
+
+        if changed is not None:
+            changed()
+        return sorted(moved), unchanged
+
+    def delete_employees(self, employee_ids=None, source_department_id: int = None, have_dependents: bool = None,
+                         name_prefix: str = None):
+        """
+        Exclui vários colaboradores, e os seus dependentes, em uma única transação.
+
+        Os colaboradores são escolhidos pela lista `employee_ids` ou, sem ela, pelo filtro (departamento de
+        origem obrigatório, have_dependents e name_prefix opcionais). Um SELECT ... FOR UPDATE trava as linhas e
+        lê o departamento e a quantidade de dependentes de cada uma; em seguida um DELETE remove os dependentes
+        e outro DELETE ... RETURNING remove os colaboradores, sem carregar objetos ORM. O resumo dos
+        departamentos e o change_log são atualizados na mesma transação.
+
+        Args:
+            employee_ids (list of int, optional): IDs dos colaboradores a excluir.
+            source_department_id (int, optional): Departamento dos colaboradores, quando a seleção é por filtro.
+            have_dependents (bool, optional): Filtro por colaboradores com ou sem dependentes.
+            name_prefix (str, optional): Filtro pelo início do nome.
+
+        Returns:
+            list of int or None: IDs excluídos; None em caso de falha (nada é alterado).
+        """
+        try:
+            rows = self._lock_for_bulk(employee_ids, source_department_id, have_dependents, name_prefix)
+            candidates = {id: (name, department_id, count) for id, name, department_id, count in rows}
+            if not candidates:
+                self.db.session.commit()
+                return []
+
+            self.db.session.execute(delete(Dependent).where(self._id_in(Dependent.employee_id, list(candidates)))
+                                    .execution_options(synchronize_session=False))
+            deleted = self.db.session.execute(
+                delete(Employee)
+                .where(self._id_in(Employee.id, list(candidates)))
+                .returning(Employee.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+
+            deltas = defaultdict(lambda: [0, 0, 0])
+            for employee_id in deleted:
+                _, department_id, count = candidates[employee_id]
+                delta = deltas[department_id]
+                delta[0] -= 1
+                delta[1] -= int(count > 0)
+                delta[2] -= count
+            for department_id, (employees, with_dependents, dependents) in sorted(deltas.items()):
+                self.stats.apply_delta(department_id, employees, with_dependents, dependents)
+            connection = self.db.session.connection()
+            record_changes(connection, 'employee', deleted, 'deleted')
+            changed = None
+            if deleted:
+                changed = announce(connection, employee_changed, 'deleted',
+                                   items=[(id, candidates[id][0]) for id in deleted],
+                                   department_ids=sorted({candidates[id][1] for id in deleted}))
+
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao excluir colaboradores em lote: {e}")
+            return None
+
+        if changed is not None:
+            changed()
+        return sorted(deleted)
+
+    def _lock_for_bulk(self, employee_ids=None, source_department_id: int = None, have_dependents: bool = None,
+                       name_prefix: str = None):
+        """
+        Trava e lê (id, name, department_id, dependents_count) dos colaboradores de uma operação em lote.
+
+        As linhas são travadas em ordem de id, qualquer que seja o plano da consulta: duas operações em lote
+        concorrentes com colaboradores em comum esperam uma pela outra em vez de entrarem em deadlock.
+        """
+        dependents_count = (select(func.count(Dependent.id)).where(Dependent.employee_id == Employee.id)
+                            .scalar_subquery())
+        query = select(Employee.id, Employee.name, Employee.department_id, dependents_count)
+        if employee_ids is not None:
+            query = query.where(self._id_in(Employee.id, employee_ids))
+        else:
+            query = query.where(Employee.department_id == source_department_id)
+            if have_dependents is not None:
+                has_dependents = exists().where(Dependent.employee_id == Employee.id)
+                query = query.where(has_dependents if have_dependents else ~has_dependents)
+            if name_prefix:
+                query = query.where(Employee.name.startswith(name_prefix, autoescape=True))
+        return self.db.session.execute(query.order_by(Employee.id).with_for_update(of=Employee)).all()
+
+    def _id_in(self, column, ids):
+        """`column = ANY(:ids)` com um único parâmetro array no Postgres; IN nos demais bancos."""
+        if self.db.session.get_bind().dialect.name == 'postgresql':
+            return column == any_(bindparam('ids', list(ids), type_=ARRAY(Integer), unique=True))
+        return column.in_(list(ids))
+
+    def existing_names(self, names):
+        """Retorna, entre os nomes informados, os que já pertencem a algum colaborador."""
+        if not names:
+            return set()
+        return set(self.db.session.execute(select(Employee.name).where(Employee.name.in_(set(names)))).scalars())
+
     def exists_employee_with_different_id(self, name: str, employee_id: int):
         """Verifica se existe um colaborador com o mesmo nome, mas com um ID diferente."""
         employee = Employee.query.filter(Employee.name == name, Employee.id != employee_id).first()
         return employee is not None
     
-    def delete_employee(self, employee_id: int):
+    def delete_employee(self, employee_id: int, expected_version: int = None):
         """
         Exclui um colaborador existente do banco de dados.
 
@@ -144,6 +517,7 @@ class EmployeeRepository():
 
         Args:
             employee_id (int): O ID do colaborador a ser excluído.
+            expected_version (int, optional): Versão que o colaborador deve ter para ser excluído.
 
         Returns:
             bool: True se o colaborador for excluído com sucesso, False caso contrário.
@@ -153,9 +527,15 @@ class EmployeeRepository():
         """
         try:
             employee = Employee.query.get(employee_id)
-            if employee:
+            if employee and (expected_version is None or employee.version == expected_version):
+                name, department_id = employee.name, employee.department_id
+                dependents_count = len(employee.dependents)
                 self.db.session.delete(employee)
+                self.stats.apply_delta(department_id, -1, -int(dependents_count > 0), -dependents_count)
+                changed = announce(self.db.session.connection(), employee_changed, 'deleted',
+                                   items=[(employee_id, name)], department_ids=[department_id])
                 self.db.session.commit()
+                changed()
                 return True
             return False
         except Exception as e:
@@ -163,6 +543,7 @@ class EmployeeRepository():
             logging.error(f"Erro ao excluir o colaborador: {e}")
             return False
         
+    @read_only
     def get_employee_by_id(self, employee_id: int):
         """
         Recupera um colaborador pelo seu ID, incluindo informações sobre seu departamento e dependentes.
@@ -191,9 +572,11 @@ class EmployeeRepository():
             return {
                 'id': employee.id,
                 'name': employee.name,
+                'version': employee.version,
                 'department': {
                     'id': employee.department.id,
-                    'name': employee.department.name
+                    'name': employee.department.name,
+                    'version': employee.department.version
                 },
                 'dependents': [{'id': dependent.id, 'name': dependent.name} for dependent in employee.dependents]
             }
@@ -202,3 +585,27 @@ class EmployeeRepository():
             return None
             
 
+    @read_only
+    def get_employee_versions(self, employee_id: int):
+        """
+        Busca apenas as versões do colaborador e do seu departamento, sem carregar o colaborador.
+
+        Usada para responder requisições condicionais (If-None-Match / If-Match) com uma consulta pela chave primária.
+
+        Args:
+            employee_id (int): O ID do colaborador.
+
+        Returns:
+            tuple or None: (versão do colaborador, versão do departamento); None se o colaborador não for
+                encontrado ou em caso de erro.
+        """
+        try:
+            row = self.db.session.execute(
+                select(Employee.version, Department.version)
+                .join(Department, Employee.department_id == Department.id)
+                .where(Employee.id == employee_id)
+            ).first()
+            return tuple(row) if row else None
+        except Exception as e:
+            logging.error(f"Erro ao buscar a versão do colaborador {employee_id}: {e}")
+            return None
@@ -0,0 +1,68 @@
+from sqlalchemy import select, literal, null, func
+from ..models import Department, Employee, Dependent
+
+
+EXPORT_COLUMNS = ('entity', 'id', 'name', 'department_id', 'employee_id')
+
+
+class ExportRepository():
+    def __init__(self, db):
+        self.db = db
+
+    def count_rows(self):
+        """Conta as linhas da exportação completa (departamentos, colaboradores e dependentes)."""
+        return sum(self.db.session.execute(select(func.count()).select_from(model)).scalar()
+                   for model in (Department, Employee, Dependent))
+
+    def iter_batches(self, batch_size: int = 1000):
+        """
+        Percorre departamentos, colaboradores e dependentes em lotes, com cursor no servidor.
+
+        Cada consulta usa yield_per, então o driver busca no máximo `batch_size` linhas por vez e a
+        memória usada não cresce com o tamanho das tabelas. As linhas seguem o formato de
+        EXPORT_COLUMNS: (entity, id, name, department_id, employee_id), com None nas colunas que não
+        se aplicam à entidade.
+
+        Args:
+            batch_size (int): Quantidade de linhas buscadas do banco por vez.
+
+        Yields:
+            list of tuple: Um lote de até `batch_size` linhas.
+        """
+        for query, model in self._queries():
+            result = self.db.session.execute(query.order_by(model.id).execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    def iter_pages(self, batch_size: int = 1000):
+        """
+        Como iter_batches, mas lendo cada lote com uma consulta própria (WHERE id > último ORDER BY id LIMIT n).
+
+        Nenhum cursor fica aberto entre um lote e outro, então quem consome pode confirmar a transação da
+        sessão entre os lotes (as tarefas de fundo gravam o progresso assim), o que invalidaria o cursor no
+        servidor de iter_batches.
+
+        Args:
+            batch_size (int): Quantidade de linhas por lote.
+
+        Yields:
+            list of tuple: Um lote de até `batch_size` linhas.
+        """
+        for query, model in self._queries():
+            last_id = 0
+            while True:
+                rows = self.db.session.execute(
+                    query.where(model.id > last_id).order_by(model.id).limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+                last_id = rows[-1][1]
+
+    @staticmethod
+    def _queries():
+        return (
+            (select(literal('department'), Department.id, Department.name, null(), null()), Department),
+            (select(literal('employee'), Employee.id, Employee.name, Employee.department_id, null()), Employee),
+            (select(literal('dependent'), Dependent.id, Dependent.name, null(), Dependent.employee_id), Dependent),
+        )
@@ -0,0 +1,101 @@
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread
+import logging
+import time
+
+
+class GroupCommitWriter:
+    """
+    Agrupa cadastros de colaboradores concorrentes em uma única transação (group commit).
+
+    Cada requisição enfileira seu cadastro e aguarda um Future. Uma thread de fundo retira da fila
+    até `max_items` cadastros, ou o que chegar em até `max_wait_ms` depois do primeiro, e grava o
+    lote com EmployeeRepository.create_employees: um commit (e um fsync no banco) por lote em vez
+    de um por requisição. Cada Future recebe o ID do seu colaborador, ou None se aquele item falhou.
+
+    Quem aguarda o Future deve usar `result(timeout=writer.result_timeout)`: se a thread parar, a requisição
+    falha em vez de ficar presa. Esgotado o tempo, `future.cancel()` tira o item da fila: um item cancelado
+    nunca é gravado. Se o cancelamento falhar, o lote do item já está sendo gravado e o Future será resolvido.
+    Depois de `stop()`, `submit` levanta RuntimeError.
+    """
+
+    def __init__(self, app, repository, max_items: int = 64, max_wait_ms: float = 5, result_timeout: float = 10):
+        self.app = app
+        self.repository = repository
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self.result_timeout = result_timeout
+        self._queue = Queue()
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread que grava os lotes."""
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name='group-commit-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Grava o que ainda estiver na fila e encerra a thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, name: str, department_id: int, dependents=None) -> Future:
+        """
+        Enfileira o cadastro de um colaborador para o próximo lote.
+
+        Args:
+            name (str): O nome do colaborador.
+            department_id (int): O ID do departamento ao qual o colaborador pertencerá.
+            dependents (list of str, optional): Uma lista de nomes de dependentes do colaborador.
+
+        Returns:
+            Future: Resolvido com o ID do colaborador criado, ou None em caso de falha.
+
+        Raises:
+            RuntimeError: Se a thread que grava os lotes não estiver em execução.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            raise RuntimeError('Group commit parado')
+        future = Future()
+        self._queue.put(((name, department_id, dependents), future))
+        return future
+
+    def _run(self):
+        running = True
+        while running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+    def _flush(self, batch):
+        # Itens cancelados por quem desistiu de esperar ficam fora do lote; os demais não podem mais ser cancelados
+        batch = [(employee, future) for employee, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            with self.app.app_context():
+                results = self.repository.create_employees([employee for employee, _ in batch])
+        except Exception as e:
+            logging.error(f"Erro ao gravar lote de {len(batch)} colaboradores: {e}")
+            results = [None] * len(batch)
+
+        for (_, future), employee_id in zip(batch, results):
+            future.set_result(employee_id)
@@ -0,0 +1,127 @@
+from sqlalchemy import select, insert, update, delete, or_
+from sqlalchemy.exc import IntegrityError
+from ..models import IdempotencyKey
+from datetime import datetime, timedelta
+import logging
+
+
+class IdempotencyRepository():
+    def __init__(self, db):
+        self.db = db
+
+    def reserve(self, key: str, method: str, path: str, request_hash: str, ttl: timedelta, lock: timedelta):
+        """
+        Tenta reservar uma Idempotency-Key para a requisição corrente.
+
+        A reserva é um INSERT confirmado imediatamente: a chave primária garante que, entre requisições
+        concorrentes com a mesma chave (em qualquer processo), apenas uma consiga reservá-la. Registros
+        expirados são descartados e a reserva é refeita.
+
+        A reserva de uma requisição em andamento vale por `lock`. Se o processo que a fez cair antes de
+        concluir, uma repetição da mesma requisição retoma a chave depois desse prazo, em vez de receber
+        "em processamento" até o fim do TTL.
+
+        Args:
+            key (str): A Idempotency-Key enviada pelo cliente.
+            method (str): Método HTTP da requisição.
+            path (str): Caminho da requisição.
+            request_hash (str): Hash do método, caminho e corpo da requisição.
+            ttl (timedelta): Por quanto tempo uma chave é válida.
+            lock (timedelta): Por quanto tempo uma requisição em andamento mantém a chave.
+
+        Returns:
+            IdempotencyKey or None: None se a chave foi reservada para esta requisição; o registro
+                existente (em processamento ou concluído) caso contrário.
+        """
+        for _ in range(2):
+            now = datetime.utcnow()
+            try:
+                self.db.session.execute(
+                    insert(IdempotencyKey).values(key=key, method=method, path=path, request_hash=request_hash,
+                                                  created_at=now, locked_until=now + lock)
+                )
+                self.db.session.commit()
+                return None
+            except IntegrityError:
+                self.db.session.rollback()
+
+            existing = self.get(key)
+            if existing is None:
+                continue
+            if existing.created_at < now - ttl:
+                self.release(key)
+                continue
+
+            stale = existing.locked_until is None or existing.locked_until < now
+            if existing.status_code is None and stale and existing.request_hash == request_hash:
+                if self._reclaim(key, now, lock):
+                    return None
+                return self.get(key)
+            return existing
+        return self.get(key)
+
+    def _reclaim(self, key: str, now: datetime, lock: timedelta):
+        # Condicionado à reserva vencida: entre repetições concorrentes, só uma retoma a chave
+        reclaimed = self.db.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None),
+                   or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until < now))
+            .values(created_at=now, locked_until=now + lock)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.session.commit()
+        return reclaimed == 1
+
+    def get(self, key: str):
+        """Busca o registro de uma Idempotency-Key, sem reaproveitar o que estiver no identity map."""
+        return self.db.session.execute(
+            select(IdempotencyKey).where(IdempotencyKey.key == key).execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+
+    def complete(self, key: str, status_code: int, content_type: str, body: bytes):
+        """
+        Guarda a resposta de uma requisição concluída para que repetições recebam a mesma resposta.
+
+        Returns:
+            bool: True se a resposta foi guardada, False em caso de falha.
+        """
+        try:
+            record = self.get(key)
+            if record is None:
+                return False
+            record.status_code = status_code
+            record.content_type = content_type
+            record.response_body = body
+            self.db.session.commit()
+            return True
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao guardar a resposta da Idempotency-Key {key}: {e}")
+            return False
+
+    def release(self, key: str):
+        """Libera uma chave (a requisição falhou), permitindo que uma nova tentativa seja executada."""
+        try:
+            self.db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao liberar a Idempotency-Key {key}: {e}")
+
+    def purge_expired(self, ttl: timedelta):
+        """
+        Remove as chaves mais antigas que o TTL.
+
+        Returns:
+            int or None: Quantidade de chaves removidas; None em caso de falha.
+        """
+        try:
+            result = self.db.session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.created_at < datetime.utcnow() - ttl)
+            )
+            self.db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao remover Idempotency-Keys expiradas: {e}")
+            return None
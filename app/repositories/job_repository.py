@@ -0,0 +1,223 @@
+from sqlalchemy import select, insert, update, func
+from ..models import Job
+from datetime import datetime
+import logging
+import os
+import uuid
+
+
+JOB_COLUMNS = (Job.id, Job.kind, Job.status, Job.params, Job.progress, Job.total, Job.result, Job.error,
+               Job.cancel_requested, Job.attempts, Job.created_at, Job.started_at, Job.finished_at)
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+class JobLeaseLost(Exception):
+    """A tarefa foi recuperada como interrompida e assumida por outra execução: esta deve parar sem gravar nada."""
+
+
+class JobRepository():
+    def __init__(self, db):
+        self.db = db
+
+    def create_job(self, kind: str, params: dict):
+        """
+        Registra uma nova tarefa de fundo, pendente.
+
+        Args:
+            kind (str): Tipo da tarefa (ex.: 'import_employees').
+            params (dict): Parâmetros da tarefa, serializáveis em JSON.
+
+        Returns:
+            str or None: O ID da tarefa criada; None em caso de falha.
+        """
+        try:
+            job_id = uuid.uuid4().hex
+            self.db.session.execute(insert(Job).values(id=job_id, kind=kind, status='pending', params=params,
+                                                       progress=0, cancel_requested=False, attempts=0,
+                                                       created_at=datetime.utcnow()))
+            self.db.session.commit()
+            return job_id
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao registrar a tarefa {kind}: {e}")
+            return None
+
+    def count_active(self):
+        """Conta as tarefas pendentes ou em execução, em todos os processos."""
+        return self.db.session.execute(
+            select(func.count()).select_from(Job).where(Job.status.in_(ACTIVE_STATUSES))
+        ).scalar()
+
+    def get_job(self, job_id: str):
+        """
+        Busca uma tarefa pelo ID.
+
+        Returns:
+            dict or None: Os campos da tarefa; None se ela não existir.
+        """
+        row = self.db.session.execute(select(*JOB_COLUMNS).where(Job.id == job_id)).first()
+        return dict(row._mapping) if row is not None else None
+
+    def claim(self, job_id: str):
+        """
+        Passa uma tarefa de pendente para em execução, se nenhum outro worker a tiver assumido antes.
+
+        O UPDATE condicionado ao status garante que, mesmo com a tarefa enfileirada em mais de um processo
+        (após uma recuperação, por exemplo), apenas um a execute. O novo valor de `attempts` identifica a execução:
+        `checkpoint` e `finish` só alteram a tarefa se ela ainda pertencer a essa execução.
+
+        Returns:
+            dict or None: A tarefa assumida; None se ela não estava mais pendente.
+        """
+        now = datetime.utcnow()
+        result = self.db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'pending')
+            .values(status='running', attempts=Job.attempts + 1, started_at=now, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.session.commit()
+        return self.get_job(job_id) if result.rowcount == 1 else None
+
+    def checkpoint(self, job_id: str, attempt: int, progress: int, total: int = None, result: dict = None,
+                   commit: bool = True):
+        """
+        Grava o progresso (e o batimento) de uma tarefa em execução.
+
+        Com `commit=False`, o UPDATE fica na transação corrente e é confirmado junto com o lote que
+        a tarefa está gravando: o progresso registrado nunca fica à frente (nem atrás) dos dados.
+
+        Args:
+            attempt (int): O `attempts` retornado por `claim` para esta execução.
+
+        Returns:
+            bool: True se o cancelamento da tarefa foi solicitado.
+
+        Raises:
+            JobLeaseLost: Se a tarefa foi assumida por outra execução; a transação corrente deve ser desfeita.
+        """
+        values = {'progress': progress, 'heartbeat_at': datetime.utcnow()}
+        if total is not None:
+            values['total'] = total
+        if result is not None:
+            values['result'] = result
+        updated = self.db.session.execute(
+            update(Job).where(Job.id == job_id, Job.status == 'running', Job.attempts == attempt).values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated == 0:
+            raise JobLeaseLost(job_id)
+        cancel_requested = self.db.session.execute(select(Job.cancel_requested).where(Job.id == job_id)).scalar()
+        if commit:
+            self.db.session.commit()
+        return bool(cancel_requested)
+
+    def finish(self, job_id: str, attempt: int, status: str, result: dict = None, error: str = None):
+        """
+        Encerra uma tarefa com o status final, o resultado e, em caso de falha, a mensagem de erro.
+
+        Nada é alterado se a tarefa já pertencer a outra execução (`attempt` diferente).
+        """
+        try:
+            values = {'status': status, 'error': error, 'finished_at': datetime.utcnow()}
+            if result is not None:
+                values['result'] = result
+            self.db.session.execute(
+                update(Job).where(Job.id == job_id, Job.status == 'running', Job.attempts == attempt).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao encerrar a tarefa {job_id}: {e}")
+
+    def cancel(self, job_id: str):
+        """
+        Cancela uma tarefa pendente ou pede o cancelamento de uma em execução.
+
+        Uma tarefa pendente é cancelada na hora. Uma em execução é marcada e para no próximo ponto de
+        progresso, mantendo os lotes já confirmados.
+
+        Returns:
+            tuple or None: (status, changed), com o status da tarefa após o pedido e se o pedido a alterou
+                (False se ela já estava encerrada); None se ela não existir ou em caso de falha.
+        """
+        try:
+            cancelled = self.db.session.execute(
+                update(Job).where(Job.id == job_id, Job.status == 'pending')
+                .values(status='cancelled', finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            requested = self.db.session.execute(
+                update(Job).where(Job.id == job_id, Job.status == 'running').values(cancel_requested=True)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.session.commit()
+            status = self.db.session.execute(select(Job.status).where(Job.id == job_id)).scalar()
+            return (status, bool(cancelled or requested)) if status is not None else None
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao cancelar a tarefa {job_id}: {e}")
+            return None
+
+    def recover(self, stale_before: datetime, max_attempts: int):
+        """
+        Recupera as tarefas interrompidas por uma queda do processo que as executava.
+
+        Tarefas em execução sem batimento desde `stale_before` voltam a ficar pendentes (e são retomadas do
+        último progresso confirmado), ou falham se já tiverem sido tentadas `max_attempts` vezes.
+
+        Returns:
+            list of str or None: IDs das tarefas pendentes, a serem enfileiradas; None em caso de falha.
+        """
+        try:
+            stale = (Job.status == 'running', Job.heartbeat_at < stale_before)
+            self.db.session.execute(
+                update(Job).where(*stale, Job.attempts >= max_attempts)
+                .values(status='failed', error='Tarefa interrompida', finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            self.db.session.execute(
+                update(Job).where(*stale).values(status='pending')
+                .execution_options(synchronize_session=False)
+            )
+            self.db.session.commit()
+            return list(self.db.session.execute(
+                select(Job.id).where(Job.status == 'pending').order_by(Job.created_at)
+            ).scalars())
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao recuperar tarefas interrompidas: {e}")
+            return None
+
+    def expire_files(self, finished_before: datetime):
+        """
+        Marca como expirados os arquivos das tarefas concluídas antes de `finished_before`.
+
+        O resultado da tarefa perde o nome do arquivo e passa a trazer 'file_expired'. A marcação é confirmada
+        antes de os arquivos serem removidos (por quem chama): um download nunca aponta para um arquivo já apagado.
+
+        Returns:
+            list of str: Caminhos dos arquivos a remover; lista vazia em caso de falha.
+        """
+        try:
+            rows = self.db.session.execute(
+                select(Job.id, Job.params, Job.result)
+                .where(Job.status == 'succeeded', Job.finished_at < finished_before)
+            ).all()
+            paths = []
+            for job_id, params, result in rows:
+                if not (result or {}).get('file'):
+                    continue
+                expired = {key: value for key, value in result.items() if key != 'file'}
+                self.db.session.execute(update(Job).where(Job.id == job_id)
+                                        .values(result={**expired, 'file_expired': True})
+                                        .execution_options(synchronize_session=False))
+                paths.append(os.path.join(params['output_dir'], result['file']))
+            self.db.session.commit()
+            return paths
+        except Exception as e:
+            self.db.session.rollback()
+            logging.error(f"Erro ao expirar os arquivos das tarefas: {e}")
+            return []
@@ -0,0 +1,67 @@
+from blinker import Namespace
+from functools import partial
+import logging
+
+
+_signals = Namespace()
+
+# Sinais disparados pelos repositórios logo após um commit bem-sucedido.
+#
+# O sender é a ação executada ('created', 'updated' ou 'deleted') e os argumentos
+# nomeados descrevem as entidades afetadas:
+#   items (list of tuple): pares (id, name) das entidades alteradas.
+#   department_ids (list of int): apenas em employee_changed, departamentos envolvidos
+#                                 (o antigo e o novo, no caso de uma troca).
+#   remote (bool): True quando a alteração foi feita por outro processo e chegou pelo
+#                  InvalidationChannel; os assinantes só atualizam o próprio estado em memória.
+department_changed = _signals.signal('department-changed')
+employee_changed = _signals.signal('employee-changed')
+
+# Disparado (sender 'flush') quando alterações de outros processos podem ter sido perdidas,
+# por exemplo após uma reconexão do InvalidationChannel: caches e índices em memória devem ser descartados.
+caches_flush = _signals.signal('caches-flush')
+
+# Disparado (sender: o sinal da alteração) dentro da transação que grava a alteração, antes do commit, com a ação,
+# os mesmos argumentos nomeados do sinal e `connection`, a conexão da transação. Permite publicar a alteração para
+# outros processos de forma atômica com o commit; uma exceção de um assinante desfaz a escrita.
+changes_committing = _signals.signal('changes-committing')
+
+
+def notify(signal, action: str, **kwargs):
+    """
+    Dispara um sinal de alteração sem deixar que falhas dos assinantes afetem o chamador.
+
+    Os repositórios chamam esta função depois do commit, então um erro em um índice ou cache
+    em memória não pode desfazer a operação já confirmada no banco; ele é apenas logado.
+
+    Args:
+        signal: O sinal a ser disparado (department_changed ou employee_changed).
+        action (str): A ação executada ('created', 'updated' ou 'deleted').
+        **kwargs: Dados da alteração repassados aos assinantes.
+    """
+    for receiver in signal.receivers_for(action):
+        try:
+            receiver(action, **kwargs)
+        except Exception as e:
+            logging.error(f"Erro ao processar o sinal {signal.name} ({action}): {e}")
+
+
+def announce(connection, signal, action: str, **kwargs):
+    """
+    Anuncia uma alteração na transação corrente e retorna o notify a ser chamado depois do commit.
+
+    Os repositórios chamam esta função antes do commit, na conexão da transação que grava a alteração
+    (junto com record_changes): assinantes de changes_committing, como o InvalidationChannel, publicam a
+    alteração nessa mesma transação. Os assinantes locais do sinal só são chamados pelo retorno, após o commit.
+
+    Args:
+        connection: Conexão da transação corrente.
+        signal: O sinal da alteração (department_changed ou employee_changed).
+        action (str): A ação executada ('created', 'updated' ou 'deleted').
+        **kwargs: Dados da alteração repassados aos assinantes.
+
+    Returns:
+        callable: Dispara `notify(signal, action, **kwargs)`.
+    """
+    changes_committing.send(signal, connection=connection, action=action, **kwargs)
+    return partial(notify, signal, action, **kwargs)
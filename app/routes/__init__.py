@@ -2,10 +2,18 @@ from flask import Blueprint
 # from .auth import auth_blueprint 
 from .departament import departament_blueprint
 from .employee import employee_blueprint
+from .autocomplete import autocomplete_blueprint
+from .export import export_blueprint
+from .changes import changes_blueprint
+from .jobs import jobs_blueprint
 
 
 routes_blueprint = Blueprint("routes", __name__)
 
 # routes_blueprint.register_blueprint(auth_blueprint)
 routes_blueprint.register_blueprint(departament_blueprint)
-routes_blueprint.register_blueprint(employee_blueprint)
\ No newline at end of file
+routes_blueprint.register_blueprint(employee_blueprint)
+routes_blueprint.register_blueprint(autocomplete_blueprint)
+routes_blueprint.register_blueprint(export_blueprint)
+routes_blueprint.register_blueprint(changes_blueprint)
+routes_blueprint.register_blueprint(jobs_blueprint)
\ No newline at end of file
@@ -0,0 +1,90 @@
+from flask import request, Blueprint
+from .resouces.content_negotiation import respond
+from ..repositories import DepartamentRepository, EmployeeRepository
+from ..services.autocomplete_service import AutocompleteService
+from ..models import db
+from ..swagger import register_docstrings
+import logging
+
+
+MAX_LIMIT = 50
+
+autocomplete_service = AutocompleteService(DepartamentRepository(db=db), EmployeeRepository(db=db))
+
+autocomplete_blueprint = Blueprint("autocompletar", __name__, url_prefix="/autocompletar")
+
+
+def _read_search_args():
+    prefix = request.args.get('prefixo', '').strip()
+    limit = request.args.get('limite', 10, type=int)
+    return prefix, max(1, min(limit, MAX_LIMIT))
+
+
+@autocomplete_blueprint.route('/departamentos', methods=['GET'])
+def autocomplete_departments():
+    """
+    Sugere departamentos cujo nome começa com o prefixo informado.
+
+    Atende a partir do índice em memória, sem consultar o banco a cada tecla digitada.
+
+    Returns:
+        JSON response with status code.
+    """
+    prefix, limit = _read_search_args()
+    if not prefix:
+        return respond({'error': 'O prefixo é obrigatório'}), 400
+
+    try:
+        departments = autocomplete_service.search_departments(prefix, limit)
+        if departments is None:
+            return respond({'error': 'Erro ao carregar o índice de departamentos'}), 500
+        return respond(departments), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao autocompletar departamentos: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+@autocomplete_blueprint.route('/colaboradores', methods=['GET'])
+def autocomplete_employees():
+    """
+    Sugere colaboradores cujo nome começa com o prefixo informado.
+
+    Atende a partir do índice em memória, sem consultar o banco a cada tecla digitada.
+
+    Returns:
+        JSON response with status code.
+    """
+    prefix, limit = _read_search_args()
+    if not prefix:
+        return respond({'error': 'O prefixo é obrigatório'}), 400
+
+    try:
+        employees = autocomplete_service.search_employees(prefix, limit)
+        if employees is None:
+            return respond({'error': 'Erro ao carregar o índice de colaboradores'}), 500
+        return respond(employees), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao autocompletar colaboradores: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+@autocomplete_blueprint.route('/memoria', methods=['GET'])
+def autocomplete_memory():
+    """
+    Informa quantas entradas e quantos bytes os índices de autocompletar ocupam em memória.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        return respond(autocomplete_service.memory_footprint()), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao medir o índice de autocompletar: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+
+############## Integração da docstring para documentar a API via SWAGGER ##############
+register_docstrings('AutocompleteDocstrings', {
+    autocomplete_departments: 'autocomplete_departments',
+    autocomplete_employees: 'autocomplete_employees',
+    autocomplete_memory: 'autocomplete_memory',
+})
@@ -0,0 +1,51 @@
+from flask import request, Blueprint
+from .resouces.content_negotiation import respond
+from ..repositories import ChangeLogRepository
+from ..services.change_feed_service import ChangeFeedService
+from ..models import db
+from ..swagger import register_docstrings
+import logging
+
+
+MAX_LIMIT = 1000
+
+change_feed_service = ChangeFeedService(ChangeLogRepository(db=db))
+
+changes_blueprint = Blueprint("changes", __name__)
+
+
+@changes_blueprint.route('/changes', methods=['GET'])
+def list_changes():
+    """
+    Lista as alterações de departamentos e colaboradores posteriores a uma sequência.
+
+    Permite que sistemas externos se mantenham sincronizados buscando apenas os deltas. Retorna 410
+    se as alterações necessárias já foram removidas pela compactação do histórico.
+
+    Returns:
+        JSON response with status code.
+    """
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', 100, type=int)
+
+    if since < 0 or limit < 1 or limit > MAX_LIMIT:
+        return respond({'error': f'since deve ser >= 0 e limit deve estar entre 1 e {MAX_LIMIT}'}), 400
+
+    try:
+        feed, message = change_feed_service.get_changes(since, limit)
+        if feed is not None:
+            return respond(feed), 200
+        elif message == 'Histórico compactado, faça uma sincronização completa':
+            return respond({'error': message}), 410
+        else:
+            return respond({'error': message}), 500
+    except Exception as e:
+        logging.error(f"Erro inesperado ao listar alterações: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+
+############## Integração da docstring para documentar a API via SWAGGER ##############
+register_docstrings('ChangeFeedDocstrings', {
+    list_changes: 'list_changes',
+})
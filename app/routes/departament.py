@@ -1,22 +1,29 @@
-from flask import request, jsonify, Blueprint
+from flask import request, Blueprint
 from ..repositories import DepartamentRepository
+from ..cache import read_cache
 from ..services.departament_service import DepartmentService
 from .resouces.validated_token import token_required
 from flask_cors import CORS, cross_origin
 from .resouces.cors_preflight_response import CorsOptions
+from .resouces.idempotency import idempotent
+from .resouces.content_negotiation import respond, get_payload, validate_payload
+from .resouces.conditional import if_match_etags, is_not_modified, not_modified, respond_with_etag
+from .resouces.response_cache import response_cache
 from ..models import db
-from ..swagger import DepartmentDocstrings
+from ..swagger import register_docstrings
 import logging
 
 
 departament_repository = DepartamentRepository(db=db)
-departament_service = DepartmentService(departament_repository)
+departament_service = DepartmentService(departament_repository, cache=read_cache)
 
 departament_blueprint = Blueprint("departament", __name__, url_prefix="/departament")
+departament_blueprint.before_request(validate_payload)
 cors_options = CorsOptions()
 
 
 @departament_blueprint.route('/cadastrar', methods=['POST'])
+@idempotent
 def create_department():
     """
     Cadastra um novo departamento.
@@ -28,45 +35,76 @@ def create_department():
     Returns:
         JSON response with status code.
     """
-    data = request.get_json()
+    data = get_payload()
     department_name = data.get('name')
 
     if not department_name:
-        return jsonify({'error': 'O nome do departamento é obrigatório'}), 400
+        return respond({'error': 'O nome do departamento é obrigatório'}), 400
 
     try:
         department_id, message = departament_service.create_department(department_name)
 
         if department_id:
-            return jsonify({'message': message, 'department_id': department_id}), 201
+            return respond({'message': message, 'department_id': department_id}), 201
         elif message == 'Departamento já existe':
-            return jsonify({'error': message}), 409
+            return respond({'error': message}), 409
         else:
-            return jsonify({'error': 'Erro ao tentar criar o departamento'}), 500
+            return respond({'error': 'Erro ao tentar criar o departamento'}), 500
     except Exception as e:
         logging.error(f"Erro inesperado ao criar o departamento: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
     
 @departament_blueprint.route('/listar', methods=['GET'])
+@response_cache.cached('departments')
 def list_departments():
     """
     Lista todos os departamentos cadastrados.
     
-    Tenta recuperar todos os departamentos e devolve uma lista contendo seus dados. Se houver uma falha,
-    retorna um erro genérico.
+    Tenta recuperar todos os departamentos e devolve uma lista contendo seus dados. Com ?format=columnar,
+    devolve uma lista por campo ({"id": [...], "name": [...]}). Se houver uma falha, retorna um erro genérico.
     
     Returns:
         JSON response with status code.
     """
     try:
+        response_format = request.args.get('format')
+        if response_format not in (None, 'columnar'):
+            return respond({'error': 'Formato inválido, use format=columnar'}), 400
+
+        if response_format == 'columnar':
+            columns = departament_service.get_department_columns()
+            if columns is None:
+                return respond({'error': 'Erro ao recuperar departamentos!'}), 500
+            return respond(columns), 200
+
         departments = departament_service.get_all_departments()
         if departments is None:
-            return jsonify({'error': 'Erro ao recuperar departamentos!'}), 500
+            return respond({'error': 'Erro ao recuperar departamentos!'}), 500
         
-        departments_data = [{'id': d.id, 'name': d.name} for d in departments]
-        return jsonify(departments_data), 200
+        return respond(departments), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return respond({'error': str(e)}), 500
+
+@departament_blueprint.route('/estatisticas', methods=['GET'])
+def get_department_stats():
+    """
+    Lista as estatísticas de todos os departamentos.
+    
+    Retorna, para cada departamento, a quantidade de colaboradores, de dependentes e a proporção de
+    colaboradores com dependentes, lidas do resumo mantido a cada escrita. Se houver uma falha,
+    retorna um erro genérico.
+    
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        stats = departament_service.get_department_stats()
+        if stats is None:
+            return respond({'error': 'Erro ao recuperar estatísticas dos departamentos!'}), 500
+        return respond(stats), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao listar estatísticas dos departamentos: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
 
 @departament_blueprint.route('/editar/<int:department_id>', methods=['PUT'])
 def update_department(department_id: int):
@@ -75,7 +113,8 @@ def update_department(department_id: int):
     
     Recebe um novo nome para o departamento via JSON. Se o novo nome não for fornecido, retorna um erro.
     Se a atualização for bem-sucedida, retorna sucesso; se o nome já existir, retorna um erro específico;
-    caso contrário, retorna um erro genérico.
+    caso contrário, retorna um erro genérico. Com If-Match, retorna 412 se o departamento foi alterado
+    desde a leitura do cliente.
     
     Args:
         department_id (int): ID do departamento a ser atualizado.
@@ -83,24 +122,26 @@ def update_department(department_id: int):
     Returns:
         JSON response with status code.
     """
-    data = request.get_json()
+    data = get_payload()
     new_name = data.get('name')
 
     if not new_name:
-        return jsonify({'error': 'O novo nome do departamento é obrigatório'}), 400
+        return respond({'error': 'O novo nome do departamento é obrigatório'}), 400
 
     try:
-        updated_department_id, message = departament_service.update_department(department_id, new_name)
+        updated_department_id, message = departament_service.update_department(department_id, new_name, if_match_etags())
 
         if updated_department_id:
-            return jsonify({'message': message, 'department_id': updated_department_id}), 200  
+            return respond({'message': message, 'department_id': updated_department_id}), 200  
         elif message == 'Nome de departamento já existe':
-            return jsonify({'error': message}), 409
+            return respond({'error': message}), 409
+        elif message == 'Departamento alterado por outra requisição':
+            return respond({'error': message}), 412
         else:
-            return jsonify({'error': 'Erro ao tentar atualizar o departamento'}), 500
+            return respond({'error': 'Erro ao tentar atualizar o departamento'}), 500
     except Exception as e:
         logging.error(f"Erro inesperado ao atualizar o departamento: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
     
 @departament_blueprint.route('/excluir/<int:department_id>', methods=['DELETE'])
 def delete_department(department_id: int):
@@ -109,7 +150,7 @@ def delete_department(department_id: int):
     
     Tenta excluir um departamento com base no ID fornecido. Se o departamento for excluído com sucesso,
     retorna uma mensagem de sucesso; se não for encontrado, retorna um erro específico; caso contrário, retorna
-    um erro genérico.
+    um erro genérico. Com If-Match, retorna 412 se o departamento foi alterado desde a leitura do cliente.
     
     Args:
         department_id (int): ID do departamento a ser excluído.
@@ -118,18 +159,60 @@ def delete_department(department_id: int):
         JSON response with status code.
     """
     try:
-        message, success = departament_service.delete_department(department_id)
+        message, success = departament_service.delete_department(department_id, if_match_etags())
         
         if success:
-            return jsonify({'message': message}), 200
+            return respond({'message': message}), 200
         else:
             if message == 'Departamento não encontrado':
-                return jsonify({'error': message}), 404  
+                return respond({'error': message}), 404  
+            elif message == 'Departamento alterado por outra requisição':
+                return respond({'error': message}), 412
             else:
-                return jsonify({'error': message}), 500  
+                return respond({'error': message}), 500  
     except Exception as e:
         logging.error(f"Erro inesperado ao excluir o departamento: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+@departament_blueprint.route('/mesclar/<int:department_id>', methods=['POST'])
+@idempotent
+def merge_department(department_id: int):
+    """
+    Mescla um departamento em outro.
+
+    Move todos os colaboradores do departamento informado na URL para o `target_department_id` do corpo
+    e exclui o departamento de origem, em uma única transação. Com If-Match, retorna 412 se o departamento
+    de origem foi alterado desde a leitura do cliente.
+
+    Args:
+        department_id (int): ID do departamento a ser mesclado (e excluído).
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        data = get_payload() or {}
+        target_department_id = data.get('target_department_id')
+        if not isinstance(target_department_id, int) or isinstance(target_department_id, bool):
+            return respond({'error': 'target_department_id é obrigatório'}), 400
+        if target_department_id == department_id:
+            return respond({'error': 'O departamento de destino deve ser diferente do de origem'}), 400
+
+        moved, message = departament_service.merge_departments(department_id, target_department_id, if_match_etags())
+
+        if moved is not None:
+            return respond({'message': message, 'moved_employees': len(moved)}), 200
+        elif message == 'Departamento não encontrado':
+            return respond({'error': message}), 404
+        elif message == 'Departamento de destino não encontrado':
+            return respond({'error': message}), 422
+        elif message == 'Departamento alterado por outra requisição':
+            return respond({'error': message}), 412
+        else:
+            return respond({'error': message}), 500
+    except Exception as e:
+        logging.error(f"Erro inesperado ao mesclar o departamento: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
 
 @departament_blueprint.route('/busca_por_id/<int:department_id>', methods=['GET'])
 def get_department(department_id: int):
@@ -138,6 +221,7 @@ def get_department(department_id: int):
     
     Tenta encontrar um departamento pelo ID fornecido. Se encontrado, retorna os dados do departamento;
     se não for encontrado, retorna um erro específico; em caso de outra falha, retorna um erro genérico.
+    A resposta traz o ETag do departamento; com If-None-Match igual ao ETag atual, responde 304.
     
     Args:
         department_id (int): ID do departamento a ser buscado.
@@ -146,25 +230,33 @@ def get_department(department_id: int):
         JSON response with status code.
     """
     try:
+        if request.if_none_match:
+            etag = departament_service.get_department_etag(department_id)
+            if is_not_modified(etag):
+                return not_modified(etag)
+
         result, success = departament_service.get_department_by_id(department_id)
         
         if success:
-            return jsonify(result), 200
+            return respond_with_etag(result, departament_service.etag(result['version'])), 200
         else:
             if result == 'Departamento não encontrado':
-                return jsonify({'error': result}), 404
+                return respond({'error': result}), 404
             else:
-                return jsonify({'error': result}), 500 
+                return respond({'error': result}), 500 
     except Exception as e:
         logging.error(f"Erro inesperado ao buscar o departamento: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
 
 
 
 ############## Integração da docstring para documentar a API via SWAGGER ##############
-create_department.__doc__ = DepartmentDocstrings.create_department
-list_departments.__doc__ = DepartmentDocstrings.list_departments
-update_department.__doc__ = DepartmentDocstrings.update_departments
-delete_department.__doc__ = DepartmentDocstrings.delete_department
-get_department.__doc__ = DepartmentDocstrings.get_department_by_id
-
+register_docstrings('DepartmentDocstrings', {
+    create_department: 'create_department',
+    list_departments: 'list_departments',
+    get_department_stats: 'get_department_stats',
+    update_department: 'update_departments',
+    delete_department: 'delete_department',
+    merge_department: 'merge_department',
+    get_department: 'get_department_by_id',
+})
@@ -1,22 +1,32 @@
-from flask import request, jsonify, Blueprint
-from ..repositories import EmployeeRepository
+from flask import request, Blueprint, current_app
+from ..repositories import EmployeeRepository, DepartamentRepository
+from ..cache import DepartmentIdCache, read_cache
 from ..services.employee_service import EmployeeService
 from .resouces.validated_token import token_required
 from flask_cors import CORS, cross_origin
 from .resouces.cors_preflight_response import CorsOptions
+from .resouces.idempotency import idempotent
+from .resouces.content_negotiation import respond, get_payload, validate_payload
+from .resouces.conditional import if_match_etags, is_not_modified, not_modified, respond_with_etag
+from .resouces.response_cache import response_cache
+from .jobs import job_service, accepted
 from ..models import db
-from ..swagger import EmployeeDocstrings
+from ..swagger import register_docstrings
 import logging
 
 
 employee_repository = EmployeeRepository(db=db)
-employee_service = EmployeeService(employee_repository)
+department_id_cache = DepartmentIdCache(DepartamentRepository(db=db).list_department_ids)
+employee_service = EmployeeService(employee_repository, department_ids=department_id_cache, cache=read_cache)
+job_service.register('import_employees', employee_service.import_employees)
 
 employee_blueprint = Blueprint("colaborador", __name__, url_prefix="/colaborador")
+employee_blueprint.before_request(validate_payload)
 cors_options = CorsOptions()
 
 
 @employee_blueprint.route('/cadastrar', methods=['POST'])
+@idempotent
 def create_employee():
     """
     Cadastra um novo colaborador no sistema.
@@ -29,25 +39,72 @@ def create_employee():
         JSON response with status code.
     """
     try:
-        data = request.get_json()
+        data = get_payload()
         name = data.get('name')
         department_id = data.get('department_id')
         dependents = data.get('dependents', [])  # Pode ser uma lista ou nulo, padrão é lista vazia
 
         if not name or department_id is None: 
-            return jsonify({'error': 'Nome e departamento são obrigatórios'}), 400
+            return respond({'error': 'Nome e departamento são obrigatórios'}), 400
         
         employee_id, message = employee_service.create_employee(name, department_id, dependents)
         
         if employee_id:
-            return jsonify({'message': message, 'employee_id': employee_id}), 201
+            return respond({'message': message, 'employee_id': employee_id}), 201
         else:
-            return jsonify({'error': message}), 409 if message == 'Colaborador já existe' else 500
+            if message == 'Colaborador já existe':
+                return respond({'error': message}), 409
+            elif message == 'Departamento não encontrado':
+                return respond({'error': message}), 422
+            else:
+                return respond({'error': message}), 500
 
     except Exception as e:
         logging.error(f"Erro interno no servidor ao tentar adicionar colaborador: {str(e)}")
-        return jsonify({'error': 'Erro interno no servidor'}), 500
+        return respond({'error': 'Erro interno no servidor'}), 500
     
+PAGE_ARGS = ('limit', 'cursor', 'sort', 'have_dependents', 'name_prefix')
+
+
+def _page_args():
+    """
+    Lê e valida os parâmetros de paginação, ordenação e filtro da listagem de colaboradores.
+
+    Returns:
+        tuple: (params, None) com os argumentos de get_employees_page, ou (None, message) se algum for inválido.
+    """
+    sort = request.args.get('sort', 'id')
+    if sort not in ('id', 'name'):
+        return None, 'Ordenação inválida, use sort=id ou sort=name'
+
+    max_limit = current_app.config['EMPLOYEE_PAGE_MAX_LIMIT']
+    try:
+        limit = int(request.args.get('limit', current_app.config['EMPLOYEE_PAGE_DEFAULT_LIMIT']))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= max_limit:
+        return None, f'limit deve ser um número entre 1 e {max_limit}'
+
+    have_dependents = request.args.get('have_dependents')
+    if have_dependents not in (None, 'true', 'false'):
+        return None, 'have_dependents deve ser true ou false'
+
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = employee_service.decode_cursor(request.args['cursor'], sort)
+        except ValueError as e:
+            return None, str(e)
+
+    return {
+        'limit': limit,
+        'sort': sort,
+        'after': after,
+        'have_dependents': None if have_dependents is None else have_dependents == 'true',
+        'name_prefix': request.args.get('name_prefix') or None,
+    }, None
+
+
 @employee_blueprint.route('/departamento/<int:department_id>/colaboradores', methods=['GET'])
 def get_employees_by_department(department_id: int):
     """
@@ -55,7 +112,11 @@ def get_employees_by_department(department_id: int):
 
     Tenta recuperar todos os colaboradores de um departamento pelo ID fornecido. Se houver colaboradores, 
     retorna seus dados; se não houver, retorna um erro indicando que nenhum foi encontrado. Retorna um erro
-    genérico em caso de falha de acesso ao banco de dados.
+    genérico em caso de falha de acesso ao banco de dados. Com ?format=columnar, os dados vêm como uma
+    lista por campo ({"id": [...], "name": [...], "have_dependents": [...]}).
+
+    Com limit, cursor, sort, have_dependents ou name_prefix, devolve uma página: o total vai no cabeçalho
+    X-Total-Count e o cursor da próxima página em X-Next-Cursor (ausente na última).
 
     Args:
         department_id (int): ID do departamento cujos colaboradores serão listados.
@@ -64,18 +125,171 @@ def get_employees_by_department(department_id: int):
         JSON response with status code.
     """
     try:
+        response_format = request.args.get('format')
+        if response_format not in (None, 'columnar'):
+            return respond({'error': 'Formato inválido, use format=columnar'}), 400
+
+        if response_format == 'columnar' and not any(arg in request.args for arg in PAGE_ARGS):
+            columns = employee_service.get_employee_columns_by_department(department_id)
+            if columns is None:
+                return respond({'error': 'Erro ao acessar o banco de dados'}), 500
+            if not columns['id']:
+                return respond({'error': 'Nenhum colaborador encontrado'}), 404
+            return respond(columns), 200
+
+        if any(arg in request.args for arg in PAGE_ARGS):
+            return _employees_page(department_id, response_format)
+
         employees = employee_service.get_employees_by_department(department_id)
         if employees is not None:
             if employees:  
-                return jsonify(employees), 200
+                return respond(employees), 200
             else:
-                return jsonify({'error': 'Nenhum colaborador encontrado'}), 404
+                return respond({'error': 'Nenhum colaborador encontrado'}), 404
         else:
-            return jsonify({'error': 'Erro ao acessar o banco de dados'}), 500
+            return respond({'error': 'Erro ao acessar o banco de dados'}), 500
 
     except Exception as e:
         logging.error(f"Erro interno no servidor ao tentar listar colaboradores: {str(e)}")
-        return jsonify({'error': 'Erro interno no servidor'}), 500
+        return respond({'error': 'Erro interno no servidor'}), 500
+
+def _employees_page(department_id: int, response_format: str):
+    params, error = _page_args()
+    if error:
+        return respond({'error': error}), 400
+
+    page = employee_service.get_employees_page(department_id, **params)
+    if page is None:
+        return respond({'error': 'Erro ao acessar o banco de dados'}), 500
+    rows, next_cursor = page
+    if not rows and params['after'] is None:
+        return respond({'error': 'Nenhum colaborador encontrado'}), 404
+
+    if response_format == 'columnar':
+        ids, names, have_dependents = (list(column) for column in zip(*rows)) if rows else ([], [], [])
+        response = respond({'id': ids, 'name': names, 'have_dependents': have_dependents})
+    else:
+        response = respond([{'id': id, 'name': name, 'have_dependents': have_dependents}
+                            for id, name, have_dependents in rows])
+
+    total = employee_service.count_employees(department_id, params['have_dependents'], params['name_prefix'])
+    if total is not None:
+        response.headers['X-Total-Count'] = str(total)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _bulk_selection(data: dict):
+    """
+    Lê e valida a seleção de colaboradores de uma operação em lote: `employee_ids` ou `filter`, não os dois.
+
+    Returns:
+        tuple: (params, None) com os argumentos de seleção do repositório, ou (None, message) se a seleção for inválida.
+    """
+    employee_ids = data.get('employee_ids')
+    filters = data.get('filter')
+    if (employee_ids is None) == (filters is None):
+        return None, 'Informe employee_ids ou filter'
+
+    if employee_ids is not None:
+        max_ids = current_app.config['BULK_MAX_IDS']
+        if not isinstance(employee_ids, list) or not employee_ids or not all(_is_id(id) for id in employee_ids):
+            return None, 'employee_ids deve ser uma lista de IDs'
+        if len(employee_ids) > max_ids:
+            return None, f'No máximo {max_ids} IDs por requisição'
+        return {'employee_ids': list(dict.fromkeys(employee_ids))}, None
+
+    if not isinstance(filters, dict) or not _is_id(filters.get('department_id')):
+        return None, 'filter.department_id é obrigatório'
+    if filters.get('have_dependents') not in (None, True, False):
+        return None, 'filter.have_dependents deve ser true ou false'
+    if not isinstance(filters.get('name_prefix') or '', str):
+        return None, 'filter.name_prefix deve ser um texto'
+    return {
+        'source_department_id': filters['department_id'],
+        'have_dependents': filters.get('have_dependents'),
+        'name_prefix': filters.get('name_prefix') or None,
+    }, None
+
+
+@employee_blueprint.route('/mover', methods=['POST'])
+@idempotent
+def move_employees():
+    """
+    Move vários colaboradores para outro departamento de uma só vez.
+
+    Recebe o departamento de destino e uma lista de IDs (`employee_ids`) ou um filtro (`filter`, com o
+    departamento de origem e, opcionalmente, have_dependents e name_prefix). Todos são movidos em uma única
+    transação, com o destino validado uma só vez. Retorna os IDs movidos, os que já estavam no destino e
+    os não encontrados.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        data = get_payload() or {}
+        target_department_id = data.get('target_department_id')
+        if not _is_id(target_department_id):
+            return respond({'error': 'target_department_id é obrigatório'}), 400
+        selection, error = _bulk_selection(data)
+        if error:
+            return respond({'error': error}), 400
+
+        result, message = employee_service.move_employees(target_department_id, **selection)
+        if result is not None:
+            return respond({'message': message, **result}), 200
+        elif message == 'Departamento não encontrado':
+            return respond({'error': message}), 422
+        else:
+            return respond({'error': message}), 500
+
+    except Exception as e:
+        logging.error(f"Erro interno no servidor ao tentar mover colaboradores: {str(e)}")
+        return respond({'error': 'Erro interno no servidor'}), 500
+
+@employee_blueprint.route('/importar', methods=['POST'])
+@idempotent
+def import_employees():
+    """
+    Importa uma lista de colaboradores em segundo plano.
+
+    Recebe `employees`, uma lista de objetos no formato do cadastro (name, department_id e dependents
+    opcional), valida o formato e responde 202 com o ID da tarefa; o progresso e o resultado (criados,
+    com falha e os primeiros erros por item) são consultados em GET /jobs/<id>.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        employees = (get_payload() or {}).get('employees')
+        max_items = current_app.config['JOB_IMPORT_MAX_ITEMS']
+        if not isinstance(employees, list) or not employees:
+            return respond({'error': 'employees deve ser uma lista de colaboradores'}), 400
+        if len(employees) > max_items:
+            return respond({'error': f'No máximo {max_items} colaboradores por importação'}), 400
+
+        for index, item in enumerate(employees):
+            if (not isinstance(item, dict) or not isinstance(item.get('name'), str) or not item['name']
+                    or not _is_id(item.get('department_id'))):
+                return respond({'error': f'Colaborador {index}: nome e departamento são obrigatórios'}), 400
+            dependents = item.get('dependents') or []
+            if not isinstance(dependents, list) or not all(isinstance(name, str) and name for name in dependents):
+                return respond({'error': f'Colaborador {index}: dependents deve ser uma lista de nomes'}), 400
+
+        employees = [{'name': item['name'], 'department_id': item['department_id'], 'dependents': item.get('dependents') or []}
+                     for item in employees]
+        job_id, message = job_service.submit('import_employees', {
+            'employees': employees,
+            'batch_size': current_app.config['JOB_IMPORT_BATCH_SIZE'],
+        })
+        return accepted(job_id, message)
+    except Exception as e:
+        logging.error(f"Erro interno no servidor ao tentar importar colaboradores: {str(e)}")
+        return respond({'error': 'Erro interno no servidor'}), 500
 
 @employee_blueprint.route('/editar/<int:employee_id>', methods=['PUT'])
 def update_employee(employee_id: int):
@@ -84,7 +298,8 @@ def update_employee(employee_id: int):
 
     Recebe via JSON as novas informações do colaborador, incluindo nome, departamento e dependentes.
     Valida se pelo menos uma informação para atualização foi fornecida. Retorna uma mensagem de sucesso,
-    um erro se o nome do colaborador já existir, ou um erro genérico para outras falhas.
+    um erro se o nome do colaborador já existir, ou um erro genérico para outras falhas. Com If-Match,
+    retorna 412 se o colaborador foi alterado desde a leitura do cliente.
 
     Args:
         employee_id (int): ID do colaborador a ser atualizado.
@@ -93,26 +308,31 @@ def update_employee(employee_id: int):
         JSON response with status code.
     """
     try:
-        data = request.get_json()
+        data = get_payload()
         new_name = data.get('name')
         new_department_id = data.get('department_id', None)  
         new_dependents = data.get('dependents', None)  
 
         if not new_name and new_department_id is None and new_dependents is None:
-            return jsonify({'error': 'Nenhuma informação fornecida para atualização'}), 400
+            return respond({'error': 'Nenhuma informação fornecida para atualização'}), 400
 
-        updated_employee_id, message = employee_service.update_employee(employee_id, new_name, new_department_id, new_dependents)
+        updated_employee_id, message = employee_service.update_employee(employee_id, new_name, new_department_id, new_dependents,
+                                                                        if_match_etags())
 
         if updated_employee_id:
-            return jsonify({'message': message, 'department_id': updated_employee_id}), 200
+            return respond({'message': message, 'department_id': updated_employee_id}), 200
         elif message == 'Nome de colaborador já existe':
-            return jsonify({'error': message}), 409
+            return respond({'error': message}), 409
+        elif message == 'Departamento não encontrado':
+            return respond({'error': message}), 422
+        elif message == 'Colaborador alterado por outra requisição':
+            return respond({'error': message}), 412
         else:
-            return jsonify({'error': message}), 500
+            return respond({'error': message}), 500
         
     except Exception as e:
         logging.error(f"Erro interno no servidor ao tentar atualizar colaborador: {str(e)}")
-        return jsonify({'error': 'Erro interno no servidor'}), 500
+        return respond({'error': 'Erro interno no servidor'}), 500
     
 @employee_blueprint.route('/excluir/<int:employee_id>', methods=['DELETE'])
 def delete_department(employee_id: int):
@@ -120,7 +340,8 @@ def delete_department(employee_id: int):
     Exclui um colaborador do sistema.
 
     Tenta excluir um colaborador pelo ID fornecido. Retorna uma mensagem de sucesso se excluído,
-    um erro se o colaborador não for encontrado, ou um erro genérico em caso de outra falha.
+    um erro se o colaborador não for encontrado, ou um erro genérico em caso de outra falha. Com If-Match,
+    retorna 412 se o colaborador foi alterado desde a leitura do cliente.
 
     Args:
         employee_id (int): ID do colaborador a ser excluído.
@@ -129,26 +350,56 @@ def delete_department(employee_id: int):
         JSON response with status code.
     """
     try:
-        message, success = employee_service.delete_employee(employee_id)
+        message, success = employee_service.delete_employee(employee_id, if_match_etags())
         
         if success:
-            return jsonify({'message': message}), 200
+            return respond({'message': message}), 200
         else:
             if message == 'Colaborador não encontrado':
-                return jsonify({'error': message}), 404  
+                return respond({'error': message}), 404  
+            elif message == 'Colaborador alterado por outra requisição':
+                return respond({'error': message}), 412
             else:
-                return jsonify({'error': message}), 500  
+                return respond({'error': message}), 500  
     except Exception as e:
         logging.error(f"Erro inesperado ao excluir o colaborador: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+@employee_blueprint.route('/excluir_em_lote', methods=['POST'])
+@idempotent
+def delete_employees():
+    """
+    Exclui vários colaboradores, e os seus dependentes, de uma só vez.
+
+    Recebe uma lista de IDs (`employee_ids`) ou um filtro (`filter`, com o departamento e, opcionalmente,
+    have_dependents e name_prefix). Todos são excluídos em uma única transação, com comandos em conjunto
+    em vez de um por colaborador. Retorna os IDs excluídos e os não encontrados.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        selection, error = _bulk_selection(get_payload() or {})
+        if error:
+            return respond({'error': error}), 400
+
+        result, message = employee_service.delete_employees(**selection)
+        if result is not None:
+            return respond({'message': message, **result}), 200
+        return respond({'error': message}), 500
+    except Exception as e:
+        logging.error(f"Erro inesperado ao excluir colaboradores em lote: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
 
 @employee_blueprint.route('/busca_por_id/<int:employee_id>', methods=['GET'])
+@response_cache.cached('employee')
 def get_department(employee_id: int):
     """
     Busca um colaborador pelo seu ID.
 
     Tenta encontrar um colaborador pelo ID fornecido. Retorna os dados do colaborador se encontrado,
-    um erro específico se não for encontrado, ou um erro genérico em caso de outra falha.
+    um erro específico se não for encontrado, ou um erro genérico em caso de outra falha. A resposta traz
+    o ETag do colaborador; com If-None-Match igual ao ETag atual, responde 304 consultando apenas a versão.
 
     Args:
         employee_id (int): ID do colaborador a ser buscado.
@@ -157,24 +408,34 @@ def get_department(employee_id: int):
         JSON response with status code.
     """
     try:
+        if request.if_none_match:
+            etag = employee_service.get_employee_etag(employee_id)
+            if is_not_modified(etag):
+                return not_modified(etag)
+
         result, success = employee_service.get_employee_by_id(employee_id)
         
         if success:
-            return jsonify(result), 200
+            return respond_with_etag(result, employee_service.employee_etag(result)), 200
         else:
             if result == 'Colaborador não encontrado':
-                return jsonify({'error': result}), 404
+                return respond({'error': result}), 404
             else:
-                return jsonify({'error': result}), 500 
+                return respond({'error': result}), 500 
     except Exception as e:
         logging.error(f"Erro inesperado ao buscar o colaborador: {e}")
-        return jsonify({'error': 'Erro interno do servidor'}), 500
+        return respond({'error': 'Erro interno do servidor'}), 500
 
 
 
 ############## Integração da docstring para documentar a API via SWAGGER ##############    
-create_employee.__doc__ = EmployeeDocstrings.create_employee
-get_employees_by_department.__doc__ = EmployeeDocstrings.get_employees_by_department
-update_employee.__doc__ = EmployeeDocstrings.update_employee
-delete_department.__doc__ = EmployeeDocstrings.delete_department
-get_department.__doc__ = EmployeeDocstrings.get_department
+register_docstrings('EmployeeDocstrings', {
+    create_employee: 'create_employee',
+    move_employees: 'move_employees',
+    delete_employees: 'delete_employees',
+    import_employees: 'import_employees',
+    get_employees_by_department: 'get_employees_by_department',
+    update_employee: 'update_employee',
+    delete_department: 'delete_department',
+    get_department: 'get_department',
+})
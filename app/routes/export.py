@@ -0,0 +1,86 @@
+from flask import request, jsonify, Blueprint, Response, stream_with_context, current_app
+from ..repositories.export_repository import ExportRepository
+from ..services.export_service import ExportService
+from .resouces.content_negotiation import respond, get_payload, validate_payload
+from .resouces.idempotency import idempotent
+from .jobs import job_service, accepted
+from ..models import db
+from ..swagger import register_docstrings
+import logging
+
+
+MAX_BATCH_SIZE = 10000
+
+export_service = ExportService(ExportRepository(db=db))
+job_service.register('export_org', export_service.export_file)
+
+export_blueprint = Blueprint("exportar", __name__, url_prefix="/exportar")
+export_blueprint.before_request(validate_payload)
+
+
+@export_blueprint.route('/csv', methods=['GET'])
+def export_csv():
+    """
+    Exporta departamentos, colaboradores e dependentes em um único CSV.
+
+    O arquivo é gerado enquanto é enviado: as linhas são lidas do banco em lotes com cursor no
+    servidor e cada lote é escrito na resposta, então a memória usada não depende do volume de dados.
+
+    Returns:
+        Streamed CSV response or JSON error with status code.
+    """
+    batch_size = request.args.get('lote', 1000, type=int)
+    if batch_size < 1 or batch_size > MAX_BATCH_SIZE:
+        return jsonify({'error': f'O tamanho do lote deve estar entre 1 e {MAX_BATCH_SIZE}'}), 400
+
+    try:
+        chunks = export_service.stream_csv(batch_size)
+        return Response(
+            stream_with_context(chunks),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=organizacao.csv'}
+        )
+    except Exception as e:
+        logging.error(f"Erro inesperado ao exportar a organização: {e}")
+        return jsonify({'error': 'Erro interno do servidor'}), 500
+
+
+@export_blueprint.route('/tarefa', methods=['POST'])
+@idempotent
+def export_job():
+    """
+    Gera a exportação completa em um arquivo, em segundo plano.
+
+    Recebe `format` ('csv', padrão, ou 'parquet') e `lote` (linhas lidas do banco por vez) e responde 202
+    com o ID da tarefa. O progresso é consultado em GET /jobs/<id> e, concluída, o arquivo é baixado em
+    GET /jobs/<id>/arquivo.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        data = get_payload() or {}
+        output_format = data.get('format', 'csv')
+        batch_size = data.get('lote', 1000)
+        if output_format not in ('csv', 'parquet'):
+            return respond({'error': 'Formato inválido, use csv ou parquet'}), 400
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool) or not 1 <= batch_size <= MAX_BATCH_SIZE:
+            return respond({'error': f'O tamanho do lote deve estar entre 1 e {MAX_BATCH_SIZE}'}), 400
+
+        job_id, message = job_service.submit('export_org', {
+            'format': output_format,
+            'batch_size': batch_size,
+            'output_dir': current_app.config['JOB_OUTPUT_DIR'],
+        })
+        return accepted(job_id, message)
+    except Exception as e:
+        logging.error(f"Erro inesperado ao enfileirar a exportação da organização: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+
+############## Integração da docstring para documentar a API via SWAGGER ##############
+register_docstrings('ExportDocstrings', {
+    export_csv: 'export_csv',
+    export_job: 'export_job',
+})
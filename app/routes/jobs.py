@@ -0,0 +1,115 @@
+from flask import Blueprint, current_app, send_from_directory, url_for
+from .resouces.content_negotiation import respond
+from ..repositories.job_repository import JobRepository
+from ..services.job_service import JobService
+from ..models import db
+from ..swagger import register_docstrings
+import logging
+
+
+# Os tipos de tarefa são registrados pelos módulos das rotas que as criam (colaborador, exportar)
+job_service = JobService(JobRepository(db=db))
+
+jobs_blueprint = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+
+def accepted(job_id: str, message: str):
+    """
+    Resposta 202 de uma rota que enfileirou uma tarefa, ou o erro correspondente se ela não foi aceita.
+
+    Args:
+        job_id (str or None): ID da tarefa, retornado por JobService.submit.
+        message (str): Mensagem retornada por JobService.submit.
+    """
+    if job_id is None:
+        if message in ('Fila de tarefas cheia', 'Tarefas em segundo plano desativadas'):
+            return respond({'error': message}), 503
+        return respond({'error': message}), 500
+
+    status_url = url_for('routes.jobs.get_job', job_id=job_id)
+    response = respond({'message': message, 'job_id': job_id, 'status_url': status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+@jobs_blueprint.route('/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """
+    Consulta o status e o progresso de uma tarefa de fundo.
+
+    Args:
+        job_id (str): ID da tarefa, retornado pela rota que a criou.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        job = job_service.get_job(job_id)
+        if job is None:
+            return respond({'error': 'Tarefa não encontrada'}), 404
+        return respond(job), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao consultar a tarefa {job_id}: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+@jobs_blueprint.route('/<job_id>/cancelar', methods=['POST'])
+def cancel_job(job_id: str):
+    """
+    Cancela uma tarefa de fundo.
+
+    Uma tarefa pendente é cancelada na hora (200). Uma em execução para no próximo lote (202), mantendo o que
+    já foi confirmado. Uma tarefa já encerrada não pode ser cancelada (409).
+
+    Args:
+        job_id (str): ID da tarefa.
+
+    Returns:
+        JSON response with status code.
+    """
+    try:
+        status, message = job_service.cancel_job(job_id)
+        if status is None:
+            return respond({'error': message}), 404
+        if message == 'Tarefa já encerrada':
+            return respond({'error': message, 'status': status}), 409
+        if status == 'running':
+            return respond({'message': message, 'status': status}), 202
+        return respond({'message': message, 'status': status}), 200
+    except Exception as e:
+        logging.error(f"Erro inesperado ao cancelar a tarefa {job_id}: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+@jobs_blueprint.route('/<job_id>/arquivo', methods=['GET'])
+def download_job_file(job_id: str):
+    """
+    Baixa o arquivo gerado por uma tarefa de exportação concluída.
+
+    Args:
+        job_id (str): ID da tarefa.
+
+    Returns:
+        File response, or JSON error with status code.
+    """
+    try:
+        job = job_service.get_job(job_id)
+        if job is None:
+            return respond({'error': 'Tarefa não encontrada'}), 404
+        if job['status'] != 'succeeded' or not (job['result'] or {}).get('file'):
+            if (job['result'] or {}).get('file_expired'):
+                return respond({'error': 'O arquivo da tarefa expirou e foi removido', 'status': job['status']}), 410
+            return respond({'error': 'A tarefa não gerou um arquivo', 'status': job['status']}), 409
+        return send_from_directory(current_app.config['JOB_OUTPUT_DIR'], job['result']['file'], as_attachment=True)
+    except Exception as e:
+        logging.error(f"Erro inesperado ao baixar o arquivo da tarefa {job_id}: {e}")
+        return respond({'error': 'Erro interno do servidor'}), 500
+
+
+
+############## Integração da docstring para documentar a API via SWAGGER ##############
+register_docstrings('JobDocstrings', {
+    get_job: 'get_job',
+    cancel_job: 'cancel_job',
+    download_job_file: 'download_job_file',
+})
@@ -0,0 +1,36 @@
+from flask import request, current_app
+from .content_negotiation import respond
+
+
+def if_match_etags():
+    """
+    Retorna os ETags do cabeçalho If-Match, para as escritas condicionais (PUT/DELETE).
+
+    Segue a comparação forte do If-Match: ETags fracos (W/"...") nunca correspondem.
+
+    Returns:
+        set of str or None: Os ETags aceitos pelo cliente; None sem o cabeçalho ou com `If-Match: *`.
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    return request.if_match.as_set()
+
+
+def is_not_modified(etag):
+    """Indica se o If-None-Match do cliente corresponde ao ETag atual do recurso."""
+    return etag is not None and request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag):
+    """Resposta 304 sem corpo para um GET condicional cujo recurso não mudou."""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+
+def respond_with_etag(data, etag):
+    """Serializa a resposta como respond() e inclui o ETag do recurso."""
+    response = respond(data)
+    response.set_etag(etag)
+    return response
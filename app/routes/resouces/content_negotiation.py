@@ -0,0 +1,65 @@
+from flask import request, jsonify, current_app
+import msgpack
+
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+def _response_mimetype():
+    """Escolhe o formato da resposta pelo cabeçalho Accept; JSON continua sendo o padrão."""
+    return request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES) or 'application/json'
+
+
+def respond(data):
+    """
+    Serializa a resposta de uma rota no formato pedido pelo cliente.
+
+    Substitui o jsonify nas rotas: com `Accept: application/msgpack` o corpo é codificado em MessagePack,
+    caso contrário em JSON, como antes. As rotas continuam retornando a tupla (resposta, status).
+
+    Args:
+        data: Estrutura de dados da resposta (dicionários, listas e tipos simples).
+
+    Returns:
+        Response: A resposta já serializada, com `Vary: Accept`.
+    """
+    mimetype = _response_mimetype()
+    if mimetype in MSGPACK_MIMETYPES:
+        response = current_app.response_class(msgpack.packb(data), mimetype=mimetype)
+    else:
+        response = jsonify(data)
+    response.vary.add('Accept')
+    return response
+
+
+def get_payload():
+    """
+    Retorna o corpo da requisição decodificado, em JSON ou em MessagePack (`Content-Type: application/msgpack`).
+
+    Substitui o request.get_json() nas rotas. O corpo MessagePack é decodificado uma única vez por requisição.
+
+    Returns:
+        O corpo da requisição decodificado, ou None se não houver corpo JSON.
+    """
+    if request.mimetype in MSGPACK_MIMETYPES:
+        # Guardado no próprio request, como o get_json faz com o corpo JSON
+        if not hasattr(request, '_cached_msgpack'):
+            request._cached_msgpack = msgpack.unpackb(request.get_data(), raw=False)
+        return request._cached_msgpack
+    return request.get_json()
+
+
+def validate_payload():
+    """
+    Rejeita com 400 um corpo MessagePack inválido antes de chegar à rota.
+
+    Registrada com `before_request` nos blueprints que usam get_payload, para que um corpo malformado
+    não seja tratado como erro interno pelo try/except das rotas.
+    """
+    if request.mimetype not in MSGPACK_MIMETYPES or not request.content_length:
+        return None
+    try:
+        get_payload()
+    except Exception:
+        return respond({'error': 'Corpo MessagePack inválido'}), 400
+    return None
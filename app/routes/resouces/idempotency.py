@@ -0,0 +1,79 @@
+from flask import request, current_app, make_response
+from functools import wraps
+from datetime import timedelta
+from ...models import db
+from ...repositories import IdempotencyRepository
+from .content_negotiation import respond
+import hashlib
+import time
+
+
+idempotency_repository = IdempotencyRepository(db=db)
+
+
+def _request_hash():
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(record):
+    response = make_response(record.response_body, record.status_code)
+    response.content_type = record.content_type
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(f):
+    """
+    Torna um endpoint POST idempotente quando o cliente envia o cabeçalho Idempotency-Key.
+
+    A primeira requisição com uma chave a reserva no banco e executa a rota normalmente; a resposta
+    (se não for um erro 5xx) fica guardada até o fim do IDEMPOTENCY_TTL_SECONDS. Repetições da mesma
+    requisição recebem a resposta guardada sem executar a camada de serviço. Repetições concorrentes
+    aguardam a primeira terminar em vez de disputarem a mesma escrita; se ela não terminar em
+    IDEMPOTENCY_LOCK_SECONDS (o processo caiu), a chave é retomada pela repetição. Reutilizar a chave com
+    outro corpo retorna 422. Sem o cabeçalho, a rota é executada normalmente.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return f(*args, **kwargs)
+
+        if len(key) > 255:
+            return respond({'error': 'Idempotency-Key deve ter no máximo 255 caracteres'}), 400
+
+        ttl = timedelta(seconds=current_app.config['IDEMPOTENCY_TTL_SECONDS'])
+        lock = timedelta(seconds=current_app.config['IDEMPOTENCY_LOCK_SECONDS'])
+        request_hash = _request_hash()
+        deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT_SECONDS']
+
+        while True:
+            record = idempotency_repository.reserve(key, request.method, request.path, request_hash, ttl, lock)
+            if record is None:
+                break
+            if record.request_hash != request_hash:
+                return respond({'error': 'Idempotency-Key já utilizada com outra requisição'}), 422
+            if record.status_code is not None:
+                return _replay(record)
+            if time.monotonic() >= deadline:
+                return respond({'error': 'Requisição com esta Idempotency-Key ainda em processamento'}), 409
+            # Outra requisição com a mesma chave está em andamento: aguarda o resultado dela
+            time.sleep(0.05)
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            idempotency_repository.release(key)
+            raise
+
+        if response.status_code >= 500:
+            idempotency_repository.release(key)
+        else:
+            idempotency_repository.complete(key, response.status_code, response.content_type, response.get_data())
+        return response
+
+    return decorated
@@ -0,0 +1,111 @@
+from flask import request, current_app, make_response
+from functools import wraps
+from ...cache import read_cache
+from ...models import primary_reads, has_write_marker
+from ...repositories.signals import department_changed, employee_changed, caches_flush
+from .content_negotiation import _response_mimetype
+from .conditional import is_not_modified, not_modified
+import gzip
+import hashlib
+
+
+class ResponseCache:
+    """
+    Cache das respostas já serializadas das leituras mais acessadas.
+
+    Guarda, por rota, argumentos, query string e formato (JSON ou MessagePack), o corpo final em bytes,
+    o ETag e, acima de RESPONSE_CACHE_GZIP_MIN_BYTES, uma variante comprimida com gzip. Um acerto não
+    consulta o banco nem serializa nada: só monta a Response com os bytes guardados (ou responde 304).
+    As entradas ficam no TieredCache das leituras e são invalidadas pelos sinais das escritas.
+
+    Como no TieredCache, a resposta de uma falha é montada com leituras do primário e só é guardada se nenhuma
+    invalidação aconteceu enquanto era montada; a requisição com a marca de escrita não usa o cache.
+    """
+
+    # Acima disso, uma alteração em massa descarta todas as respostas de colaboradores de uma vez
+    MAX_TARGETED_INVALIDATIONS = 100
+
+    def __init__(self, cache):
+        self.cache = cache
+
+        department_changed.connect(self._on_department_changed)
+        employee_changed.connect(self._on_employee_changed)
+        caches_flush.connect(self._on_caches_flush)
+
+    def cached(self, name: str):
+        """
+        Decorator de rota GET: responde do cache quando possível e guarda as respostas 200.
+
+        Args:
+            name (str): Prefixo da chave; os argumentos da rota são acrescentados a ele
+                (ex.: 'employee' e employee_id=5 resultam em 'response:employee:5:...').
+        """
+        def decorator(view):
+            @wraps(view)
+            def decorated(*args, **kwargs):
+                if (not current_app.config.get('RESPONSE_CACHE_ENABLED', False) or not self.cache.tiers
+                        or has_write_marker()):
+                    return view(*args, **kwargs)
+
+                key = self.key(name, kwargs)
+                entry = self.cache.get(key)
+                if entry is None:
+                    generation = self.cache.generation
+                    with primary_reads():
+                        response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.direct_passthrough:
+                        return response
+                    entry = self.entry(response)
+                    self.cache.set_if_current(key, entry, generation)
+                return self.serve(entry)
+            return decorated
+        return decorator
+
+    @staticmethod
+    def key(name: str, view_args: dict):
+        parts = [str(view_args[arg]) for arg in sorted(view_args)]
+        query = request.query_string.decode('latin-1')
+        return ':'.join(['response', name, *parts, query, _response_mimetype()])
+
+    @staticmethod
+    def entry(response):
+        body = response.get_data()
+        etag, _ = response.get_etag()
+        if etag is None:
+            etag = hashlib.sha1(body).hexdigest()
+        entry = {'body': body, 'mimetype': response.mimetype, 'etag': etag, 'gzip': None}
+        if len(body) >= current_app.config['RESPONSE_CACHE_GZIP_MIN_BYTES']:
+            entry['gzip'] = gzip.compress(body, compresslevel=6)
+        return entry
+
+    @staticmethod
+    def serve(entry):
+        if is_not_modified(entry['etag']):
+            return not_modified(entry['etag'])
+
+        use_gzip = entry['gzip'] is not None and 'gzip' in request.accept_encodings
+        response = current_app.response_class(entry['gzip'] if use_gzip else entry['body'], mimetype=entry['mimetype'])
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(entry['etag'])
+        response.vary.update(('Accept', 'Accept-Encoding'))
+        return response
+
+    def _on_department_changed(self, action, items=(), **kwargs):
+        self.cache.delete_prefix('response:departments:')
+        if action != 'created':
+            # As respostas de colaborador incluem o nome e a versão do departamento
+            self.cache.delete_prefix('response:employee:')
+
+    def _on_employee_changed(self, action, items=(), **kwargs):
+        if len(items) > self.MAX_TARGETED_INVALIDATIONS:
+            self.cache.delete_prefix('response:employee:')
+            return
+        for employee_id, name in items:
+            self.cache.delete_prefix(f'response:employee:{employee_id}:')
+
+    def _on_caches_flush(self, sender, **kwargs):
+        self.cache.delete_prefix('response:')
+
+
+response_cache = ResponseCache(read_cache)
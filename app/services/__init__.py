@@ -1,2 +1,6 @@
 from .departament_service import DepartmentService
-from .employee_service import EmployeeService
\ No newline at end of file
+from .employee_service import EmployeeService
+from .autocomplete_service import AutocompleteService
+from .export_service import ExportService
+from .change_feed_service import ChangeFeedService
+from .job_service import JobService
\ No newline at end of file
@@ -0,0 +1,115 @@
+from ..cache import PrefixIndex
+from ..repositories.signals import department_changed, employee_changed, caches_flush
+from threading import Lock
+import logging
+
+
+class AutocompleteService:
+    def __init__(self, department_repository, employee_repository):
+        self.department_repository = department_repository
+        self.employee_repository = employee_repository
+        self.department_index = PrefixIndex()
+        self.employee_index = PrefixIndex()
+        self._built = False
+        self._build_lock = Lock()
+
+        department_changed.connect(self._on_department_changed)
+        employee_changed.connect(self._on_employee_changed)
+        caches_flush.connect(self._on_caches_flush)
+
+    def build(self):
+        """
+        Monta os índices de departamentos e colaboradores a partir dos repositórios.
+
+        Chamado na inicialização da aplicação. Se o banco ainda não estiver disponível (por exemplo,
+        antes das migrations), os índices ficam marcados como não construídos e serão montados
+        na primeira busca.
+
+        Returns:
+            bool: True se os dois índices foram construídos, False caso contrário.
+        """
+        with self._build_lock:
+            departments = self.department_repository.list_department_names()
+            employees = self.employee_repository.list_employee_names()
+            if departments is None or employees is None:
+                self._built = False
+                return False
+
+            self.department_index.load(departments)
+            self.employee_index.load(employees)
+            self._built = True
+
+        footprint = self.memory_footprint()
+        logging.info(
+            f"Índice de autocompletar construído: {footprint['departments']['entries']} departamentos, "
+            f"{footprint['employees']['entries']} colaboradores, {footprint['total_bytes']} bytes"
+        )
+        return True
+
+    def search_departments(self, prefix: str, limit: int = 10):
+        """
+        Busca departamentos cujo nome começa com o prefixo informado.
+
+        Args:
+            prefix (str): Prefixo digitado pelo usuário.
+            limit (int): Quantidade máxima de resultados.
+
+        Returns:
+            list or None: Lista de {'id', 'name'}; None se o índice não pôde ser construído.
+        """
+        if not self._ensure_built():
+            return None
+        return self.department_index.search(prefix, limit)
+
+    def search_employees(self, prefix: str, limit: int = 10):
+        """
+        Busca colaboradores cujo nome começa com o prefixo informado.
+
+        Args:
+            prefix (str): Prefixo digitado pelo usuário.
+            limit (int): Quantidade máxima de resultados.
+
+        Returns:
+            list or None: Lista de {'id', 'name'}; None se o índice não pôde ser construído.
+        """
+        if not self._ensure_built():
+            return None
+        return self.employee_index.search(prefix, limit)
+
+    def memory_footprint(self):
+        """
+        Informa o tamanho dos índices em memória.
+
+        Returns:
+            dict: Quantidade de entradas e bytes estimados de cada índice, além do total em bytes.
+        """
+        departments = {'entries': len(self.department_index), 'bytes': self.department_index.memory_footprint()}
+        employees = {'entries': len(self.employee_index), 'bytes': self.employee_index.memory_footprint()}
+        return {
+            'departments': departments,
+            'employees': employees,
+            'total_bytes': departments['bytes'] + employees['bytes']
+        }
+
+    def _ensure_built(self):
+        if self._built:
+            return True
+        return self.build()
+
+    def _on_caches_flush(self, sender, **kwargs):
+        # Reconstruído na próxima busca
+        self._built = False
+
+    def _on_department_changed(self, action, items=(), **kwargs):
+        for department_id, name in items:
+            if action == 'deleted':
+                self.department_index.remove(department_id)
+            else:
+                self.department_index.add(department_id, name)
+
+    def _on_employee_changed(self, action, items=(), **kwargs):
+        for employee_id, name in items:
+            if action == 'deleted':
+                self.employee_index.remove(employee_id)
+            else:
+                self.employee_index.add(employee_id, name)
@@ -0,0 +1,69 @@
+from ..repositories.signals import department_changed, employee_changed
+from datetime import timedelta
+import logging
+
+
+class ChangeFeedService:
+    def __init__(self, repository):
+        self.repository = repository
+
+        # As posições do feed são atribuídas pelo lado da escrita, logo após o commit de cada alteração
+        department_changed.connect(self._on_change)
+        employee_changed.connect(self._on_change)
+
+    def get_changes(self, since: int, limit: int):
+        """
+        Busca as alterações posteriores a uma sequência, para sincronização incremental.
+
+        Se parte das alterações após `since` já foi removida pela compactação, o cliente não tem como
+        se atualizar apenas com deltas e recebe uma mensagem pedindo uma sincronização completa.
+
+        Args:
+            since (int): Última sequência já processada pelo cliente.
+            limit (int): Quantidade máxima de alterações retornadas.
+
+        Returns:
+            tuple: (feed, None) se bem-sucedido, onde feed contém 'changes', 'next_since' e 'has_more';
+                (None, message) se o histórico foi compactado ou em caso de falha.
+        """
+        try:
+            if since < self.repository.get_compacted_through():
+                return None, 'Histórico compactado, faça uma sincronização completa'
+
+            rows = self.repository.list_changes(since, limit + 1)
+            if rows is None:
+                return None, 'Erro ao buscar alterações'
+
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            return {
+                'changes': [{
+                    'seq': seq,
+                    'entity': entity,
+                    'entity_id': entity_id,
+                    'action': action,
+                    'changed_at': changed_at.isoformat()
+                } for seq, entity, entity_id, action, changed_at in rows],
+                'next_since': rows[-1][0] if rows else since,
+                'has_more': has_more
+            }, None
+        except Exception as e:
+            logging.error(f"Erro ao buscar alterações: {e}")
+            return None, 'Erro ao buscar alterações'
+
+    def _on_change(self, action, remote=False, **kwargs):
+        # Alterações de outros processos recebem as posições de quem as gravou
+        if not remote:
+            self.repository.assign_positions()
+
+    def compact(self, retention_days: int):
+        """
+        Remove do histórico as alterações mais antigas que a janela de retenção.
+
+        Args:
+            retention_days (int): Quantidade de dias mantidos no histórico.
+
+        Returns:
+            int or None: Quantidade de alterações removidas; None em caso de falha.
+        """
+        return self.repository.compact(timedelta(days=retention_days))
@@ -1,8 +1,15 @@
+from ..cache import TieredCache
+from ..repositories.signals import department_changed, caches_flush
 import logging
 
 class DepartmentService:
-    def __init__(self, repository):
+    def __init__(self, repository, cache=None):
         self.repository = repository
+        # TieredCache das leituras; invalidado pelos sinais disparados após cada escrita
+        self.cache = cache if cache is not None else TieredCache()
+
+        department_changed.connect(self._on_department_changed)
+        caches_flush.connect(self._on_caches_flush)
 
     def create_department(self, name: str):
         """
@@ -35,54 +42,105 @@ class DepartmentService:
         """
         Lista todos os departamentos existentes.
 
-        Tenta recuperar e retornar todos os departamentos do banco de dados. Em caso de falha, retorna None.
+        Tenta recuperar e retornar todos os departamentos, do cache ou do banco de dados. Em caso de falha,
+        retorna None.
 
         Returns:
-            list or None: Lista dos departamentos se bem-sucedido, None em caso de falha.
+            list or None: Lista de dicionários {'id', 'name'} se bem-sucedido, None em caso de falha.
         """
         try:
-            departments = self.repository.list_departments()
-            return departments
+            return self.cache.get_or_load('departments', self.repository.list_departments)
         except Exception as e:
             logging.error(f"Erro ao listar departamentos: {e}")
             return None
 
-    def update_department(self, department_id: int, new_name: str):
+    def get_department_columns(self):
+        """
+        Lista todos os departamentos em formato colunar ({'id': [...], 'name': [...]}).
+
+        Returns:
+            dict or None: As colunas dos departamentos se bem-sucedido, None em caso de falha.
+        """
+        try:
+            return self.repository.list_department_columns()
+        except Exception as e:
+            logging.error(f"Erro ao listar departamentos em formato colunar: {e}")
+            return None
+
+    def get_department_stats(self):
+        """
+        Lista as estatísticas de cada departamento.
+
+        Para cada departamento retorna a quantidade de colaboradores, de dependentes e a proporção de
+        colaboradores que possuem dependentes. Em caso de falha, retorna None.
+
+        Returns:
+            list or None: Lista de dicionários com as estatísticas se bem-sucedido, None em caso de falha.
+        """
+        try:
+            rows = self.repository.get_department_stats()
+            if rows is None:
+                return None
+            return [{
+                'id': department_id,
+                'name': name,
+                'employee_count': employee_count,
+                'dependent_count': dependent_count,
+                'employees_with_dependents': with_dependents,
+                'dependents_share': round(with_dependents / employee_count, 4) if employee_count else 0.0
+            } for department_id, name, employee_count, with_dependents, dependent_count in rows]
+        except Exception as e:
+            logging.error(f"Erro ao listar estatísticas dos departamentos: {e}")
+            return None
+
+    def update_department(self, department_id: int, new_name: str, expected_etags=None):
         """
         Atualiza o nome de um departamento existente.
 
         Verifica se o novo nome já existe. Se sim, retorna um erro. Se não, tenta atualizar o departamento
-        com o novo nome e retorna uma mensagem de sucesso ou falha.
+        com o novo nome e retorna uma mensagem de sucesso ou falha. Com `expected_etags` (If-Match), o
+        departamento só é atualizado se ainda estiver na versão que o cliente leu.
 
         Args:
             department_id (int): ID do departamento a ser atualizado.
             new_name (str): Novo nome para o departamento.
+            expected_etags (set of str, optional): ETags aceitos pelo cliente; None para atualizar sem condição.
 
         Returns:
-            tuple: (None, message) se o nome já existe ou falha na atualização;
-                (department_id, message) se atualizado com sucesso.
+            tuple: (None, message) se o nome já existe, se o departamento foi alterado por outra requisição
+                ou falha na atualização; (department_id, message) se atualizado com sucesso.
         """
         if self.repository.exists_department(new_name):
             return None, 'Nome de departamento já existe'
         
         try:
-            if self.repository.update_department(department_id, new_name):
+            expected_version = None
+            if expected_etags is not None:
+                expected_version = self.repository.get_department_version(department_id)
+                if expected_version is not None and self.etag(expected_version) not in expected_etags:
+                    return None, 'Departamento alterado por outra requisição'
+
+            if self.repository.update_department(department_id, new_name, expected_version):
                 return department_id, 'Departamento atualizado com sucesso'
+            elif expected_version is not None and self._version_changed(department_id, expected_version):
+                return None, 'Departamento alterado por outra requisição'
             else:
                 return 'Erro ao atualizar departamento ou departamento não encontrado', False
         except Exception as e:
             logging.error(f"Erro ao editar departamento: {e}")
             return None
 
-    def delete_department(self, department_id: int):
+    def delete_department(self, department_id: int, expected_etags=None):
         """
         Exclui um departamento existente.
 
         Verifica primeiro se o departamento existe. Se não, retorna um erro. Se sim, tenta excluir
-        e retorna uma mensagem de sucesso ou de falha.
+        e retorna uma mensagem de sucesso ou de falha. Com `expected_etags` (If-Match), o departamento
+        só é excluído se ainda estiver na versão que o cliente leu.
 
         Args:
             department_id (int): ID do departamento a ser excluído.
+            expected_etags (set of str, optional): ETags aceitos pelo cliente; None para excluir sem condição.
 
         Returns:
             tuple: (message, success) indicando o resultado da operação.
@@ -92,14 +150,61 @@ class DepartmentService:
             if not department:
                 return 'Departamento não encontrado', False
 
-            if self.repository.delete_department(department_id):
+            expected_version = None
+            if expected_etags is not None:
+                expected_version = department.version
+                if self.etag(expected_version) not in expected_etags:
+                    return 'Departamento alterado por outra requisição', False
+
+            if self.repository.delete_department(department_id, expected_version):
                 return 'Departamento excluído com sucesso', True
+            elif expected_version is not None and self._version_changed(department_id, expected_version):
+                return 'Departamento alterado por outra requisição', False
             else:
                 return 'Erro ao excluir o departamento', False
         except Exception as e:
             logging.error(f"Erro ao tentar excluir o departamento: {e}")
             return 'Erro interno ao tentar excluir o departamento', False
            
+    def merge_departments(self, source_id: int, target_id: int, expected_etags=None):
+        """
+        Mescla um departamento em outro, movendo todos os seus colaboradores e excluindo-o.
+
+        Verifica primeiro se os dois departamentos existem. Com `expected_etags` (If-Match), o departamento
+        de origem só é mesclado se ainda estiver na versão que o cliente leu.
+
+        Args:
+            source_id (int): ID do departamento a ser mesclado (e excluído).
+            target_id (int): ID do departamento que recebe os colaboradores.
+            expected_etags (set of str, optional): ETags da origem aceitos pelo cliente; None para mesclar sem condição.
+
+        Returns:
+            tuple: (moved_employee_ids, message) se bem-sucedido; (None, message) caso contrário.
+        """
+        try:
+            department = self.repository.get_department_by_id(source_id)
+            if not department:
+                return None, 'Departamento não encontrado'
+            if not self.repository.get_department_by_id(target_id):
+                return None, 'Departamento de destino não encontrado'
+
+            expected_version = None
+            if expected_etags is not None:
+                expected_version = department.version
+                if self.etag(expected_version) not in expected_etags:
+                    return None, 'Departamento alterado por outra requisição'
+
+            moved = self.repository.merge_departments(source_id, target_id, expected_version)
+            if moved is not None:
+                return moved, 'Departamentos mesclados com sucesso'
+            elif expected_version is not None and self._version_changed(source_id, expected_version):
+                return None, 'Departamento alterado por outra requisição'
+            else:
+                return None, 'Erro ao mesclar os departamentos'
+        except Exception as e:
+            logging.error(f"Erro ao tentar mesclar os departamentos: {e}")
+            return None, 'Erro interno ao tentar mesclar os departamentos'
+
     def get_department_by_id(self, department_id: int):
         """
         Busca um departamento pelo seu ID.
@@ -111,15 +216,49 @@ class DepartmentService:
             department_id (int): ID do departamento a ser buscado.
 
         Returns:
-            tuple: ({'id': id, 'name': name}, success) se encontrado;
+            tuple: ({'id': id, 'name': name, 'version': version}, success) se encontrado;
                 (message, success) se não encontrado ou erro.
         """
         try:
-            department = self.repository.get_department_by_id(department_id)
+            department = self.cache.get_or_load(f'department:{department_id}', lambda: self._load_department(department_id))
             if department:
-                return {'id': department.id, 'name': department.name}, True
+                return department, True
             else:
                 return 'Departamento não encontrado', False
         except Exception as e:
             logging.error(f"Erro ao buscar o departamento por ID: {e}")
-            return 'Erro interno ao buscar o departamento', False
\ No newline at end of file
+            return 'Erro interno ao buscar o departamento', False
+
+    def get_department_etag(self, department_id: int):
+        """
+        Retorna o ETag atual de um departamento, consultando apenas a sua versão.
+
+        Args:
+            department_id (int): ID do departamento.
+
+        Returns:
+            str or None: O ETag do departamento, ou None se ele não for encontrado.
+        """
+        version = self.repository.get_department_version(department_id)
+        return self.etag(version) if version is not None else None
+
+    @staticmethod
+    def etag(version: int):
+        """O ETag de um departamento é a sua versão (version_id_col)."""
+        return str(version)
+
+    def _version_changed(self, department_id: int, expected_version: int):
+        version = self.repository.get_department_version(department_id)
+        return version is not None and version != expected_version
+
+    def _load_department(self, department_id: int):
+        department = self.repository.get_department_by_id(department_id)
+        if not department:
+            return None
+        return {'id': department.id, 'name': department.name, 'version': department.version}
+
+    def _on_caches_flush(self, sender, **kwargs):
+        self.cache.clear()
+
+    def _on_department_changed(self, action, items=(), **kwargs):
+        self.cache.delete('departments', *[f'department:{department_id}' for department_id, name in items])
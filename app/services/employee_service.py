@@ -1,15 +1,49 @@
+from ..cache import TieredCache
+from ..repositories.signals import department_changed, employee_changed, caches_flush
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import base64
+import json
 import logging
 
 class EmployeeService:
-    def __init__(self, repository):
+    # Erros por item guardados no resultado de uma importação; os demais só entram na contagem
+    MAX_REPORTED_IMPORT_ERRORS = 100
+
+    def __init__(self, repository, group_writer=None, department_ids=None, cache=None):
         self.repository = repository
+        # GroupCommitWriter opcional: quando definido, os cadastros são gravados em lotes (group commit)
+        self.group_writer = group_writer
+        # DepartmentIdCache opcional: quando definido, department_id inexistente é rejeitado antes de ir ao banco
+        self.department_ids = department_ids
+        # TieredCache das leituras; invalidado pelos sinais disparados após cada escrita
+        self.cache = cache if cache is not None else TieredCache()
+
+        employee_changed.connect(self._on_employee_changed)
+        department_changed.connect(self._on_department_changed)
+        caches_flush.connect(self._on_caches_flush)
+
+    def department_exists(self, department_id) -> bool:
+        """
+        Indica se o departamento existe, consultando o cache de IDs quando houver um.
+
+        Sem cache, o departamento é considerado válido e a chave estrangeira decide no banco.
+
+        Args:
+            department_id (int): ID do departamento a ser validado.
+
+        Returns:
+            bool: False se o departamento certamente não existe, True caso contrário.
+        """
+        if self.department_ids is None:
+            return True
+        return self.department_ids.contains(department_id)
 
     def create_employee(self, name: str, department_id: int, dependents=None):
         """
         Adiciona um novo colaborador ao banco de dados, juntamente com seus dependentes, se fornecidos.
 
-        Verifica primeiro se já existe um colaborador com o mesmo nome. Se existir, retorna uma mensagem de erro.
-        Se não, tenta adicionar o novo colaborador e seus dependentes ao banco de dados. Retorna o ID do novo
+        Verifica primeiro se o departamento existe e se já existe um colaborador com o mesmo nome. Em ambos os
+        casos, retorna uma mensagem de erro. Se não, tenta adicionar o novo colaborador e seus dependentes ao banco de dados. Retorna o ID do novo
         colaborador e uma mensagem de sucesso se a adição for bem-sucedida, ou None em caso de falha.
 
         Args:
@@ -18,21 +52,93 @@ class EmployeeService:
             dependents (list of str, optional): Lista opcional de nomes dos dependentes do colaborador.
 
         Returns:
-            tuple: (None, message) se o colaborador já existir ou falhar ao adicionar;
+            tuple: (None, message) se o departamento não existir, se o colaborador já existir ou falhar ao adicionar;
                 (employee_id, message) se adicionado com sucesso.
         """
+        if not self.department_exists(department_id):
+            return None, 'Departamento não encontrado'
+
         if self.repository.exists_employee(name):
             return None, 'Colaborador já existe'
         
         try:
-            employee_id = self.repository.create_employee(name, department_id, dependents)
+            if self.group_writer is not None:
+                future = self.group_writer.submit(name, department_id, dependents)
+                try:
+                    employee_id = future.result(timeout=self.group_writer.result_timeout)
+                except FutureTimeoutError:
+                    if future.cancel():
+                        # Ainda na fila: cancelado, o cadastro não será gravado e a requisição pode ser repetida
+                        logging.error(f"Tempo esgotado aguardando o group commit do colaborador {name}")
+                        return None, 'Tempo esgotado ao adicionar colaborador'
+                    # O lote já está sendo gravado: responder com falha agora deixaria o cadastro ser confirmado
+                    employee_id = future.result()
+            else:
+                employee_id = self.repository.create_employee(name, department_id, dependents)
             if employee_id:
                 return employee_id, 'Colaborador adicionado com sucesso'
             else:
-                return None
+                return None, 'Erro ao adicionar colaborador'
         except Exception as e:
             logging.error(f"Erro ao cadastrar colaborador: {e}")
-            return None
+            return None, 'Erro ao adicionar colaborador'
+
+    def import_employees(self, job):
+        """
+        Tarefa de fundo que cadastra uma lista de colaboradores, em lotes.
+
+        `job.params` traz 'employees' (dicionários com name, department_id e dependents) e 'batch_size'. Cada
+        lote é validado de uma vez (departamentos pelo conjunto em memória, nomes já cadastrados com uma
+        consulta) e gravado por EmployeeRepository.create_employees em uma única transação, que também grava
+        o progresso da tarefa: retomada após uma queda, a importação continua do primeiro lote não confirmado.
+
+        Args:
+            job (JobContext): A tarefa em execução.
+
+        Returns:
+            dict: Quantidade de colaboradores criados e com falha, e os primeiros erros por item.
+        """
+        employees = job.params['employees']
+        batch_size = job.params['batch_size']
+        result = job.result or {'created': 0, 'failed': 0, 'errors': []}
+        job.report(job.progress, total=len(employees), result=result)
+
+        for start in range(job.progress, len(employees), batch_size):
+            batch = employees[start:start + batch_size]
+            missing = self.department_ids.missing({item['department_id'] for item in batch}) if self.department_ids else set()
+            taken = self.repository.existing_names([item['name'] for item in batch])
+
+            rows, positions, errors = [], [], []
+            for index, item in enumerate(batch, start):
+                if item['department_id'] in missing:
+                    errors.append((index, item['name'], 'Departamento não encontrado'))
+                elif item['name'] in taken:
+                    errors.append((index, item['name'], 'Colaborador já existe'))
+                else:
+                    # Nomes repetidos dentro da própria importação: só o primeiro é cadastrado
+                    taken.add(item['name'])
+                    rows.append((item['name'], item['department_id'], item.get('dependents') or []))
+                    positions.append(index)
+
+            def batch_result(results):
+                failed = errors + [(index, name, 'Erro ao adicionar colaborador')
+                                   for index, (name, _, _), employee_id in zip(positions, rows, results)
+                                   if employee_id is None]
+                reported = result['errors'] + [{'index': index, 'name': name, 'error': error}
+                                                for index, name, error in sorted(failed)]
+                return {'created': result['created'] + sum(1 for employee_id in results if employee_id is not None),
+                        'failed': result['failed'] + len(failed),
+                        'errors': reported[:self.MAX_REPORTED_IMPORT_ERRORS]}
+
+            end = start + len(batch)
+            results = self.repository.create_employees(
+                rows, before_commit=lambda results: job.checkpoint(end, result=batch_result(results))
+            ) if rows else []
+            result = batch_result(results)
+            # Também atende um pedido de cancelamento e registra lotes que falharam por inteiro
+            job.report(end, result=result)
+
+        return result
 
     def get_employees_by_department(self, department_id: int):
         """
@@ -48,7 +154,8 @@ class EmployeeService:
             list or None: Lista dos colaboradores se bem-sucedido, None em caso de falha.
         """
         try:
-            employees = self.repository.get_employees_by_department(department_id)
+            employees = self.cache.get_or_load(f'employees:department:{department_id}',
+                                               lambda: self.repository.get_employees_by_department(department_id))
             if employees is not None:  
                 return employees
             else:
@@ -57,45 +164,221 @@ class EmployeeService:
             logging.error(f"Erro ao listar colaboradores: {e}")
             return None
         
-    def update_employee(self, employee_id: int, new_name: str = None, new_department_id: int = None, new_dependents: list = None):
+    def move_employees(self, target_department_id: int, employee_ids=None, source_department_id: int = None,
+                       have_dependents: bool = None, name_prefix: str = None):
+        """
+        Move uma lista de colaboradores, ou todos os que atendem a um filtro, para outro departamento.
+
+        O departamento de destino é validado uma única vez, antes de abrir a transação.
+
+        Args:
+            target_department_id (int): Departamento de destino.
+            employee_ids (list of int, optional): IDs dos colaboradores a mover.
+            source_department_id (int, optional): Departamento de origem, quando a seleção é por filtro.
+            have_dependents (bool, optional): Filtro por colaboradores com ou sem dependentes.
+            name_prefix (str, optional): Filtro pelo início do nome.
+
+        Returns:
+            tuple: ({'moved': [...], 'unchanged': [...], 'not_found': [...]}, message) se bem-sucedido;
+                (None, message) se o departamento não existir ou em caso de falha.
+        """
+        if not self.department_exists(target_department_id):
+            return None, 'Departamento não encontrado'
+
+        try:
+            result = self.repository.move_employees(target_department_id, employee_ids, source_department_id,
+                                                    have_dependents, name_prefix)
+            if result is None:
+                return None, 'Erro ao mover colaboradores'
+            moved, unchanged = result
+            not_found = sorted(set(employee_ids) - set(moved) - set(unchanged)) if employee_ids is not None else []
+            return {'moved': moved, 'unchanged': unchanged, 'not_found': not_found}, 'Colaboradores movidos com sucesso'
+        except Exception as e:
+            logging.error(f"Erro ao mover colaboradores: {e}")
+            return None, 'Erro ao mover colaboradores'
+
+    def delete_employees(self, employee_ids=None, source_department_id: int = None, have_dependents: bool = None,
+                         name_prefix: str = None):
+        """
+        Exclui uma lista de colaboradores, ou todos os que atendem a um filtro, com os seus dependentes.
+
+        Args:
+            employee_ids (list of int, optional): IDs dos colaboradores a excluir.
+            source_department_id (int, optional): Departamento dos colaboradores, quando a seleção é por filtro.
+            have_dependents (bool, optional): Filtro por colaboradores com ou sem dependentes.
+            name_prefix (str, optional): Filtro pelo início do nome.
+
+        Returns:
+            tuple: ({'deleted': [...], 'not_found': [...]}, message) se bem-sucedido; (None, message) em caso de falha.
+        """
+        try:
+            deleted = self.repository.delete_employees(employee_ids, source_department_id, have_dependents, name_prefix)
+            if deleted is None:
+                return None, 'Erro ao excluir colaboradores'
+            not_found = sorted(set(employee_ids) - set(deleted)) if employee_ids is not None else []
+            return {'deleted': deleted, 'not_found': not_found}, 'Colaboradores excluídos com sucesso'
+        except Exception as e:
+            logging.error(f"Erro ao excluir colaboradores: {e}")
+            return None, 'Erro ao excluir colaboradores'
+
+    def get_employees_page(self, department_id: int, limit: int, sort: str = 'id', after=None,
+                           have_dependents: bool = None, name_prefix: str = None):
+        """
+        Busca uma página dos colaboradores de um departamento.
+
+        Args:
+            department_id (int): ID do departamento do qual os colaboradores serão listados.
+            limit (int): Tamanho da página.
+            sort (str): 'id' ou 'name'.
+            after (tuple, optional): Chave decodificada do cursor (decode_cursor), ou None para a primeira página.
+            have_dependents (bool, optional): Filtra colaboradores com ou sem dependentes.
+            name_prefix (str, optional): Filtra pelo início do nome.
+
+        Returns:
+            tuple or None: (rows, next_cursor), com as tuplas (id, name, have_dependents) da página e o cursor
+                da próxima (None na última); None em caso de falha.
+        """
+        try:
+            rows = self.repository.get_employees_page(department_id, limit, sort, after, have_dependents, name_prefix)
+            if rows is None:
+                return None
+            if len(rows) <= limit:
+                return rows, None
+            rows = rows[:limit]
+            last_id, last_name, _ = rows[-1]
+            return rows, self.encode_cursor(sort, (last_name, last_id) if sort == 'name' else (last_id,))
+        except Exception as e:
+            logging.error(f"Erro ao listar a página de colaboradores: {e}")
+            return None
+
+    def count_employees(self, department_id: int, have_dependents: bool = None, name_prefix: str = None):
+        """
+        Retorna o total de colaboradores do departamento que atendem aos filtros, sem COUNT(*) a cada página.
+
+        Sem name_prefix, o total vem dos contadores de department_stats, mantidos a cada escrita. Com
+        name_prefix (ou sem linha de resumo), a contagem é feita uma vez e guardada no cache até a próxima
+        escrita no departamento.
+
+        Returns:
+            int or None: O total, ou None em caso de falha.
+        """
+        try:
+            counts = None if name_prefix else self.repository.get_department_counts(department_id)
+            if counts is None:
+                return self.cache.get_or_load(
+                    f'employees:department:{department_id}:count:{have_dependents}:{name_prefix}',
+                    lambda: self.repository.count_employees(department_id, have_dependents, name_prefix))
+
+            employee_count, with_dependents = counts
+            if have_dependents is None:
+                return employee_count
+            return with_dependents if have_dependents else employee_count - with_dependents
+        except Exception as e:
+            logging.error(f"Erro ao contar colaboradores: {e}")
+            return None
+
+    @staticmethod
+    def encode_cursor(sort: str, key: tuple):
+        """Cursor opaco da paginação: a ordenação e a chave da última linha, em base64 URL-safe."""
+        return base64.urlsafe_b64encode(json.dumps([sort, *key]).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str):
+        """
+        Decodifica um cursor gerado por encode_cursor para a mesma ordenação.
+
+        Returns:
+            tuple: A chave da última linha da página anterior: (id,) ou (name, id).
+
+        Raises:
+            ValueError: Se o cursor for inválido ou de outra ordenação.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        except (ValueError, TypeError) as e:
+            raise ValueError('Cursor inválido') from e
+        if not isinstance(values, list) or not values or values[0] != sort:
+            raise ValueError('Cursor inválido')
+        key = tuple(values[1:])
+        expected = (str, int) if sort == 'name' else (int,)
+        if len(key) != len(expected) or not all(type(value) is kind for value, kind in zip(key, expected)):
+            raise ValueError('Cursor inválido')
+        return key
+
+    def get_employee_columns_by_department(self, department_id: int):
+        """
+        Busca os colaboradores de um departamento em formato colunar.
+
+        Args:
+            department_id (int): ID do departamento do qual os colaboradores serão listados.
+
+        Returns:
+            dict or None: {'id': [...], 'name': [...], 'have_dependents': [...]} se bem-sucedido,
+                None em caso de falha.
+        """
+        try:
+            return self.repository.get_employee_columns_by_department(department_id)
+        except Exception as e:
+            logging.error(f"Erro ao listar colaboradores em formato colunar: {e}")
+            return None
+
+    def update_employee(self, employee_id: int, new_name: str = None, new_department_id: int = None, new_dependents: list = None,
+                        expected_etags=None):
         """
         Atualiza os dados de um colaborador existente.
 
         Verifica a existência de um nome duplicado antes de atualizar o colaborador. Se o nome não existir, procede
         com a atualização de nome, departamento e dependentes conforme fornecido. Retorna o ID do colaborador e uma
-        mensagem de sucesso se a atualização for bem-sucedida, ou uma mensagem de erro caso contrário.
+        mensagem de sucesso se a atualização for bem-sucedida, ou uma mensagem de erro caso contrário. Com
+        `expected_etags` (If-Match), o colaborador só é atualizado se ainda estiver na versão que o cliente leu.
 
         Args:
             employee_id (int): ID do colaborador a ser atualizado.
             new_name (str, optional): Novo nome do colaborador.
             new_department_id (int, optional): Novo ID de departamento do colaborador.
             new_dependents (list of str, optional): Nova lista de dependentes do colaborador.
+            expected_etags (set of str, optional): ETags aceitos pelo cliente; None para atualizar sem condição.
 
         Returns:
-            tuple: (None, message) se ocorrer um erro ou se o nome já existir;
-                (employee_id, message) se atualizado com sucesso.
+            tuple: (None, message) se ocorrer um erro, se o nome já existir, se o novo departamento não existir
+                ou se o colaborador foi alterado por outra requisição; (employee_id, message) se atualizado com sucesso.
         """
         try:
+            if new_department_id is not None and not self.department_exists(new_department_id):
+                return None, 'Departamento não encontrado'
+
             if new_name and self.repository.exists_employee_with_different_id(new_name, employee_id):
                 return None, 'Nome de colaborador já existe'
 
-            if self.repository.update_employee(employee_id, new_name, new_department_id, new_dependents):
+            expected_version = None
+            if expected_etags is not None:
+                versions = self.repository.get_employee_versions(employee_id)
+                if versions is not None:
+                    if self.etag(*versions) not in expected_etags:
+                        return None, 'Colaborador alterado por outra requisição'
+                    expected_version = versions[0]
+
+            if self.repository.update_employee(employee_id, new_name, new_department_id, new_dependents, expected_version):
                 return employee_id, 'Colaborador atualizado com sucesso'
+            elif expected_version is not None and self._version_changed(employee_id, expected_version):
+                return None, 'Colaborador alterado por outra requisição'
             else:
                 return 'Erro ao atualizar colaborador ou colaborador não encontrado', False
         except Exception as e:
             logging.error(f"Erro ao atualizar colaborador: {e}")
             return None
 
-    def delete_employee(self, employee_id: int):
+    def delete_employee(self, employee_id: int, expected_etags=None):
         """
         Exclui um colaborador do sistema.
 
         Verifica primeiro se o colaborador existe. Se existir, tenta excluí-lo e retorna uma mensagem de sucesso.
-        Se não existir ou ocorrer um erro durante a exclusão, retorna uma mensagem de erro.
+        Se não existir ou ocorrer um erro durante a exclusão, retorna uma mensagem de erro. Com `expected_etags`
+        (If-Match), o colaborador só é excluído se ainda estiver na versão que o cliente leu.
 
         Args:
             employee_id (int): ID do colaborador a ser excluído.
+            expected_etags (set of str, optional): ETags aceitos pelo cliente; None para excluir sem condição.
 
         Returns:
             tuple: (message, success) indicando o resultado da operação.
@@ -105,8 +388,16 @@ class EmployeeService:
             if not employee:
                 return 'Colaborador não encontrado', False
 
-            if self.repository.delete_employee(employee_id):
+            expected_version = None
+            if expected_etags is not None:
+                if self.employee_etag(employee) not in expected_etags:
+                    return 'Colaborador alterado por outra requisição', False
+                expected_version = employee['version']
+
+            if self.repository.delete_employee(employee_id, expected_version):
                 return 'Colaborador excluído com sucesso', True
+            elif expected_version is not None and self._version_changed(employee_id, expected_version):
+                return 'Colaborador alterado por outra requisição', False
             else:
                 return 'Erro ao excluir o colaborador', False
         except Exception as e:
@@ -128,7 +419,8 @@ class EmployeeService:
                 (message, success) se não encontrado ou erro.
         """
         try:
-            employee_data = self.repository.get_employee_by_id(employee_id)
+            employee_data = self.cache.get_or_load(f'employee:{employee_id}',
+                                                   lambda: self.repository.get_employee_by_id(employee_id))
             if employee_data:
                 return employee_data, True
             else:
@@ -138,3 +430,52 @@ class EmployeeService:
             return 'Erro interno ao buscar o colaborador', False
         
 
+    def get_employee_etag(self, employee_id: int):
+        """
+        Retorna o ETag atual de um colaborador, consultando apenas as versões (sem carregar o colaborador).
+
+        Args:
+            employee_id (int): ID do colaborador.
+
+        Returns:
+            str or None: O ETag do colaborador, ou None se ele não for encontrado.
+        """
+        versions = self.repository.get_employee_versions(employee_id)
+        return self.etag(*versions) if versions is not None else None
+
+    def employee_etag(self, employee_data: dict):
+        """Retorna o ETag dos dados de colaborador retornados por get_employee_by_id."""
+        return self.etag(employee_data['version'], employee_data['department']['version'])
+
+    @staticmethod
+    def etag(version: int, department_version: int):
+        """
+        Monta o ETag de um colaborador.
+
+        A resposta inclui o nome do departamento, então o ETag combina a versão do colaborador com a
+        do departamento: renomear o departamento também invalida as cópias do colaborador.
+        """
+        return f'{version}.{department_version}'
+
+    def _version_changed(self, employee_id: int, expected_version: int):
+        versions = self.repository.get_employee_versions(employee_id)
+        return versions is not None and versions[0] != expected_version
+
+    def _on_caches_flush(self, sender, **kwargs):
+        self.cache.clear()
+
+    def _on_employee_changed(self, action, items=(), department_ids=(), **kwargs):
+        self.cache.delete(*[f'employee:{employee_id}' for employee_id, name in items],
+                          *[f'employees:department:{department_id}' for department_id in department_ids])
+        for department_id in department_ids:
+            self.cache.delete_prefix(f'employees:department:{department_id}:')
+
+    def _on_department_changed(self, action, items=(), **kwargs):
+        if action == 'created':
+            return
+        # Os dados do colaborador incluem o nome e a versão do departamento
+        self.cache.delete_prefix('employee:')
+        if action == 'deleted':
+            self.cache.delete(*[f'employees:department:{department_id}' for department_id, name in items])
+            for department_id, name in items:
+                self.cache.delete_prefix(f'employees:department:{department_id}:')
@@ -0,0 +1,164 @@
+from ..repositories.export_repository import EXPORT_COLUMNS
+import csv
+import io
+import logging
+import os
+import time
+
+
+class ExportService:
+    def __init__(self, repository):
+        self.repository = repository
+
+    def stream_csv(self, batch_size: int = 1000):
+        """
+        Gera a exportação completa da organização em CSV, um pedaço por lote lido do banco.
+
+        O cabeçalho é emitido primeiro e cada lote vira um único pedaço de texto, para que a resposta
+        HTTP seja escrita incrementalmente sem manter o arquivo inteiro em memória.
+
+        Args:
+            batch_size (int): Quantidade de linhas buscadas do banco por vez.
+
+        Yields:
+            str: Trechos do arquivo CSV.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+        for batch in self.repository.iter_batches(batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue()
+
+    def write_csv(self, path: str, batch_size: int = 1000, progress=None):
+        """
+        Grava a exportação completa em um arquivo CSV.
+
+        Args:
+            path (str): Caminho do arquivo de saída.
+            batch_size (int): Quantidade de linhas buscadas do banco por vez.
+            progress (callable, optional): Chamada com o total de linhas já escritas, a cada lote. Com ela, os
+                lotes são lidos por página (iter_pages) e a chamada pode confirmar a transação da sessão.
+
+        Returns:
+            dict: Quantidade de linhas, duração em segundos e linhas por segundo.
+        """
+        started = time.perf_counter()
+        rows = 0
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            writer = csv.writer(output)
+            writer.writerow(EXPORT_COLUMNS)
+            for batch in self._batches(batch_size, progress):
+                writer.writerows(batch)
+                rows += len(batch)
+                if progress is not None:
+                    progress(rows)
+        return self._report(rows, started)
+
+    def write_parquet(self, path: str, batch_size: int = 1000, row_group_size: int = 50000, progress=None):
+        """
+        Grava a exportação completa em um arquivo Parquet, um row group por vez.
+
+        As linhas lidas do banco são acumuladas até `row_group_size` e então escritas como um row
+        group, de forma que a memória fica limitada a um row group independentemente do total.
+        Requer o pacote opcional pyarrow.
+
+        Args:
+            path (str): Caminho do arquivo de saída.
+            batch_size (int): Quantidade de linhas buscadas do banco por vez.
+            row_group_size (int): Quantidade de linhas por row group.
+            progress (callable, optional): Chamada com o total de linhas já escritas, a cada row group; como
+                em write_csv, os lotes passam a ser lidos por página.
+
+        Returns:
+            dict: Quantidade de linhas, duração em segundos e linhas por segundo.
+
+        Raises:
+            RuntimeError: Se o pyarrow não estiver instalado.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('A exportação em Parquet requer o pacote pyarrow (pip install pyarrow)')
+
+        schema = pa.schema([
+            ('entity', pa.string()),
+            ('id', pa.int64()),
+            ('name', pa.string()),
+            ('department_id', pa.int64()),
+            ('employee_id', pa.int64()),
+        ])
+
+        started = time.perf_counter()
+        rows = 0
+        pending = []
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in self._batches(batch_size, progress):
+                pending.extend(batch)
+                if len(pending) >= row_group_size:
+                    writer.write_table(self._to_table(pa, schema, pending), row_group_size=row_group_size)
+                    rows += len(pending)
+                    pending = []
+                    if progress is not None:
+                        progress(rows)
+            if pending:
+                writer.write_table(self._to_table(pa, schema, pending), row_group_size=row_group_size)
+                rows += len(pending)
+        return self._report(rows, started)
+
+    def export_file(self, job):
+        """
+        Tarefa de fundo que grava a exportação completa em um arquivo, informando o progresso a cada lote.
+
+        `job.params` traz 'format' ('csv' ou 'parquet'), 'output_dir' e 'batch_size'. O arquivo é
+        `<output_dir>/<job id>.<format>`; uma tarefa cancelada ou que falhou não deixa arquivo parcial, e uma
+        retomada após uma queda recomeça a exportação do início.
+
+        Args:
+            job (JobContext): A tarefa em execução.
+
+        Returns:
+            dict: Nome do arquivo, quantidade de linhas, duração em segundos e linhas por segundo.
+        """
+        output_format = job.params['format']
+        os.makedirs(job.params['output_dir'], exist_ok=True)
+        filename = f'{job.id}.{output_format}'
+        path = os.path.join(job.params['output_dir'], filename)
+
+        job.report(0, total=self.repository.count_rows())
+        write = self.write_parquet if output_format == 'parquet' else self.write_csv
+        try:
+            report = write(path, job.params['batch_size'], progress=job.report)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return {'file': filename, **report}
+
+    def _batches(self, batch_size: int, progress):
+        if progress is not None:
+            return self.repository.iter_pages(batch_size)
+        return self.repository.iter_batches(batch_size)
+
+    @staticmethod
+    def _to_table(pa, schema, rows):
+        columns = list(zip(*rows))
+        return pa.Table.from_arrays([pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                                    schema=schema)
+
+    @staticmethod
+    def _report(rows: int, started: float):
+        elapsed = time.perf_counter() - started
+        report = {
+            'rows': rows,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(rows / elapsed) if elapsed > 0 else rows
+        }
+        logging.info(f"Exportação concluída: {report['rows']} linhas em {report['seconds']}s "
+                     f"({report['rows_per_second']} linhas/s)")
+        return report
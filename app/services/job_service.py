@@ -0,0 +1,223 @@
+from ..repositories import JobLeaseLost
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+import os
+import time
+
+
+class JobCancelled(Exception):
+    """Levantada por JobContext quando o cancelamento da tarefa foi solicitado."""
+
+
+class JobContext:
+    """
+    O que uma tarefa em execução recebe: os parâmetros, o progresso já confirmado e os pontos de progresso.
+
+    Tarefas longas devem chamar `report` (ou `checkpoint`, dentro da transação do lote) a cada lote: é o
+    que mantém o batimento da tarefa e onde um pedido de cancelamento é atendido.
+    """
+
+    def __init__(self, repository, job: dict):
+        self.repository = repository
+        self.id = job['id']
+        self.attempt = job['attempts']
+        self.params = job['params']
+        self.progress = job['progress']
+        self.result = job['result']
+
+    def report(self, progress: int, total: int = None, result: dict = None):
+        """Grava o progresso em uma transação própria; levanta JobCancelled se o cancelamento foi pedido."""
+        if self._update(progress, total, result, commit=True):
+            raise JobCancelled()
+
+    def checkpoint(self, progress: int, total: int = None, result: dict = None):
+        """
+        Como `report`, mas sem commit e sem levantar JobCancelled: o progresso é confirmado junto com o lote
+        da transação corrente (ou desfeito com ele). O cancelamento é atendido no próximo `report`.
+        """
+        self._update(progress, total, result, commit=False)
+
+    def _update(self, progress, total, result, commit):
+        self.progress = progress
+        if result is not None:
+            self.result = result
+        return self.repository.checkpoint(self.id, self.attempt, progress, total, result, commit=commit)
+
+
+class JobService:
+    """
+    Executa em segundo plano as operações longas demais para uma requisição síncrona (importações, exportações).
+
+    Cada tarefa é registrada na tabela job e executada por um pool de JOB_MAX_WORKERS threads do processo; a
+    requisição recebe o ID e acompanha o progresso em GET /jobs/<id>. No máximo JOB_MAX_ACTIVE tarefas ficam
+    pendentes ou em execução ao mesmo tempo, somando todos os processos.
+
+    Na inicialização, tarefas em execução sem batimento há JOB_STALE_SECONDS (o processo que as executava
+    caiu) voltam para a fila e são retomadas do último progresso confirmado, até JOB_MAX_ATTEMPTS tentativas.
+    Se o processo não tinha caído (só demorou a informar o progresso), a execução antiga perde a tarefa: o
+    próximo ponto de progresso levanta JobLeaseLost e ela para sem gravar o lote nem o status final.
+
+    Os arquivos das exportações são removidos JOB_OUTPUT_RETENTION_SECONDS depois de a tarefa terminar: na
+    inicialização e, depois, a cada PURGE_INTERVAL_SECONDS, ao fim de uma tarefa.
+    """
+
+    PURGE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.handlers = {}
+        self.app = None
+        self._executor = None
+        self._next_purge = 0
+
+    def register(self, kind: str, handler):
+        """
+        Registra a função que executa um tipo de tarefa.
+
+        Args:
+            kind (str): Tipo da tarefa.
+            handler (callable): Recebe um JobContext e retorna o resultado da tarefa (dict serializável em JSON).
+        """
+        self.handlers[kind] = handler
+
+    def init_app(self, app):
+        # A última aplicação criada no processo é a que executa as tarefas
+        self.shutdown()
+        if not app.config.get('JOBS_ENABLED', False):
+            return
+
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=app.config['JOB_MAX_WORKERS'], thread_name_prefix='job')
+        app.extensions['job_service'] = self
+
+        with app.app_context():
+            stale_before = datetime.utcnow() - timedelta(seconds=app.config['JOB_STALE_SECONDS'])
+            pending = self.repository.recover(stale_before, app.config['JOB_MAX_ATTEMPTS'])
+            self.purge_files()
+            self.repository.db.session.remove()
+        for job_id in pending or []:
+            self._executor.submit(self._run, job_id)
+
+    def shutdown(self, wait: bool = True):
+        """Encerra o pool; tarefas em execução terminam, e as que estiverem na fila são retomadas no próximo início."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def purge_files(self):
+        """
+        Remove os arquivos de exportação mais antigos que JOB_OUTPUT_RETENTION_SECONDS, marcando as tarefas.
+
+        Returns:
+            int: Quantidade de arquivos expirados.
+        """
+        self._next_purge = time.monotonic() + self.PURGE_INTERVAL_SECONDS
+        finished_before = datetime.utcnow() - timedelta(seconds=self.app.config['JOB_OUTPUT_RETENTION_SECONDS'])
+        paths = self.repository.expire_files(finished_before)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Erro ao remover o arquivo expirado {path}: {e}")
+        return len(paths)
+
+    def submit(self, kind: str, params: dict):
+        """
+        Registra uma tarefa e a coloca na fila de execução.
+
+        Args:
+            kind (str): Tipo da tarefa, registrado com `register`.
+            params (dict): Parâmetros da tarefa, serializáveis em JSON.
+
+        Returns:
+            tuple: (job_id, message) se a tarefa foi aceita; (None, message) se as tarefas estiverem
+                desativadas, a fila estiver cheia ou em caso de falha.
+        """
+        if self._executor is None:
+            return None, 'Tarefas em segundo plano desativadas'
+
+        try:
+            if self.repository.count_active() >= self.app.config['JOB_MAX_ACTIVE']:
+                return None, 'Fila de tarefas cheia'
+            job_id = self.repository.create_job(kind, params)
+            if job_id is None:
+                return None, 'Erro ao registrar a tarefa'
+            self._executor.submit(self._run, job_id)
+            return job_id, 'Tarefa aceita'
+        except Exception as e:
+            logging.error(f"Erro ao enfileirar a tarefa {kind}: {e}")
+            return None, 'Erro ao registrar a tarefa'
+
+    def get_job(self, job_id: str):
+        """
+        Busca o estado de uma tarefa.
+
+        Returns:
+            dict or None: Status, progresso e resultado da tarefa; None se ela não existir ou em caso de falha.
+        """
+        try:
+            job = self.repository.get_job(job_id)
+            if job is None:
+                return None
+            job.pop('params')
+            for field in ('created_at', 'started_at', 'finished_at'):
+                if job[field] is not None:
+                    job[field] = job[field].isoformat()
+            return job
+        except Exception as e:
+            logging.error(f"Erro ao buscar a tarefa {job_id}: {e}")
+            return None
+
+    def cancel_job(self, job_id: str):
+        """
+        Cancela uma tarefa pendente ou pede o cancelamento de uma em execução.
+
+        Returns:
+            tuple: (status, message) com o status após o pedido; (None, message) se a tarefa não existir. A
+                mensagem 'Tarefa já encerrada' indica que nada foi alterado.
+        """
+        cancelled = self.repository.cancel(job_id)
+        if cancelled is None:
+            return None, 'Tarefa não encontrada'
+        status, changed = cancelled
+        if not changed:
+            return status, 'Tarefa já encerrada'
+        if status == 'running':
+            return status, 'Cancelamento solicitado'
+        return status, 'Tarefa cancelada'
+
+    def _run(self, job_id: str):
+        with self.app.app_context():
+            session = self.repository.db.session
+            job = context = None
+            try:
+                job = self.repository.claim(job_id)
+                if job is None:
+                    return
+                handler = self.handlers.get(job['kind'])
+                if handler is None:
+                    self.repository.finish(job_id, job['attempts'], 'failed',
+                                           error=f"Tipo de tarefa desconhecido: {job['kind']}")
+                    return
+
+                context = JobContext(self.repository, job)
+                result = handler(context)
+                self.repository.finish(job_id, job['attempts'], 'succeeded', result=result)
+            except JobCancelled:
+                session.rollback()
+                self.repository.finish(job_id, job['attempts'], 'cancelled', result=context.result)
+            except JobLeaseLost:
+                session.rollback()
+                logging.warning(f"Tarefa {job_id} assumida por outra execução; esta execução foi encerrada")
+            except Exception as e:
+                session.rollback()
+                logging.error(f"Erro ao executar a tarefa {job_id}: {e}")
+                if job is not None:
+                    self.repository.finish(job_id, job['attempts'], 'failed', error=str(e))
+            finally:
+                if time.monotonic() >= self._next_purge:
+                    self.purge_files()
+                session.remove()
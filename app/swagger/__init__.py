@@ -1,2 +1,45 @@
-from .docstrings_departament import DepartmentDocstrings
-from .docstrings_employee import EmployeeDocstrings
\ No newline at end of file
+from importlib import import_module
+
+
+# As docstrings do Swagger só são importadas quando a documentação é gerada (/swagger), não na inicialização
+_DOCSTRING_MODULES = {
+    'DepartmentDocstrings': 'docstrings_departament',
+    'EmployeeDocstrings': 'docstrings_employee',
+    'AutocompleteDocstrings': 'docstrings_autocomplete',
+    'ExportDocstrings': 'docstrings_export',
+    'ChangeFeedDocstrings': 'docstrings_changes',
+    'JobDocstrings': 'docstrings_jobs',
+}
+
+_registered = []
+
+
+def register_docstrings(class_name: str, views: dict):
+    """
+    Registra quais docstrings do Swagger pertencem a quais rotas, sem importá-las.
+
+    Args:
+        class_name (str): Nome da classe de docstrings (ex.: 'DepartmentDocstrings').
+        views (dict): View function -> nome do atributo da classe com a docstring da rota.
+    """
+    _registered.append((class_name, views))
+
+
+def attach_docstrings():
+    """Importa as classes de docstrings e as aplica nas rotas registradas; chamada antes de gerar o Swagger."""
+    for class_name, views in _registered:
+        docstrings = load_docstrings(class_name)
+        for view, attribute in views.items():
+            view.__doc__ = getattr(docstrings, attribute)
+
+
+def load_docstrings(class_name: str):
+    """Importa e retorna uma classe de docstrings pelo nome."""
+    return getattr(import_module(f'.{_DOCSTRING_MODULES[class_name]}', __name__), class_name)
+
+
+def __getattr__(name):
+    # Mantém `from app.swagger import DepartmentDocstrings` funcionando, importando sob demanda
+    if name in _DOCSTRING_MODULES:
+        return load_docstrings(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+class AutocompleteDocstrings:
+    """Documentation for endpoints."""
+
+    autocomplete_departments = """
+    Sugere departamentos pelo prefixo do nome (autocompletar).
+    ---
+    tags:
+      - Autocompletar
+    parameters:
+      - name: prefixo
+        in: query
+        type: string
+        required: true
+        description: Início do nome do departamento. Acentos e maiúsculas são ignorados.
+      - name: limite
+        in: query
+        type: integer
+        required: false
+        description: Quantidade máxima de sugestões (padrão 10, máximo 50).
+    responses:
+      200:
+        description: Departamentos cujo nome começa com o prefixo, em ordem alfabética.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: integer
+                example: 1
+              name:
+                type: string
+                example: "Recursos Humanos"
+      400:
+        description: Prefixo não informado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "O prefixo é obrigatório"
+      500:
+        description: Erro interno ao processar a solicitação.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Erro interno do servidor"
+    """
+
+    autocomplete_employees = """
+    Sugere colaboradores pelo prefixo do nome (autocompletar).
+    ---
+    tags:
+      - Autocompletar
+    parameters:
+      - name: prefixo
+        in: query
+        type: string
+        required: true
+        description: Início do nome do colaborador. Acentos e maiúsculas são ignorados.
+      - name: limite
+        in: query
+        type: integer
+        required: false
+        description: Quantidade máxima de sugestões (padrão 10, máximo 50).
+    responses:
+      200:
+        description: Colaboradores cujo nome começa com o prefixo, em ordem alfabética.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: integer
+                example: 1
+              name:
+                type: string
+                example: "Tiago Oliveira"
+      400:
+        description: Prefixo não informado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "O prefixo é obrigatório"
+      500:
+        description: Erro interno ao processar a solicitação.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Erro interno do servidor"
+    """
+
+    autocomplete_memory = """
+    Informa o consumo de memória dos índices de autocompletar.
+    ---
+    tags:
+      - Autocompletar
+    responses:
+      200:
+        description: Quantidade de entradas e bytes estimados de cada índice.
+        schema:
+          type: object
+          properties:
+            departments:
+              type: object
+              properties:
+                entries:
+                  type: integer
+                  example: 12
+                bytes:
+                  type: integer
+                  example: 2048
+            employees:
+              type: object
+              properties:
+                entries:
+                  type: integer
+                  example: 350
+                bytes:
+                  type: integer
+                  example: 61440
+            total_bytes:
+              type: integer
+              example: 63488
+    """
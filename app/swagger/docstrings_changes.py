@@ -0,0 +1,73 @@
+class ChangeFeedDocstrings:
+    """Documentation for endpoints."""
+
+    list_changes = """
+    Lista as alterações de departamentos e colaboradores para sincronização incremental.
+    ---
+    tags:
+      - Alterações
+    parameters:
+      - name: since
+        in: query
+        type: integer
+        required: false
+        description: Última sequência já processada pelo cliente (padrão 0, desde o início).
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Quantidade máxima de alterações (padrão 100, máximo 1000).
+    responses:
+      200:
+        description: Alterações com sequência maior que since, em ordem crescente.
+        schema:
+          type: object
+          properties:
+            changes:
+              type: array
+              items:
+                type: object
+                properties:
+                  seq:
+                    type: integer
+                    example: 42
+                  entity:
+                    type: string
+                    enum: [department, employee]
+                    example: employee
+                  entity_id:
+                    type: integer
+                    example: 7
+                  action:
+                    type: string
+                    enum: [created, updated, deleted]
+                    example: updated
+                  changed_at:
+                    type: string
+                    format: date-time
+                    example: "2024-05-10T14:32:00"
+            next_since:
+              type: integer
+              description: Valor a ser usado como since na próxima chamada.
+              example: 42
+            has_more:
+              type: boolean
+              description: Indica se ainda há alterações além do limite.
+              example: false
+      400:
+        description: Parâmetros inválidos.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "since deve ser >= 0 e limit deve estar entre 1 e 1000"
+      410:
+        description: As alterações após since já foram compactadas; é necessária uma sincronização completa.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Histórico compactado, faça uma sincronização completa"
+    """
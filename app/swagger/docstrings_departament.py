@@ -20,6 +20,13 @@ class DepartmentDocstrings:
             name:
               type: string
               description: Nome do departamento a ser criado.
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem cadastrar novamente.
     responses:
       201:
         description: Departamento criado com sucesso.
@@ -48,6 +55,14 @@ class DepartmentDocstrings:
             error:
               type: string
               example: Departamento já existe.
+      422:
+        description: Idempotency-Key já utilizada com outra requisição.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Idempotency-Key já utilizada com outra requisição
       500:
         description: Erro interno do servidor ao tentar criar o departamento.
         schema:
@@ -63,9 +78,16 @@ class DepartmentDocstrings:
     ---
     tags:
       - Departamentos
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [columnar]
+        description: 'Com "columnar", retorna uma lista por campo em vez de um objeto por departamento, sem repetir as chaves.'
     responses:
       200:
-        description: Uma lista de todos os departamentos cadastrados.
+        description: 'Uma lista de todos os departamentos cadastrados (ou, com format=columnar, um objeto {"id": [...], "name": [...]}).'
         schema:
           type: array
           items:
@@ -79,6 +101,14 @@ class DepartmentDocstrings:
                 type: string
                 description: O nome do departamento.
                 example: "Recursos Humanos"
+      400:
+        description: Valor inválido para o parâmetro format.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Formato inválido, use format=columnar"
       500:
         description: Erro ao recuperar os departamentos do banco de dados.
         schema:
@@ -89,6 +119,51 @@ class DepartmentDocstrings:
               example: "Erro ao recuperar departamentos!"
     """
 
+    get_department_stats = """
+    Lista as estatísticas de cada departamento.
+    ---
+    tags:
+      - Departamentos
+    responses:
+      200:
+        description: Quantidade de colaboradores e dependentes por departamento, lida de um resumo mantido a cada escrita.
+        schema:
+          type: array
+          items:
+            type: object
+            properties:
+              id:
+                type: integer
+                example: 1
+              name:
+                type: string
+                example: "Recursos Humanos"
+              employee_count:
+                type: integer
+                description: Quantidade de colaboradores do departamento.
+                example: 10
+              dependent_count:
+                type: integer
+                description: Quantidade de dependentes dos colaboradores do departamento.
+                example: 7
+              employees_with_dependents:
+                type: integer
+                description: Quantidade de colaboradores que possuem ao menos um dependente.
+                example: 4
+              dependents_share:
+                type: number
+                description: Proporção de colaboradores com dependentes (0 a 1).
+                example: 0.4
+      500:
+        description: Erro ao recuperar as estatísticas do banco de dados.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Erro ao recuperar estatísticas dos departamentos!"
+    """
+
     update_departments =  """
     Atualiza os dados de um departamento existente.
     ---
@@ -112,6 +187,11 @@ class DepartmentDocstrings:
               type: string
               description: Novo nome do departamento.
               required: true
+      - in: header
+        name: If-Match
+        type: string
+        required: false
+        description: ETag lido anteriormente; a operação só é feita se o departamento ainda estiver nessa versão.
     responses:
       200:
         description: Nome do departamento atualizado com sucesso.
@@ -140,6 +220,14 @@ class DepartmentDocstrings:
             error:
               type: string
               example: Nome de departamento já existe.
+      412:
+        description: O departamento foi alterado por outra requisição desde a leitura (If-Match não corresponde).
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Departamento alterado por outra requisição"
       500:
         description: Erro interno ao tentar atualizar o departamento.
         schema:
@@ -161,6 +249,11 @@ class DepartmentDocstrings:
         type: integer
         required: true
         description: Identificador único do departamento a ser excluído.
+      - in: header
+        name: If-Match
+        type: string
+        required: false
+        description: ETag lido anteriormente; a operação só é feita se o departamento ainda estiver nessa versão.
     responses:
       200:
         description: Departamento excluído com sucesso.
@@ -178,6 +271,14 @@ class DepartmentDocstrings:
             error:
               type: string
               example: Departamento não encontrado.
+      412:
+        description: O departamento foi alterado por outra requisição desde a leitura (If-Match não corresponde).
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Departamento alterado por outra requisição"
       500:
         description: Erro interno ao excluir o departamento.
         schema:
@@ -188,6 +289,96 @@ class DepartmentDocstrings:
               example: Erro ao tentar excluir o departamento.
     """
 
+    merge_department = """
+    Mescla um departamento em outro, movendo todos os seus colaboradores e excluindo-o em uma única transação.
+    ---
+    tags:
+      - Departamentos
+    consumes:
+      - application/json
+    parameters:
+      - in: path
+        name: department_id
+        type: integer
+        required: true
+        description: Identificador do departamento de origem, que será excluído.
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - target_department_id
+          properties:
+            target_department_id:
+              type: integer
+              description: Departamento que recebe os colaboradores.
+      - in: header
+        name: If-Match
+        type: string
+        required: false
+        description: ETag lido anteriormente; a operação só é feita se o departamento de origem ainda estiver nessa versão.
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem mesclar novamente.
+    responses:
+      200:
+        description: Departamentos mesclados com sucesso.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Departamentos mesclados com sucesso
+            moved_employees:
+              type: integer
+              example: 42
+      400:
+        description: Departamento de destino não informado ou igual ao de origem.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: target_department_id é obrigatório
+      404:
+        description: Departamento de origem não encontrado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Departamento não encontrado
+      412:
+        description: O departamento de origem foi alterado por outra requisição desde a leitura (If-Match não corresponde).
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Departamento alterado por outra requisição"
+      422:
+        description: Departamento de destino não encontrado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Departamento de destino não encontrado
+      500:
+        description: Erro interno ao mesclar os departamentos.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Erro ao mesclar os departamentos
+    """
+
     get_department_by_id = """
     Busca um departamento pelo seu identificador único.
     ---
@@ -199,6 +390,11 @@ class DepartmentDocstrings:
         type: integer
         required: true
         description: Identificador único do departamento.
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+        description: ETag de uma cópia em cache; se o departamento não mudou, a resposta é 304 sem corpo.
     responses:
       200:
         description: Departamento encontrado com sucesso.
@@ -211,6 +407,12 @@ class DepartmentDocstrings:
             name:
               type: string
               example: "Recursos Humanos"
+            version:
+              type: integer
+              description: Versão do departamento, incrementada a cada alteração (também enviada no cabeçalho ETag).
+              example: 1
+      304:
+        description: O departamento não mudou desde o ETag informado em If-None-Match.
       404:
         description: Departamento não encontrado.
         schema:
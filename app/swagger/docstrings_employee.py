@@ -29,6 +29,13 @@ class EmployeeDocstrings:
               items:
                 type: string
               description: Lista de nomes de dependentes do colaborador (opcional).
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem cadastrar novamente.
     responses:
       201:
         description: Colaborador cadastrado com sucesso.
@@ -57,6 +64,14 @@ class EmployeeDocstrings:
             error:
               type: string
               example: Colaborador já existe.
+      422:
+        description: Departamento não encontrado, ou Idempotency-Key já utilizada com outra requisição.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Idempotency-Key já utilizada com outra requisição
       500:
         description: Erro interno do servidor.
         schema:
@@ -67,6 +82,174 @@ class EmployeeDocstrings:
               example: Erro interno no servidor ao tentar adicionar colaborador.
     """
 
+    move_employees = """
+    Move vários colaboradores para outro departamento em uma única transação.
+    ---
+    tags:
+      - Colaboradores
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: >
+          Informe employee_ids ou filter (não os dois). O departamento de destino é validado uma só vez.
+        schema:
+          type: object
+          required:
+            - target_department_id
+          properties:
+            target_department_id:
+              type: integer
+              description: ID do departamento de destino.
+            employee_ids:
+              type: array
+              items:
+                type: integer
+              description: IDs dos colaboradores a mover (no máximo BULK_MAX_IDS).
+            filter:
+              type: object
+              description: Seleciona os colaboradores de um departamento de origem.
+              required:
+                - department_id
+              properties:
+                department_id:
+                  type: integer
+                have_dependents:
+                  type: boolean
+                name_prefix:
+                  type: string
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem mover novamente.
+    responses:
+      200:
+        description: Colaboradores movidos.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Colaboradores movidos com sucesso
+            moved:
+              type: array
+              items:
+                type: integer
+              description: IDs movidos para o departamento de destino.
+            unchanged:
+              type: array
+              items:
+                type: integer
+              description: IDs que já estavam no departamento de destino.
+            not_found:
+              type: array
+              items:
+                type: integer
+              description: IDs informados que não existem.
+      400:
+        description: Corpo da requisição inválido.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Informe employee_ids ou filter
+      422:
+        description: Departamento de destino não encontrado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Departamento não encontrado
+      500:
+        description: Erro interno do servidor.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Erro ao mover colaboradores
+    """
+
+    import_employees = """
+    Importa uma lista de colaboradores em segundo plano.
+    ---
+    tags:
+      - Colaboradores
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - employees
+          properties:
+            employees:
+              type: array
+              description: Colaboradores no formato do cadastro (no máximo JOB_IMPORT_MAX_ITEMS).
+              items:
+                type: object
+                required:
+                  - name
+                  - department_id
+                properties:
+                  name:
+                    type: string
+                  department_id:
+                    type: integer
+                  dependents:
+                    type: array
+                    items:
+                      type: string
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem criar outra tarefa.
+    responses:
+      202:
+        description: Importação aceita; o progresso e o resultado ficam em GET /jobs/<job_id> (cabeçalho Location).
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Tarefa aceita
+            job_id:
+              type: string
+              example: 3f2c9a0e5b7d4c1e8a6f0b2d4e6a8c0e
+            status_url:
+              type: string
+              example: /jobs/3f2c9a0e5b7d4c1e8a6f0b2d4e6a8c0e
+      400:
+        description: Corpo da requisição inválido.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: 'Colaborador 3: nome e departamento são obrigatórios'
+      503:
+        description: Fila de tarefas cheia (JOB_MAX_ACTIVE) ou tarefas em segundo plano desativadas.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Fila de tarefas cheia
+    """
+
     get_employees_by_department = """
     Lista todos os colaboradores de um departamento específico.
     ---
@@ -78,9 +261,51 @@ class EmployeeDocstrings:
         type: integer
         required: true
         description: Identificador único do departamento do qual os colaboradores serão listados.
+      - name: format
+        in: query
+        type: string
+        required: false
+        enum: [columnar]
+        description: 'Com "columnar", retorna uma lista por campo em vez de um objeto por colaborador, sem repetir as chaves.'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        minimum: 1
+        maximum: 1000
+        description: Tamanho da página (padrão 100). Com qualquer parâmetro de paginação, ordenação ou filtro, a resposta é paginada.
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: Valor do cabeçalho X-Next-Cursor da página anterior.
+      - name: sort
+        in: query
+        type: string
+        required: false
+        enum: [id, name]
+        description: Ordenação da página (padrão id).
+      - name: have_dependents
+        in: query
+        type: string
+        required: false
+        enum: ["true", "false"]
+        description: Filtra colaboradores com ou sem dependentes.
+      - name: name_prefix
+        in: query
+        type: string
+        required: false
+        description: Filtra colaboradores cujo nome começa com o valor informado.
     responses:
       200:
-        description: Lista de colaboradores encontrada com sucesso.
+        description: 'Lista de colaboradores encontrada com sucesso (ou, com format=columnar, um objeto {"id": [...], "name": [...], "have_dependents": [...]}).'
+        headers:
+          X-Total-Count:
+            type: integer
+            description: Nas respostas paginadas, total de colaboradores que atendem aos filtros.
+          X-Next-Cursor:
+            type: string
+            description: Nas respostas paginadas, cursor da próxima página (ausente na última).
         schema:
           type: array
           items:
@@ -106,6 +331,14 @@ class EmployeeDocstrings:
             error:
               type: string
               example: "Nenhum colaborador encontrado"
+      400:
+        description: Valor inválido para format, limit, cursor, sort ou have_dependents.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Formato inválido, use format=columnar"
       500:
         description: Erro ao acessar o banco de dados ou erro interno no servidor.
         schema:
@@ -146,6 +379,11 @@ class EmployeeDocstrings:
               items:
                 type: string
               description: Lista atualizada de nomes de dependentes.
+      - in: header
+        name: If-Match
+        type: string
+        required: false
+        description: ETag lido anteriormente; a operação só é feita se o colaborador ainda estiver nessa versão.
     responses:
       200:
         description: Colaborador atualizado com sucesso.
@@ -174,6 +412,22 @@ class EmployeeDocstrings:
             error:
               type: string
               example: 'Nome de colaborador já existe.'
+      422:
+        description: Novo departamento não encontrado.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: 'Departamento não encontrado'
+      412:
+        description: O colaborador foi alterado por outra requisição desde a leitura (If-Match não corresponde).
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Colaborador alterado por outra requisição"
       500:
         description: Erro interno ao tentar atualizar o colaborador.
         schema:
@@ -195,6 +449,11 @@ class EmployeeDocstrings:
         type: integer
         required: true
         description: Identificador único do colaborador que será excluído.
+      - in: header
+        name: If-Match
+        type: string
+        required: false
+        description: ETag lido anteriormente; a operação só é feita se o colaborador ainda estiver nessa versão.
     responses:
       200:
         description: Colaborador excluído com sucesso.
@@ -212,6 +471,14 @@ class EmployeeDocstrings:
             error:
               type: string
               example: 'Colaborador não encontrado.'
+      412:
+        description: O colaborador foi alterado por outra requisição desde a leitura (If-Match não corresponde).
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "Colaborador alterado por outra requisição"
       500:
         description: Erro interno ao tentar excluir o colaborador.
         schema:
@@ -222,6 +489,83 @@ class EmployeeDocstrings:
               example: 'Erro interno no servidor ao tentar excluir colaborador.'
     """
 
+    delete_employees = """
+    Exclui vários colaboradores, e os seus dependentes, em uma única transação.
+    ---
+    tags:
+      - Colaboradores
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: >
+          Informe employee_ids ou filter (não os dois).
+        schema:
+          type: object
+          properties:
+            employee_ids:
+              type: array
+              items:
+                type: integer
+              description: IDs dos colaboradores a excluir (no máximo BULK_MAX_IDS).
+            filter:
+              type: object
+              description: Seleciona os colaboradores de um departamento.
+              required:
+                - department_id
+              properties:
+                department_id:
+                  type: integer
+                have_dependents:
+                  type: boolean
+                name_prefix:
+                  type: string
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem excluir novamente.
+    responses:
+      200:
+        description: Colaboradores excluídos.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Colaboradores excluídos com sucesso
+            deleted:
+              type: array
+              items:
+                type: integer
+              description: IDs excluídos.
+            not_found:
+              type: array
+              items:
+                type: integer
+              description: IDs informados que não existem.
+      400:
+        description: Corpo da requisição inválido.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Informe employee_ids ou filter
+      500:
+        description: Erro interno do servidor.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Erro ao excluir colaboradores
+    """
+
     get_department =  """
     Busca um colaborador pelo seu identificador único.
     ---
@@ -233,6 +577,11 @@ class EmployeeDocstrings:
         type: integer
         required: true
         description: Identificador único do colaborador a ser consultado.
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+        description: ETag de uma cópia em cache; se o colaborador não mudou, a resposta é 304 sem corpo.
     responses:
       200:
         description: Detalhes do colaborador encontrado com sucesso.
@@ -248,6 +597,10 @@ class EmployeeDocstrings:
             department_id:
               type: integer
               example: 5
+            version:
+              type: integer
+              description: Versão do colaborador, incrementada a cada alteração. O ETag combina esta versão com a do departamento.
+              example: 1
             dependents:
               type: array
               items:
@@ -259,6 +612,8 @@ class EmployeeDocstrings:
                   name:
                     type: string
                     example: "Maria Silva"
+      304:
+        description: O colaborador não mudou desde o ETag informado em If-None-Match.
       404:
         description: Colaborador não encontrado.
         schema:
@@ -0,0 +1,93 @@
+class ExportDocstrings:
+    """Documentation for endpoints."""
+
+    export_csv = """
+    Exporta departamentos, colaboradores e dependentes em CSV.
+    ---
+    tags:
+      - Exportação
+    produces:
+      - text/csv
+    parameters:
+      - name: lote
+        in: query
+        type: integer
+        required: false
+        description: Quantidade de linhas lidas do banco por vez (padrão 1000, máximo 10000).
+    responses:
+      200:
+        description: >
+          Arquivo CSV enviado em streaming, com as colunas entity, id, name, department_id e employee_id.
+          entity indica o tipo da linha (department, employee ou dependent).
+      400:
+        description: Tamanho de lote inválido.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: "O tamanho do lote deve estar entre 1 e 10000"
+    """
+
+    export_job = """
+    Gera a exportação completa em um arquivo (CSV ou Parquet), em segundo plano.
+    ---
+    tags:
+      - Exportação
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            format:
+              type: string
+              enum: [csv, parquet]
+              default: csv
+              description: Formato do arquivo; parquet requer o pacote pyarrow.
+            lote:
+              type: integer
+              default: 1000
+              description: Linhas lidas do banco por vez (entre 1 e 10000).
+      - name: Idempotency-Key
+        in: header
+        type: string
+        required: false
+        description: >
+          Chave única da tentativa. Repetições com a mesma chave recebem a resposta original
+          (com o cabeçalho Idempotent-Replayed) sem criar outra tarefa.
+    responses:
+      202:
+        description: Exportação aceita; acompanhe em GET /jobs/<job_id> e baixe em GET /jobs/<job_id>/arquivo.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Tarefa aceita
+            job_id:
+              type: string
+              example: 3f2c9a0e5b7d4c1e8a6f0b2d4e6a8c0e
+            status_url:
+              type: string
+              example: /jobs/3f2c9a0e5b7d4c1e8a6f0b2d4e6a8c0e
+      400:
+        description: Formato ou tamanho de lote inválido.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Formato inválido, use csv ou parquet
+      503:
+        description: Fila de tarefas cheia (JOB_MAX_ACTIVE) ou tarefas em segundo plano desativadas.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Fila de tarefas cheia
+    """
@@ -0,0 +1,130 @@
+class JobDocstrings:
+    """Documentation for endpoints."""
+
+    get_job = """
+    Consulta o status e o progresso de uma tarefa de fundo (importação ou exportação).
+    ---
+    tags:
+      - Tarefas
+    parameters:
+      - in: path
+        name: job_id
+        type: string
+        required: true
+        description: ID retornado pela rota que criou a tarefa.
+    responses:
+      200:
+        description: Estado da tarefa.
+        schema:
+          type: object
+          properties:
+            id:
+              type: string
+            kind:
+              type: string
+              example: import_employees
+            status:
+              type: string
+              enum: [pending, running, succeeded, failed, cancelled]
+            progress:
+              type: integer
+              description: Itens já processados e confirmados.
+            total:
+              type: integer
+            result:
+              type: object
+              description: Resultado da tarefa (parcial enquanto ela executa).
+            error:
+              type: string
+            cancel_requested:
+              type: boolean
+            attempts:
+              type: integer
+              description: Execuções da tarefa; maior que 1 se ela foi retomada após uma queda.
+            created_at:
+              type: string
+            started_at:
+              type: string
+            finished_at:
+              type: string
+      404:
+        description: Tarefa não encontrada.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Tarefa não encontrada
+    """
+
+    cancel_job = """
+    Cancela uma tarefa de fundo.
+    ---
+    tags:
+      - Tarefas
+    parameters:
+      - in: path
+        name: job_id
+        type: string
+        required: true
+        description: ID da tarefa.
+    responses:
+      200:
+        description: Tarefa pendente cancelada.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Tarefa cancelada
+            status:
+              type: string
+              example: cancelled
+      202:
+        description: Tarefa em execução; ela para no próximo lote, mantendo o que já foi confirmado.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: Cancelamento solicitado
+            status:
+              type: string
+              example: running
+      404:
+        description: Tarefa não encontrada.
+      409:
+        description: Tarefa já encerrada.
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+              example: Tarefa já encerrada
+            status:
+              type: string
+              example: succeeded
+    """
+
+    download_job_file = """
+    Baixa o arquivo gerado por uma tarefa de exportação concluída.
+    ---
+    tags:
+      - Tarefas
+    produces:
+      - text/csv
+      - application/octet-stream
+    parameters:
+      - in: path
+        name: job_id
+        type: string
+        required: true
+        description: ID da tarefa de exportação.
+    responses:
+      200:
+        description: O arquivo exportado.
+      404:
+        description: Tarefa não encontrada.
+      409:
+        description: A tarefa ainda não terminou, falhou ou não gera arquivo.
+    """
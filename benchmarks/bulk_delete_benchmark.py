@@ -0,0 +1,87 @@
+"""
+Compara a exclusão de colaboradores um a um (como faz /colaborador/excluir/<id>) com a exclusão em lote
+(/colaborador/excluir_em_lote).
+
+Cria N colaboradores em um departamento (um terço deles com um dependente) em um banco SQLite temporário
+(ou no --database-uri informado, que deve estar vazio) e mede o tempo para excluir todos:
+
+- um a um: EmployeeService.delete_employee para cada ID (busca, exclusão e commit por colaborador);
+- em lote: EmployeeService.delete_employees com lotes de BULK_MAX_IDS IDs, como um cliente faria pela rota.
+
+    python benchmarks/bulk_delete_benchmark.py --rows 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, insert
+from app import create_app, db
+from app.models import Department, Employee, Dependent, DepartmentStats
+from app.repositories import EmployeeRepository
+from app.services.employee_service import EmployeeService
+
+
+def seed(rows):
+    db.session.execute(insert(Department), [{'name': 'Departamento'}])
+    department_id = db.session.execute(db.select(func.max(Department.id))).scalar()
+    db.session.execute(insert(Employee), [{'name': f'Colaborador {i:06d}', 'department_id': department_id}
+                                          for i in range(rows)])
+    first_employee = db.session.execute(db.select(func.min(Employee.id))).scalar()
+    db.session.execute(insert(Dependent), [{'name': f'Dependente {i:06d}', 'employee_id': first_employee + i}
+                                           for i in range(0, rows, 3)])
+    db.session.execute(insert(DepartmentStats), [{'department_id': department_id, 'employee_count': rows,
+                                                  'employees_with_dependents': (rows + 2) // 3,
+                                                  'dependent_count': (rows + 2) // 3}])
+    db.session.commit()
+    return list(range(first_employee, first_employee + rows))
+
+
+def one_by_one(service, ids, batch_size):
+    for employee_id in ids:
+        message, success = service.delete_employee(employee_id)
+        assert success, message
+
+
+def in_batches(service, ids, batch_size):
+    for start in range(0, len(ids), batch_size):
+        result, message = service.delete_employees(ids[start:start + batch_size])
+        assert result is not None, message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--database-uri', help='Banco vazio a ser usado no lugar do SQLite temporário.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = args.database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri, 'CACHE_ENABLED': False,
+                          'CACHE_NOTIFY_ENABLED': False, 'LOG_QUEUE_ENABLED': False})
+        with app.app_context():
+            service = EmployeeService(EmployeeRepository(db=db))
+            batch_size = app.config['BULK_MAX_IDS']
+
+            print(f'{args.rows} colaboradores')
+            print(f'{"exclusão":<10} {"s":>10} {"colaboradores/s":>16}')
+            for label, function in (('um a um', one_by_one), ('em lote', in_batches)):
+                db.drop_all()
+                db.create_all()
+                ids = seed(args.rows)
+                db.session.remove()
+
+                started = time.perf_counter()
+                function(service, ids, batch_size)
+                seconds = time.perf_counter() - started
+
+                assert db.session.execute(db.select(func.count(Employee.id))).scalar() == 0
+                print(f'{label:<10} {seconds:>10.2f} {args.rows / seconds:>16.0f}')
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
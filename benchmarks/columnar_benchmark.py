@@ -0,0 +1,75 @@
+"""
+Compara o formato padrão (um objeto por linha) com o formato colunar (?format=columnar) das listagens.
+
+Gera N linhas (id, name, have_dependents) como as retornadas pela consulta de colaboradores por
+departamento e mede, para cada formato, o tamanho do JSON (bruto e com gzip) e o tempo para montar a
+estrutura a partir das tuplas e serializá-la, como fazem os endpoints. Não precisa de banco de dados.
+
+    python benchmarks/columnar_benchmark.py --rows 10000 --repeat 20
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.repositories.columnar import rows_to_columns
+
+
+class Result:
+    """Imita o Result do SQLAlchemy: rótulos das colunas e as tuplas retornadas pelo banco."""
+
+    def __init__(self, names, rows):
+        self.names = names
+        self.rows = rows
+
+    def keys(self):
+        return self.names
+
+    def all(self):
+        return self.rows
+
+
+def as_rows(result):
+    return [{'id': id, 'name': name, 'have_dependents': have_dependents} for id, name, have_dependents in result.all()]
+
+
+def as_columns(result):
+    return rows_to_columns(result)
+
+
+def dumps(data):
+    # Mesmos separadores que o jsonify usa fora do modo debug
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def measure(build, result, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = dumps(build(result))
+        timings.append(time.perf_counter() - started)
+    return body, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [(i, f'Colaborador {i:06d}', i % 3 == 0) for i in range(1, args.rows + 1)]
+    result = Result(['id', 'name', 'have_dependents'], rows)
+
+    print(f'{args.rows} linhas, mediana de {args.repeat} execuções')
+    print(f'{"formato":<10} {"bytes":>10} {"gzip":>10} {"ms":>10}')
+    for label, build in (('linhas', as_rows), ('colunar', as_columns)):
+        body, seconds = measure(build, result, args.repeat)
+        print(f'{label:<10} {len(body):>10} {len(gzip.compress(body)):>10} {seconds * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Compara a leitura das listagens com objetos ORM (como era feito) e com tuplas do Core (como é feito agora).
+
+Cria N departamentos e N colaboradores em um único departamento (um terço deles com um dependente) em um
+banco SQLite temporário (ou no --database-uri informado, que deve estar vazio) e mede, para
+list_departments e get_employees_by_department, o tempo mediano e o pico de memória alocada
+(tracemalloc) para consultar e montar a lista de dicionários que a rota serializa.
+
+    python benchmarks/core_rows_benchmark.py --rows 100000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, insert
+from app import create_app, db
+from app.models import Department, Employee, Dependent
+from app.repositories import DepartamentRepository, EmployeeRepository
+
+
+def orm_departments():
+    return [{'id': d.id, 'name': d.name} for d in Department.query.order_by(Department.id).all()]
+
+
+def orm_employees(department_id):
+    employees = (db.session.query(Employee, func.count(Dependent.id).label('dependents_count'))
+                 .outerjoin(Dependent, Employee.id == Dependent.employee_id)
+                 .filter(Employee.department_id == department_id)
+                 .group_by(Employee.id)
+                 .all())
+    return [{'id': emp.Employee.id, 'name': emp.Employee.name, 'have_dependents': emp.dependents_count > 0}
+            for emp in employees]
+
+
+def seed(rows):
+    db.session.execute(insert(Department), [{'name': f'Departamento {i:06d}'} for i in range(rows)])
+    department_id = db.session.execute(db.select(func.min(Department.id))).scalar()
+    db.session.execute(insert(Employee), [{'name': f'Colaborador {i:06d}', 'department_id': department_id}
+                                          for i in range(rows)])
+    first_employee = db.session.execute(db.select(func.min(Employee.id))).scalar()
+    db.session.execute(insert(Dependent), [{'name': f'Dependente {i:06d}', 'employee_id': first_employee + i}
+                                           for i in range(0, rows, 3)])
+    db.session.commit()
+    return department_id
+
+
+def measure(function, repeat):
+    timings = []
+    peaks = []
+    for _ in range(repeat):
+        # Sessão nova a cada execução, como em cada requisição: o identity map não é reaproveitado
+        db.session.remove()
+        tracemalloc.start()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    # Sem o tracemalloc ligado, para que o tempo não inclua o custo do rastreamento
+    clean = []
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        function()
+        clean.append(time.perf_counter() - started)
+    return statistics.median(clean), max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database-uri', help='Banco vazio a ser usado no lugar do SQLite temporário.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = args.database_uri or f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri, 'CACHE_ENABLED': False,
+                          'CACHE_NOTIFY_ENABLED': False, 'LOG_QUEUE_ENABLED': False})
+        with app.app_context():
+            db.create_all()
+            department_id = seed(args.rows)
+            departments = DepartamentRepository(db=db)
+            employees = EmployeeRepository(db=db)
+
+            cases = (
+                ('departamentos', 'ORM', orm_departments),
+                ('departamentos', 'Core', departments.list_departments),
+                ('colaboradores', 'ORM', lambda: orm_employees(department_id)),
+                ('colaboradores', 'Core', lambda: employees.get_employees_by_department(department_id)),
+            )
+            print(f'{args.rows} linhas, mediana de {args.repeat} execuções')
+            print(f'{"listagem":<15} {"leitura":<8} {"ms":>10} {"pico MB":>10}')
+            for listing, label, function in cases:
+                seconds, peak = measure(function, args.repeat)
+                print(f'{listing:<15} {label:<8} {seconds * 1000:>10.1f} {peak / 1024 / 1024:>10.1f}')
+            db.session.remove()
+            if args.database_uri:
+                db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
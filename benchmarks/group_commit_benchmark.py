@@ -0,0 +1,78 @@
+"""
+Compara a vazão de cadastros de colaboradores com um commit por requisição e com group commit.
+
+Simula uma rajada de onboarding: N threads cadastram colaboradores ao mesmo tempo pelo
+EmployeeService, primeiro no modo padrão (um commit por cadastro) e depois com o GroupCommitWriter.
+Usa o banco configurado pelo FLASK_ENV (rode com FLASK_ENV=testing) e remove os dados criados ao final.
+
+    python benchmarks/group_commit_benchmark.py --threads 32 --per-thread 100
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import sys
+import time
+import uuid
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.models import Department, Employee, Dependent, DepartmentStats
+from app.repositories import EmployeeRepository, GroupCommitWriter
+from app.services import EmployeeService
+
+
+def run(app, service, department_id, threads, per_thread):
+    prefix = uuid.uuid4().hex[:8]
+
+    def worker(thread_index):
+        with app.app_context():
+            for i in range(per_thread):
+                service.create_employee(f'bench-{prefix}-{thread_index}-{i}', department_id, ['dependente'])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+    return threads * per_thread / elapsed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--per-thread', type=int, default=100)
+    parser.add_argument('--max-items', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        department = Department(name=f'bench-{uuid.uuid4().hex[:8]}')
+        db.session.add(department)
+        db.session.commit()
+        department_id = department.id
+
+    repository = EmployeeRepository(db)
+    try:
+        rate, elapsed = run(app, EmployeeService(repository), department_id, args.threads, args.per_thread)
+        print(f"commit por requisição: {rate:10.1f} cadastros/s ({elapsed:.2f}s)")
+
+        writer = GroupCommitWriter(app, repository, args.max_items, args.max_wait_ms)
+        writer.start()
+        try:
+            rate, elapsed = run(app, EmployeeService(repository, writer), department_id, args.threads, args.per_thread)
+        finally:
+            writer.stop()
+        print(f"group commit:          {rate:10.1f} cadastros/s ({elapsed:.2f}s)")
+    finally:
+        with app.app_context():
+            employee_ids = db.session.query(Employee.id).filter_by(department_id=department_id)
+            Dependent.query.filter(Dependent.employee_id.in_(employee_ids)).delete(synchronize_session=False)
+            Employee.query.filter_by(department_id=department_id).delete(synchronize_session=False)
+            DepartmentStats.query.filter_by(department_id=department_id).delete(synchronize_session=False)
+            Department.query.filter_by(id=department_id).delete(synchronize_session=False)
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compara JSON e MessagePack nas respostas da API: tempo de codificação, de decodificação e tamanho.
+
+Usa N colaboradores sintéticos nos dois formatos de listagem (um objeto por linha e ?format=columnar)
+e codifica cada um como as rotas fazem (jsonify usa JSON compacto; respond usa msgpack.packb).
+Não precisa de banco de dados.
+
+    python benchmarks/msgpack_benchmark.py --rows 10000 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+import msgpack
+
+
+CODECS = (
+    ('json', lambda data: json.dumps(data, separators=(',', ':')).encode(), json.loads),
+    ('msgpack', msgpack.packb, msgpack.unpackb),
+)
+
+
+def median_seconds(function, argument, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [{'id': i, 'name': f'Colaborador {i:06d}', 'have_dependents': i % 3 == 0} for i in range(1, args.rows + 1)]
+    payloads = {
+        'linhas': rows,
+        'colunar': {key: [row[key] for row in rows] for key in ('id', 'name', 'have_dependents')},
+    }
+
+    print(f'{args.rows} colaboradores, mediana de {args.repeat} execuções')
+    print(f'{"payload":<10} {"codec":<8} {"bytes":>10} {"encode ms":>10} {"decode ms":>10}')
+    for label, data in payloads.items():
+        for codec, encode, decode in CODECS:
+            body = encode(data)
+            encode_seconds = median_seconds(encode, data, args.repeat)
+            decode_seconds = median_seconds(decode, body, args.repeat)
+            print(f'{label:<10} {codec:<8} {len(body):>10} {encode_seconds * 1000:>10.2f} {decode_seconds * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
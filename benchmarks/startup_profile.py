@@ -0,0 +1,88 @@
+"""
+Perfil da inicialização da aplicação: tempo de importação por módulo e tempo do create_app.
+
+Executa um processo novo com `python -X importtime`, importa o app e chama create_app(), e resume a
+saída do importtime: tempo total de importação, tempo próprio somado por pacote e os módulos mais
+lentos. Use para achar o que pesa no cold start antes de mexer nos imports.
+
+    python benchmarks/startup_profile.py --top 15
+    python benchmarks/startup_profile.py --database-uri sqlite://   # sem conectar ao banco configurado
+"""
+from collections import defaultdict
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+STARTUP_CODE = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app({overrides!r})
+created = time.perf_counter()
+print(json.dumps({{"import_seconds": imported - started, "create_app_seconds": created - imported,
+                  "modules": sorted(sys.modules)}}))
+'''
+
+
+def profile_startup(database_uri=None, importtime=True):
+    """
+    Inicializa a aplicação em um processo novo e mede a importação e o create_app.
+
+    Args:
+        database_uri (str, optional): Substitui SQLALCHEMY_DATABASE_URI (ex.: 'sqlite://').
+        importtime (bool): Coleta o tempo de importação por módulo (-X importtime).
+
+    Returns:
+        dict: import_seconds, create_app_seconds, modules (importados ao final) e imports
+            (lista de (módulo, próprio_us, acumulado_us), vazia sem importtime).
+    """
+    overrides = {'SQLALCHEMY_DATABASE_URI': database_uri} if database_uri else {}
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', STARTUP_CODE.format(overrides=overrides)]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports'] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        report['imports'].append((module.strip(), int(self_us), int(cumulative_us)))
+    return report
+
+
+def summarize(imports, top):
+    by_package = defaultdict(int)
+    for module, self_us, _ in imports:
+        by_package[module.split('.')[0]] += self_us
+
+    total_us = sum(self_us for _, self_us, _ in imports)
+    print(f'Importação: {total_us / 1000:.1f} ms em {len(imports)} módulos')
+
+    print(f'\n{"pacote":<30} {"ms":>8} {"%":>6}')
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f'{package:<30} {self_us / 1000:>8.1f} {100 * self_us / total_us:>6.1f}')
+
+    print(f'\n{"módulo (tempo próprio)":<50} {"ms":>8} {"acumulado":>10}')
+    for module, self_us, cumulative_us in sorted(imports, key=lambda item: item[1], reverse=True)[:top]:
+        print(f'{module:<50} {self_us / 1000:>8.1f} {cumulative_us / 1000:>10.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--database-uri', help='Substitui SQLALCHEMY_DATABASE_URI durante a medição.')
+    args = parser.parse_args()
+
+    report = profile_startup(args.database_uri)
+    summarize(report['imports'], args.top)
+    print(f"\nimport app: {report['import_seconds'] * 1000:.1f} ms | create_app(): {report['create_app_seconds'] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
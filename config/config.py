@@ -1,7 +1,92 @@
 import os
+import tempfile
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'default-secret-key'
+    CHANGE_LOG_RETENTION_DAYS = 30
+    # Group commit dos cadastros de colaboradores: um commit a cada N itens ou N ms
+    GROUP_COMMIT_ENABLED = os.environ.get('GROUP_COMMIT_ENABLED') == 'true'
+    GROUP_COMMIT_MAX_ITEMS = 64
+    GROUP_COMMIT_MAX_WAIT_MS = 5
+    # Espera máxima de uma requisição pelo commit do seu lote
+    GROUP_COMMIT_RESULT_TIMEOUT_SECONDS = 10
+    # Idempotency-Key: validade das respostas guardadas e espera máxima por uma requisição em andamento
+    IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+    IDEMPOTENCY_WAIT_SECONDS = 10
+    # Reserva de uma requisição em andamento; deve ser maior que a requisição mais longa. Vencida (o processo
+    # caiu), uma repetição retoma a chave
+    IDEMPOTENCY_LOCK_SECONDS = 30
+    # Controle de admissão: limites de requisições em andamento e de ocupação do pool, por tipo de rota
+    ADMISSION_CONTROL_ENABLED = True
+    ADMISSION_MAX_INFLIGHT_READ = 64
+    ADMISSION_MAX_INFLIGHT_WRITE = 16
+    ADMISSION_POOL_SATURATION_READ = 0.9
+    ADMISSION_POOL_SATURATION_WRITE = 1.0
+    ADMISSION_RETRY_AFTER_SECONDS = 1
+    # Rate limit por cliente (IP, ou X-API-Key se for uma das RATE_LIMIT_API_KEYS); 0 desativa
+    RATE_LIMIT_PER_SECOND = 0
+    RATE_LIMIT_API_KEYS = frozenset(key for key in os.environ.get('RATE_LIMIT_API_KEYS', '').split(',') if key)
+    RATE_LIMIT_BURST = 20
+    RATE_LIMIT_MAX_CLIENTS = 10000
+    # Réplicas de leitura (URIs separadas por vírgula); leituras GET vão para elas, com aderência ao primário após escritas
+    READ_REPLICA_URIS = [uri for uri in os.environ.get('READ_REPLICA_URIS', '').split(',') if uri]
+    READ_REPLICA_STICKY_SECONDS = 5
+    READ_REPLICA_RETRY_SECONDS = 30
+    # Perfil de requisições com cProfile: token assinado no cabeçalho (flask profile-token) e/ou amostragem
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == 'true'
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_HEADER = 'X-Profile-Token'
+    PROFILING_TOKEN_MAX_AGE = 60 * 60
+    PROFILING_DIR = os.environ.get('PROFILING_DIR') or os.path.join(tempfile.gettempdir(), 'telavita-profiles')
+    PROFILING_MAX_DUMPS = 100
+    # Log de consultas lentas (JSON por linha, arquivo rotativo), com EXPLAIN (FORMAT JSON) amostrado no Postgres
+    SLOW_QUERY_ENABLED = os.environ.get('SLOW_QUERY_ENABLED') == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '200'))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', '0.1'))
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE') or os.path.join(tempfile.gettempdir(), 'telavita-slow-queries.log')
+    SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUP_COUNT = 5
+    # Logging em JSON por uma fila (QueueHandler/QueueListener), com limite de erros idênticos repetidos
+    LOG_QUEUE_ENABLED = os.environ.get('LOG_QUEUE_ENABLED') != 'false'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.environ.get('LOG_FILE')
+    LOG_QUEUE_MAX_SIZE = 10000
+    LOG_ERROR_RATE_LIMIT_SECONDS = 10
+    LOG_REQUESTS = True
+    # Cache das leituras: L1 em memória (LRU), L2 em SQLite compartilhado pelos processos do host e,
+    # opcionalmente, Redis (CACHE_REDIS_URL, requer o pacote redis)
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED') != 'false'
+    CACHE_TTL_SECONDS = 60
+    CACHE_L1_MAX_ITEMS = 1024
+    CACHE_L1_TTL_SECONDS = 5
+    CACHE_L2_PATH = os.environ.get('CACHE_L2_PATH')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    # Paginação de /colaborador/departamento/<id>/colaboradores
+    EMPLOYEE_PAGE_DEFAULT_LIMIT = 100
+    EMPLOYEE_PAGE_MAX_LIMIT = 1000
+    # Operações em lote de colaboradores: máximo de IDs por requisição
+    BULK_MAX_IDS = 10000
+    # Tarefas de fundo (importações e exportações): threads por processo, tarefas ativas somando todos os
+    # processos e recuperação das tarefas cujo processo caiu (sem batimento há JOB_STALE_SECONDS)
+    JOBS_ENABLED = os.environ.get('JOBS_ENABLED') != 'false'
+    JOB_MAX_WORKERS = 2
+    JOB_MAX_ACTIVE = 20
+    JOB_STALE_SECONDS = 300
+    JOB_MAX_ATTEMPTS = 3
+    JOB_IMPORT_BATCH_SIZE = 1000
+    JOB_IMPORT_MAX_ITEMS = 100000
+    JOB_OUTPUT_DIR = os.environ.get('JOB_OUTPUT_DIR') or os.path.join(tempfile.gettempdir(), 'telavita-jobs')
+    # Arquivos de exportação são removidos (e a tarefa marcada com file_expired) este tempo após a conclusão
+    JOB_OUTPUT_RETENTION_SECONDS = int(os.environ.get('JOB_OUTPUT_RETENTION_SECONDS', '86400'))
+    # Respostas já serializadas (bytes, ETag e variante gzip) de /departament/listar e /colaborador/busca_por_id
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED') != 'false'
+    RESPONSE_CACHE_GZIP_MIN_BYTES = 1024
+    # Invalidação entre workers por LISTEN/NOTIFY (só no Postgres)
+    CACHE_NOTIFY_ENABLED = os.environ.get('CACHE_NOTIFY_ENABLED') != 'false'
+    CACHE_NOTIFY_CHANNEL = 'telavita_cache'
+    CACHE_NOTIFY_RECONNECT_MIN_SECONDS = 0.5
+    CACHE_NOTIFY_RECONNECT_MAX_SECONDS = 30
+    CACHE_NOTIFY_KEEPALIVE_SECONDS = 30
 
 class DevelopmentConfig(Config):
     DEBUG = True
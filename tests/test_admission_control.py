@@ -0,0 +1,89 @@
+from flask import Flask, json
+import unittest
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class AdmissionControlTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para controle de admissão")
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.admission = self.app.extensions['admission_control']
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+
+
+
+    def test_write_budget_exhausted(self):
+        """Sem orçamento de escrita, escritas recebem 503 com Retry-After e leituras seguem atendidas"""
+
+        self.app.config['ADMISSION_MAX_INFLIGHT_WRITE'] = 0
+
+        response = self.client.post('/departament/cadastrar', data=json.dumps({'name': 'TI'}), content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+        response = self.client.get('/departament/listar')
+        self.assertEqual(response.status_code, 200)
+
+    def test_pool_saturation(self):
+        """Leituras são descartadas quando o pool de conexões passa do limite configurado"""
+
+        if self.admission.pool_utilization() is None:
+            self.skipTest('Pool de conexões sem limite conhecido')
+
+        self.app.config['ADMISSION_POOL_SATURATION_READ'] = 0
+        response = self.client.get('/departament/listar')
+        self.assertEqual(response.status_code, 503)
+
+    def test_rate_limit_per_client(self):
+        """Token bucket por cliente responde 429 quando as fichas acabam"""
+
+        self.app.config['RATE_LIMIT_PER_SECOND'] = 0.5
+        self.app.config['RATE_LIMIT_BURST'] = 1
+        self.app.config['RATE_LIMIT_API_KEYS'] = frozenset(['cliente-a', 'cliente-b'])
+
+        headers = {'X-API-Key': 'cliente-a'}
+        self.assertEqual(self.client.get('/departament/listar', headers=headers).status_code, 200)
+        response = self.client.get('/departament/listar', headers=headers)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '2')
+
+        # Outro cliente tem seu próprio bucket
+        self.assertEqual(self.client.get('/departament/listar', headers={'X-API-Key': 'cliente-b'}).status_code, 200)
+
+    def test_rate_limit_ignores_unknown_api_keys(self):
+        """Chaves desconhecidas não criam buckets novos: trocar de chave não renova o burst"""
+
+        self.app.config['RATE_LIMIT_PER_SECOND'] = 0.5
+        self.app.config['RATE_LIMIT_BURST'] = 1
+
+        self.assertEqual(self.client.get('/departament/listar', headers={'X-API-Key': 'qualquer-1'}).status_code, 200)
+        response = self.client.get('/departament/listar', headers={'X-API-Key': 'qualquer-2'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_in_flight_released_after_request(self):
+        """Contadores de requisições em andamento voltam a zero ao fim de cada requisição"""
+
+        self.client.get('/departament/listar')
+        self.client.post('/departament/cadastrar', data=json.dumps({}), content_type='application/json')
+        self.assertEqual(self.admission.in_flight(), {'read': 0, 'write': 0})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
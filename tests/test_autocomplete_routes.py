@@ -0,0 +1,101 @@
+from flask import Flask, json
+import unittest
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class AutocompleteTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para autocompletar")
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        from app.routes.autocomplete import autocomplete_service
+        autocomplete_service.build()
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+
+
+
+    ######## Testes da rota /autocompletar/departamentos ########
+    def test_autocomplete_departments_after_create(self):
+        """Departamentos cadastrados pela API entram no índice sem reconstrução"""
+
+        for name in ['Financeiro', 'Física', 'Marketing']:
+            self.client.post('/departament/cadastrar', data=json.dumps({'name': name}), content_type='application/json')
+
+        response = self.client.get('/autocompletar/departamentos?prefixo=fi')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([d['name'] for d in data], ['Financeiro', 'Física'])
+
+    def test_autocomplete_departments_after_delete(self):
+        """Departamento excluído deixa de ser sugerido"""
+
+        response = self.client.post('/departament/cadastrar', data=json.dumps({'name': 'Jurídico'}), content_type='application/json')
+        department_id = json.loads(response.data)['department_id']
+        self.client.delete(f'/departament/excluir/{department_id}')
+
+        response = self.client.get('/autocompletar/departamentos?prefixo=jur')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), [])
+
+    def test_autocomplete_without_prefix(self):
+        """Busca sem prefixo retorna erro de validação"""
+
+        response = self.client.get('/autocompletar/departamentos')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)['error'], 'O prefixo é obrigatório')
+
+
+
+    ######## Testes da rota /autocompletar/colaboradores ########
+    def test_autocomplete_employees_after_update(self):
+        """Colaborador renomeado é sugerido pelo novo nome e não pelo antigo"""
+
+        from app.models import Department
+        department = Department(name="TI")
+        db.session.add(department)
+        db.session.commit()
+
+        data = {'name': 'Tiago', 'department_id': department.id}
+        response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        employee_id = json.loads(response.data)['employee_id']
+        self.client.put(f'/colaborador/editar/{employee_id}', data=json.dumps({'name': 'Bruno'}), content_type='application/json')
+
+        response = self.client.get('/autocompletar/colaboradores?prefixo=br')
+        self.assertEqual(json.loads(response.data), [{'id': employee_id, 'name': 'Bruno'}])
+        response = self.client.get('/autocompletar/colaboradores?prefixo=ti')
+        self.assertEqual(json.loads(response.data), [])
+
+
+
+    ######## Testes da rota /autocompletar/memoria ########
+    def test_autocomplete_memory(self):
+        """Consumo de memória reflete as entradas indexadas"""
+
+        self.client.post('/departament/cadastrar', data=json.dumps({'name': 'Vendas'}), content_type='application/json')
+
+        response = self.client.get('/autocompletar/memoria')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['departments']['entries'], 1)
+        self.assertGreater(data['total_bytes'], 0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import sys
+import os
+import logging
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.cache import read_cache, invalidation_channel, InvalidationChannel
+from app.repositories.signals import department_changed, caches_flush
+
+
+class CacheInvalidationTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para a invalidação de cache entre processos")
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.app = create_app({'CACHE_L2_PATH': os.path.join(self.cache_dir.name, 'cache.sqlite3')})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.postgres = db.engine.dialect.name == 'postgresql'
+        self.channel = InvalidationChannel()
+        # Outro processo: publica com a sua própria origem
+        self.other_worker = InvalidationChannel(db=db)
+        self.other_worker.channel = self.app.config['CACHE_NOTIFY_CHANNEL']
+        self.flushes = []
+        caches_flush.connect(self.on_flush)
+
+    def tearDown(self):
+        caches_flush.disconnect(self.on_flush)
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        read_cache.clear()
+        self.cache_dir.cleanup()
+
+    def on_flush(self, sender, **kwargs):
+        self.flushes.append(sender)
+
+    def require_listener(self):
+        if not self.postgres:
+            self.skipTest('LISTEN/NOTIFY requer Postgres')
+        self.assertTrue(invalidation_channel.listening.wait(5))
+
+    def wait_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail('Condição não atingida')
+            time.sleep(0.02)
+
+
+
+    def test_installed_only_with_postgres(self):
+        """O canal só é instalado no Postgres, com uma única thread de escuta por processo"""
+
+        if not self.postgres:
+            self.assertNotIn('invalidation_channel', self.app.extensions)
+            return
+        self.assertIs(self.app.extensions['invalidation_channel'], invalidation_channel)
+
+        # Uma nova aplicação assume o canal: a thread e a conexão da anterior são encerradas
+        create_app()
+        self.assertNotIn('invalidation_channel', self.app.extensions)
+        listeners = [thread for thread in threading.enumerate() if thread.name == 'cache-invalidation-listener']
+        self.assertEqual(len(listeners), 1)
+        self.assertTrue(invalidation_channel.listening.wait(5))
+        listening = db.session.execute(db.text(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND query LIKE 'LISTEN %'"
+        )).scalar()
+        self.assertEqual(listening, 1)
+
+    def test_remote_change_evicts_local_entries(self):
+        """Um NOTIFY de outro processo chega pelo LISTEN e remove as entradas locais"""
+
+        self.require_listener()
+        department_id = self.client.post('/departament/cadastrar', json={'name': 'Jurídico'}).get_json()['department_id']
+        self.client.get(f'/departament/busca_por_id/{department_id}')
+        self.assertIsNotNone(read_cache.tiers[0].get(f'department:{department_id}'))
+
+        received = []
+        def on_change(action, **kwargs):
+            received.append((action, kwargs))
+        department_changed.connect(on_change)
+        try:
+            with db.engine.begin() as connection:
+                self.other_worker.publish(connection, 'department', 'updated', [(department_id, 'Legal')])
+            # Os assinantes são chamados em qualquer ordem: espera também a remoção do cache
+            self.wait_until(lambda: received and read_cache.tiers[0].get(f'department:{department_id}') is None)
+        finally:
+            department_changed.disconnect(on_change)
+
+        self.assertEqual(received, [('updated', {'items': [(department_id, 'Legal')], 'remote': True})])
+
+    def test_notify_sent_with_the_commit(self):
+        """O NOTIFY sai na transação da escrita: é entregue com o commit e não sai se ela for desfeita"""
+
+        self.require_listener()
+        from app.repositories import DepartamentRepository
+        repository = DepartamentRepository(db)
+        department_id = repository.create_department('Jurídico')
+
+        pooled = db.engine.raw_connection()
+        listener = pooled.driver_connection
+        pooled.detach()
+        self.addCleanup(listener.close)
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.app.config["CACHE_NOTIFY_CHANNEL"]}"')
+
+        # Nome acima do limite da coluna: o UPDATE falha no commit, depois do anúncio
+        self.assertFalse(repository.update_department(department_id, 'x' * 101))
+        self.assertTrue(repository.update_department(department_id, 'Legal'))
+        time.sleep(0.2)
+        listener.poll()
+        messages = [json.loads(notification.payload) for notification in listener.notifies]
+        self.assertEqual(messages, [{'origin': invalidation_channel.origin, 'entity': 'department', 'action': 'updated',
+                                     'items': [[department_id, 'Legal']], 'department_ids': []}])
+
+    def test_own_notifications_ignored(self):
+        """O processo não reprocessa as próprias notificações"""
+
+        received = []
+        def on_change(action, **kwargs):
+            received.append(action)
+        department_changed.connect(on_change)
+        try:
+            for payload in self.channel.payloads('department', 'deleted', [(1, 'TI')]):
+                self.channel.handle(payload)
+        finally:
+            department_changed.disconnect(on_change)
+        self.assertEqual(received, [])
+
+    def test_large_changes_batched_or_flushed(self):
+        """Alterações em massa são divididas em lotes; um lote acima do limite do NOTIFY vira um descarte total"""
+
+        payloads = list(self.other_worker.payloads('employee', 'updated', [(i, f'Colaborador {i}') for i in range(250)], [1]))
+        self.assertEqual(len(payloads), 3)
+        self.assertTrue(all(len(payload.encode()) <= InvalidationChannel.MAX_PAYLOAD_BYTES for payload in payloads))
+
+        payloads = list(self.other_worker.payloads('employee', 'updated', [(1, 'x' * 10000)]))
+        self.assertEqual([json.loads(payload) for payload in payloads], [{'origin': self.other_worker.origin, 'flush': True}])
+        self.channel.handle(payloads[0])
+        self.assertEqual(self.flushes, ['flush'])
+
+    def test_reconnect_triggers_full_flush(self):
+        """Se a conexão do LISTEN cai, o canal reconecta e descarta os caches locais"""
+
+        self.require_listener()
+        read_cache.set('department:1', {'id': 1})
+        terminated = db.session.execute(db.text(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND query LIKE 'LISTEN %'"
+        )).scalars().all()
+        self.assertEqual(terminated, [True])
+
+        # Só a reconexão depois de uma conexão bem-sucedida pode ter perdido notificações
+        self.wait_until(lambda: self.flushes)
+        self.assertEqual(self.flushes, ['flush'])
+        self.assertIsNone(read_cache.get('department:1'))
+        self.assertTrue(invalidation_channel.listening.wait(5))
+
+if __name__ == '__main__':
+    unittest.main()
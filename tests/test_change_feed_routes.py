@@ -0,0 +1,134 @@
+from flask import Flask, json
+import unittest
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class ChangeFeedTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para o feed de alterações")
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+
+    def _post(self, url, data):
+        response = self.client.post(url, data=json.dumps(data), content_type='application/json')
+        return json.loads(response.data)
+
+
+
+    ######## Testes da rota /changes ########
+    def test_changes_follow_writes(self):
+        """Cadastro, edição e exclusão geram alterações em ordem de sequência"""
+
+        department_id = self._post('/departament/cadastrar', {'name': 'TI'})['department_id']
+        employee_id = self._post('/colaborador/cadastrar', {'name': 'Tiago', 'department_id': department_id})['employee_id']
+        self.client.put(f'/colaborador/editar/{employee_id}', data=json.dumps({'dependents': ['Bia']}), content_type='application/json')
+        self.client.delete(f'/colaborador/excluir/{employee_id}')
+
+        response = self.client.get('/changes')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        changes = [(c['entity'], c['entity_id'], c['action']) for c in data['changes']]
+        self.assertEqual(changes, [
+            ('department', department_id, 'created'),
+            ('employee', employee_id, 'created'),
+            ('employee', employee_id, 'updated'),
+            ('employee', employee_id, 'deleted'),
+        ])
+        self.assertEqual(data['next_since'], data['changes'][-1]['seq'])
+        self.assertFalse(data['has_more'])
+
+    def test_changes_since_and_limit(self):
+        """Clientes recebem apenas os deltas após since, paginados por limit"""
+
+        for name in ['TI', 'RH', 'Vendas']:
+            self._post('/departament/cadastrar', {'name': name})
+
+        first_page = json.loads(self.client.get('/changes?limit=2').data)
+        self.assertEqual(len(first_page['changes']), 2)
+        self.assertTrue(first_page['has_more'])
+
+        second_page = json.loads(self.client.get(f"/changes?since={first_page['next_since']}&limit=2").data)
+        self.assertEqual(len(second_page['changes']), 1)
+        self.assertFalse(second_page['has_more'])
+
+    def test_changes_after_compaction(self):
+        """Clientes atrasados em relação à compactação recebem 410"""
+
+        self._post('/departament/cadastrar', {'name': 'TI'})
+        result = self.app.test_cli_runner().invoke(args=['compact-change-log', '--retention-days', '-1'])
+        self.assertIn('1 alteração', result.output)
+
+        response = self.client.get('/changes?since=0')
+        self.assertEqual(response.status_code, 410)
+
+    def test_changes_invalid_limit(self):
+        """Limite fora do intervalo retorna erro de validação"""
+
+        response = self.client.get('/changes?limit=0')
+        self.assertEqual(response.status_code, 400)
+
+    def test_changes_wait_for_older_transactions(self):
+        """Uma transação que obteve sequências menores e confirma depois não é pulada pelo cursor"""
+
+        if db.engine.dialect.name != 'postgresql':
+            self.skipTest('Transações concorrentes requerem Postgres')
+
+        from app.repositories.change_log_repository import record_changes
+        # Transação longa (um lote, por exemplo): registra a alteração antes, mas ainda não confirmou
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        record_changes(connection, 'employee', [999], 'deleted')
+        try:
+            self._post('/departament/cadastrar', {'name': 'TI'})
+            first = json.loads(self.client.get('/changes').data)
+            self.assertEqual(first['changes'], [])
+            self.assertEqual(first['next_since'], 0)
+        finally:
+            transaction.commit()
+            connection.close()
+
+        # Confirmada a transação longa, a leitura não atribui posições: quem escreve as atribui após o commit
+        self.assertEqual(json.loads(self.client.get(f"/changes?since={first['next_since']}").data)['changes'], [])
+        self._post('/departament/cadastrar', {'name': 'RH'})
+        second = json.loads(self.client.get(f"/changes?since={first['next_since']}").data)
+        self.assertEqual([(c['entity'], c['action']) for c in second['changes']],
+                         [('employee', 'deleted'), ('department', 'created'), ('department', 'created')])
+
+    def test_changes_read_only(self):
+        """A leitura do feed não trava nem grava: não abre transação de escrita no banco"""
+
+        from sqlalchemy import event
+        self._post('/departament/cadastrar', {'name': 'TI'})
+        statements = []
+        def before_execute(conn, cursor, statement, *args):
+            statements.append(statement.lower())
+        event.listen(db.engine, 'before_cursor_execute', before_execute)
+        try:
+            response = self.client.get('/changes')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_execute)
+        self.assertEqual(len(json.loads(response.data)['changes']), 1)
+        self.assertTrue(statements)
+        self.assertTrue(all(statement.lstrip().startswith('select') for statement in statements), statements)
+        self.assertFalse([statement for statement in statements if 'advisory' in statement])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,26 @@ class DepartmentTestCase(unittest.TestCase):
         self.assertIn('department_id', response_data.keys())
         self.assertEqual(response_data['message'], 'Departamento criado com sucesso')
 
+    def test_create_department_msgpack(self):
+        """Cadastro com corpo e resposta em MessagePack"""
+
+        import msgpack
+        headers = {'Accept': 'application/msgpack'}
+        body = msgpack.packb({'name': 'Financeiro'})
+        response = self.client.post('/departament/cadastrar', data=body, content_type='application/msgpack', headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.mimetype, 'application/msgpack')
+        response_data = msgpack.unpackb(response.data)
+        self.assertEqual(response_data['message'], 'Departamento criado com sucesso')
+
+        response = self.client.get('/departament/listar', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d['name'] for d in msgpack.unpackb(response.data)], ['Financeiro'])
+
+        response = self.client.post('/departament/cadastrar', data=b'\xc1', content_type='application/msgpack', headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(msgpack.unpackb(response.data)['error'], 'Corpo MessagePack inválido')
+
     def test_create_department_without_name(self):
         """Testar a criação de departamento sem fornecer o nome"""
 
@@ -73,6 +93,59 @@ class DepartmentTestCase(unittest.TestCase):
         self.assertEqual(response_data['error'], 'Departamento já existe')
 
 
+    def test_create_department_idempotency_key_replay(self):
+        """Repetição com a mesma Idempotency-Key recebe a resposta original sem cadastrar de novo"""
+
+        from app.models import Department
+        data = json.dumps({'name': 'Financeiro'})
+        headers = {'Idempotency-Key': 'chave-123'}
+        first = self.client.post('/departament/cadastrar', data=data, content_type='application/json', headers=headers)
+        second = self.client.post('/departament/cadastrar', data=data, content_type='application/json', headers=headers)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(json.loads(second.data), json.loads(first.data))
+        self.assertEqual(second.headers.get('Idempotent-Replayed'), 'true')
+        self.assertEqual(Department.query.filter_by(name='Financeiro').count(), 1)
+
+    def test_create_department_idempotency_key_reused(self):
+        """Idempotency-Key reutilizada com outro corpo retorna 422"""
+
+        headers = {'Idempotency-Key': 'chave-456'}
+        self.client.post('/departament/cadastrar', data=json.dumps({'name': 'RH'}), content_type='application/json', headers=headers)
+        response = self.client.post('/departament/cadastrar', data=json.dumps({'name': 'TI'}), content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, 422)
+
+    def test_create_department_idempotency_key_stale_reservation(self):
+        """Reserva de um processo que caiu é retomada depois do IDEMPOTENCY_LOCK_SECONDS; uma reserva vigente retorna 409"""
+
+        from app.models import Department, IdempotencyKey
+        from app.routes.resouces.idempotency import _request_hash
+        from datetime import datetime, timedelta
+
+        data = json.dumps({'name': 'Jurídico'})
+        with self.app.test_request_context('/departament/cadastrar', method='POST', data=data, content_type='application/json'):
+            request_hash = _request_hash()
+        now = datetime.utcnow()
+        db.session.add_all([
+            IdempotencyKey(key='caiu', method='POST', path='/departament/cadastrar', request_hash=request_hash,
+                           created_at=now - timedelta(minutes=5), locked_until=now - timedelta(minutes=4)),
+            IdempotencyKey(key='andamento', method='POST', path='/departament/cadastrar', request_hash=request_hash,
+                           created_at=now, locked_until=now + timedelta(minutes=1)),
+        ])
+        db.session.commit()
+        self.app.config['IDEMPOTENCY_WAIT_SECONDS'] = 0
+
+        response = self.client.post('/departament/cadastrar', data=data, content_type='application/json',
+                                    headers={'Idempotency-Key': 'andamento'})
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.post('/departament/cadastrar', data=data, content_type='application/json',
+                                    headers={'Idempotency-Key': 'caiu'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Department.query.filter_by(name='Jurídico').count(), 1)
+
+
     ######## Testes da rota /departament/listar ########
     def test_list_departments_success(self):
         """Adiciona dois novos departamentos e valida se os dois foram adicionados e se estão sendo retornados na ordem correta"""
@@ -92,6 +165,23 @@ class DepartmentTestCase(unittest.TestCase):
         self.assertEqual(data[0]['name'], f"HR")
         self.assertEqual(data[1]['name'], f"Development")
     
+    def test_list_departments_columnar(self):
+        """Com format=columnar, os departamentos vêm como uma lista por campo, na mesma ordem"""
+
+        from app.models import Department
+        db.session.add_all([Department(name="HR"), Department(name="Development")])
+        db.session.commit()
+
+        response = self.client.get('/departament/listar?format=columnar')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(set(data), {'id', 'name'})
+        self.assertEqual(data['name'], ['HR', 'Development'])
+        self.assertEqual(len(data['id']), 2)
+
+        response = self.client.get('/departament/listar?format=xml')
+        self.assertEqual(response.status_code, 400)
+
     def test_list_departments_failure(self):
         """Simulando uma falha através do patching"""
 
@@ -105,6 +195,164 @@ class DepartmentTestCase(unittest.TestCase):
             self.assertEqual(data['error'], 'Database error')
 
     
+    ######## Testes da rota /departament/mesclar/<int:department_id> ########
+    def test_merge_department(self):
+        """Mescla move todos os colaboradores, soma o resumo ao destino e exclui a origem"""
+
+        from app.models import Department, ChangeLog
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+        ti_id, rh_id = ti.id, rh.id
+
+        for name, department_id, dependents in [('Ana', ti_id, ['Bia', 'Caio']), ('Bruno', ti_id, []), ('Carla', rh_id, ['Davi'])]:
+            data = {'name': name, 'department_id': department_id, 'dependents': dependents}
+            self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+
+        response = self.client.post(f'/departament/mesclar/{ti_id}', data=json.dumps({'target_department_id': rh_id}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['moved_employees'], 2)
+
+        self.assertEqual(self.client.get(f'/departament/busca_por_id/{ti_id}').status_code, 404)
+        response = self.client.get(f'/colaborador/departamento/{rh_id}/colaboradores')
+        self.assertEqual(sorted(employee['name'] for employee in json.loads(response.data)), ['Ana', 'Bruno', 'Carla'])
+
+        stats = {d['name']: d for d in json.loads(self.client.get('/departament/estatisticas').data)}
+        self.assertNotIn('TI', stats)
+        self.assertEqual(stats['RH']['employee_count'], 3)
+        self.assertEqual(stats['RH']['employees_with_dependents'], 2)
+        self.assertEqual(stats['RH']['dependent_count'], 3)
+
+        deleted = ChangeLog.query.filter_by(entity='department', entity_id=ti_id, action='deleted').count()
+        self.assertEqual(deleted, 1)
+
+        # O departamento excluído sai do conjunto de IDs válidos: um cadastro nele responde 422
+        data = {'name': 'Eva', 'department_id': ti_id}
+        response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 422)
+
+    def test_merge_department_errors(self):
+        """Origem inexistente 404, destino inexistente 422, corpo inválido 400 e If-Match desatualizado 412"""
+
+        from app.models import Department
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+        ti_id, rh_id = ti.id, rh.id
+
+        def merge(source_id, data, headers=None):
+            return self.client.post(f'/departament/mesclar/{source_id}', data=json.dumps(data),
+                                    content_type='application/json', headers=headers)
+
+        self.assertEqual(merge(999999, {'target_department_id': rh_id}).status_code, 404)
+        self.assertEqual(merge(ti_id, {'target_department_id': 999999}).status_code, 422)
+        self.assertEqual(merge(ti_id, {}).status_code, 400)
+        self.assertEqual(merge(ti_id, {'target_department_id': ti_id}).status_code, 400)
+        self.assertEqual(merge(ti_id, {'target_department_id': rh_id}, {'If-Match': '"999"'}).status_code, 412)
+        self.assertEqual(self.client.get(f'/departament/busca_por_id/{ti_id}').status_code, 200)
+
+
+
+    ######## Testes da rota /departament/estatisticas ########
+    def test_department_stats_follow_employee_writes(self):
+        """Resumo por departamento acompanha cadastro, troca de departamento e exclusão de colaboradores"""
+
+        from app.models import Department
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+
+        def post_employee(name, department_id, dependents):
+            data = {'name': name, 'department_id': department_id, 'dependents': dependents}
+            response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+            return json.loads(response.data)['employee_id']
+
+        post_employee('Ana', ti.id, ['Bia', 'Caio'])
+        bruno_id = post_employee('Bruno', ti.id, [])
+        carla_id = post_employee('Carla', ti.id, ['Davi'])
+
+        self.client.put(f'/colaborador/editar/{carla_id}', data=json.dumps({'department_id': rh.id}), content_type='application/json')
+        self.client.delete(f'/colaborador/excluir/{bruno_id}')
+
+        response = self.client.get('/departament/estatisticas')
+        self.assertEqual(response.status_code, 200)
+        data = {d['name']: d for d in json.loads(response.data)}
+        self.assertEqual(data['TI']['employee_count'], 1)
+        self.assertEqual(data['TI']['dependent_count'], 2)
+        self.assertEqual(data['TI']['dependents_share'], 1.0)
+        self.assertEqual(data['RH']['employee_count'], 1)
+        self.assertEqual(data['RH']['dependent_count'], 1)
+
+    def test_concurrent_first_stats_writes(self):
+        """Duas primeiras escritas concorrentes em um departamento sem resumo não falham e somam as duas"""
+
+        if db.engine.dialect.name != 'postgresql':
+            self.skipTest('Transações concorrentes requerem Postgres')
+
+        import threading, time
+        from types import SimpleNamespace
+        from sqlalchemy import text
+        from sqlalchemy.orm import Session
+        from app.models import Department, Employee, DepartmentStats
+        from app.repositories import DepartmentStatsRepository
+        department = Department(name="TI")  # Criado fora do repositório: sem linha de resumo
+        db.session.add(department)
+        db.session.commit()
+
+        def first_write(session, name):
+            session.add(Employee(name=name, department_id=department.id))
+            DepartmentStatsRepository(SimpleNamespace(session=session)).apply_delta(department.id, 1)
+
+        first, second = Session(db.engine), Session(db.engine)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        first_write(first, 'Ana')
+
+        errors = []
+        def run_second():
+            try:
+                first_write(second, 'Bruno')
+                second.commit()
+            except Exception as e:
+                errors.append(e)
+        thread = threading.Thread(target=run_second)
+        thread.start()
+        deadline = time.monotonic() + 5
+        with db.engine.connect() as monitor:
+            while time.monotonic() < deadline and not monitor.execute(text(
+                    "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()"
+            )).scalar():
+                monitor.rollback()
+                time.sleep(0.02)
+        first.commit()
+        thread.join(10)
+
+        self.assertEqual(errors, [])
+        db.session.expire_all()
+        self.assertEqual(db.session.get(DepartmentStats, department.id).employee_count, 2)
+
+    def test_rebuild_department_stats_command(self):
+        """Comando de reconstrução corrige um resumo divergente"""
+
+        from app.models import Department, Employee, DepartmentStats
+        department = Department(name="TI")
+        db.session.add(department)
+        db.session.commit()
+        db.session.add(Employee(name="Tiago", department_id=department.id))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['rebuild-department-stats'])
+        self.assertIn(str(department.id), result.output)
+
+        db.session.expire_all()
+        stats = db.session.get(DepartmentStats, department.id)
+        self.assertEqual(stats.employee_count, 1)
+
+    
     ######## Testes da rota /departament//editar/<int:department_id>########
     def test_update_department_success(self):
         """Teste de atualização bem-sucedida"""
@@ -215,6 +463,40 @@ class DepartmentTestCase(unittest.TestCase):
         self.assertEqual(data['name'], 'HR')
 
 
+    def test_get_department_conditional_and_if_match(self):
+        """ETag do departamento: 304 enquanto não muda, 412 ao editar ou excluir com versão desatualizada"""
+
+        from app.models import Department
+        self.department = Department(name="HR")
+        db.session.add(self.department)
+        db.session.commit()
+        department_id = self.department.id
+
+        response = self.client.get(f'/departament/busca_por_id/{department_id}')
+        etag = response.headers['ETag']
+
+        response = self.client.get(f'/departament/busca_por_id/{department_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.put(f'/departament/editar/{department_id}', data=json.dumps({'name': 'RH'}),
+                                   content_type='application/json', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.put(f'/departament/editar/{department_id}', data=json.dumps({'name': 'Pessoas'}),
+                                   content_type='application/json', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(json.loads(response.data)['error'], 'Departamento alterado por outra requisição')
+
+        response = self.client.delete(f'/departament/excluir/{department_id}', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.get(f'/departament/busca_por_id/{department_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['name'], 'RH')
+
+        response = self.client.delete(f'/departament/excluir/{department_id}', headers={'If-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+
     def test_get_department_not_found(self):
         """Teste usando um ID que não existe"""
 
@@ -7,6 +7,7 @@ import uuid
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
+from app.services.employee_service import EmployeeService
 
 class EmployeeTestCase(unittest.TestCase):
     def setUp(self):
@@ -70,6 +71,120 @@ class EmployeeTestCase(unittest.TestCase):
 
 
 
+    def test_create_employee_unknown_department(self):
+        """Teste de cadastro com departamento inexistente: rejeitado com 422 antes de tentar gravar"""
+
+        from app.models import Department
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+
+        data = {'name': 'John Doe', 'department_id': self.department.id + 1000}
+        response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 422)
+        response_data = json.loads(response.data)
+        self.assertEqual(response_data['error'], 'Departamento não encontrado')
+
+
+    def test_create_employee_group_commit(self):
+        """Com group commit ativo, cadastros concorrentes são gravados em lote e cada um recebe seu resultado"""
+
+        from app.models import Department, Employee
+        from app.repositories import GroupCommitWriter
+        from app.routes.employee import employee_repository, employee_service
+
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+
+        writer = GroupCommitWriter(self.app, employee_repository, max_items=10, max_wait_ms=50)
+        writer.start()
+        try:
+            # Um item inválido (nome nulo) falha sozinho, sem desfazer os demais do lote
+            futures = [
+                writer.submit('Ana', self.department.id, ['Bia']),
+                writer.submit(None, self.department.id),
+                writer.submit('Bruno', self.department.id),
+            ]
+            results = [future.result(timeout=5) for future in futures]
+
+            employee_service.group_writer = writer
+            data = {'name': 'Carla', 'department_id': self.department.id}
+            response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        finally:
+            employee_service.group_writer = None
+            writer.stop()
+
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIsNotNone(results[2])
+        self.assertEqual(response.status_code, 201)
+        db.session.expire_all()
+        self.assertEqual(Employee.query.filter_by(department_id=self.department.id).count(), 3)
+
+    def test_group_commit_fails_fast_when_stopped(self):
+        """Writer parado não prende a requisição, e uma nova aplicação sem group commit não o reutiliza"""
+
+        from app.models import Department
+        from app.routes.employee import employee_service
+
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+
+        app = create_app({'GROUP_COMMIT_ENABLED': True})
+        writer = employee_service.group_writer
+        self.assertIsNotNone(writer)
+        writer.stop()
+        with self.assertRaises(RuntimeError):
+            writer.submit('Ana', self.department.id)
+
+        data = {'name': 'Ana', 'department_id': self.department.id}
+        response = app.test_client().post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 500)
+
+        create_app({'GROUP_COMMIT_ENABLED': False})
+        self.assertIsNone(employee_service.group_writer)
+
+    def test_group_commit_timeout_cancels_queued_item(self):
+        """Esgotado o tempo, o cadastro ainda na fila é cancelado: a repetição com a mesma Idempotency-Key cria um só"""
+
+        from app.models import Department, Employee
+        from app.routes.employee import employee_service
+        from threading import Event
+
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+
+        app = create_app({'GROUP_COMMIT_ENABLED': True, 'GROUP_COMMIT_MAX_ITEMS': 1})
+        writer = employee_service.group_writer
+        writer.result_timeout = 0.2
+        repository, release = writer.repository, Event()
+
+        class SlowRepository:
+            def create_employees(self, employees):
+                release.wait(5)
+                return repository.create_employees(employees)
+        writer.repository = SlowRepository()
+
+        # Um lote em gravação ocupa a thread; o cadastro seguinte fica na fila até o tempo esgotar
+        blocking = writer.submit('Bloqueio', self.department.id)
+        client = app.test_client()
+        data = json.dumps({'name': 'Ana', 'department_id': self.department.id})
+        headers = {'Idempotency-Key': 'cadastro-ana'}
+        response = client.post('/colaborador/cadastrar', data=data, content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, 500)
+
+        release.set()
+        blocking.result(timeout=5)
+        response = client.post('/colaborador/cadastrar', data=data, content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, 201)
+        writer.stop()
+        self.assertEqual(Employee.query.filter_by(name='Ana').count(), 1)
+
+
+
     ######## Testes da rota /colaborador/departamento/<int:department_id>/colaboradores ########
     def test_get_employees_by_department_success(self):
         """Teste para validar se os colaboradores de um determinado departamento são listados"""
@@ -93,6 +208,79 @@ class EmployeeTestCase(unittest.TestCase):
         self.assertDictContainsSubset({'name': 'Tiago'}, data[0])
         self.assertDictContainsSubset({'name': 'Bob'}, data[1])
 
+    def test_get_employees_by_department_columnar(self):
+        """Com format=columnar, os colaboradores vêm como uma lista por campo"""
+
+        from app.models import Department, Employee, Dependent
+        self.department = Department(name="Desenvolvimento")
+        db.session.add(self.department)
+        db.session.commit()
+
+        employee = Employee(name="Tiago", department_id=self.department.id)
+        db.session.add(employee)
+        db.session.commit()
+        db.session.add(Dependent(name="Ana", employee_id=employee.id))
+        db.session.add(Employee(name="Bob", department_id=self.department.id))
+        db.session.commit()
+
+        response = self.client.get(f'/colaborador/departamento/{self.department.id}/colaboradores?format=columnar')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(set(data), {'id', 'name', 'have_dependents'})
+        rows = dict(zip(data['name'], data['have_dependents']))
+        self.assertEqual(rows, {'Tiago': True, 'Bob': False})
+
+    def test_get_employees_by_department_paginated(self):
+        """Paginação por cursor, ordenada por nome, com o total no cabeçalho"""
+
+        from app.models import Department
+        self.department = Department(name="Operações")
+        db.session.add(self.department)
+        db.session.commit()
+        for name in ['Eva', 'Ana', 'Caio', 'Bia', 'Davi']:
+            data = {'name': name, 'department_id': self.department.id, 'dependents': ['Filho'] if name in ('Ana', 'Davi') else []}
+            self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+
+        url = f'/colaborador/departamento/{self.department.id}/colaboradores'
+        names, cursor = [], None
+        while True:
+            response = self.client.get(url, query_string={'limit': 2, 'sort': 'name', **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['X-Total-Count'], '5')
+            names += [employee['name'] for employee in json.loads(response.data)]
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        self.assertEqual(names, ['Ana', 'Bia', 'Caio', 'Davi', 'Eva'])
+
+    def test_get_employees_by_department_filters(self):
+        """Filtros have_dependents e name_prefix, e validação dos parâmetros"""
+
+        from app.models import Department
+        self.department = Department(name="Suporte")
+        db.session.add(self.department)
+        db.session.commit()
+        for name, dependents in [('Mário', ['Filho']), ('Marta', []), ('Paulo_', ['Filha']), ('Paula', [])]:
+            data = {'name': name, 'department_id': self.department.id, 'dependents': dependents}
+            self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+
+        url = f'/colaborador/departamento/{self.department.id}/colaboradores'
+        response = self.client.get(url, query_string={'have_dependents': 'true'})
+        self.assertEqual([employee['name'] for employee in json.loads(response.data)], ['Mário', 'Paulo_'])
+        self.assertEqual(response.headers['X-Total-Count'], '2')
+
+        response = self.client.get(url, query_string={'have_dependents': 'false', 'name_prefix': 'Mar', 'format': 'columnar'})
+        self.assertEqual(json.loads(response.data), {'id': json.loads(response.data)['id'], 'name': ['Marta'], 'have_dependents': [False]})
+        self.assertEqual(response.headers['X-Total-Count'], '1')
+
+        # '_' é literal no prefixo, não um curinga do LIKE
+        response = self.client.get(url, query_string={'name_prefix': 'Paulo_'})
+        self.assertEqual([employee['name'] for employee in json.loads(response.data)], ['Paulo_'])
+
+        for query in ({'sort': 'salario'}, {'limit': 0}, {'limit': 'dez'}, {'have_dependents': 'sim'}, {'cursor': 'xyz'},
+                      {'sort': 'name', 'cursor': EmployeeService.encode_cursor('id', (1,))}):
+            self.assertEqual(self.client.get(url, query_string=query).status_code, 400, query)
+
     def test_get_employees_by_department_none_found(self):
         """Teste para listar colaboradores de departamento sem colaboradores"""
 
@@ -108,6 +296,206 @@ class EmployeeTestCase(unittest.TestCase):
 
 
 
+    ######## Testes da rota /colaborador/mover ########
+    def test_move_employees_by_ids(self):
+        """Move por lista de IDs, informando movidos, já no destino e não encontrados, e atualiza o resumo"""
+
+        from app.models import Department
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+
+        def post_employee(name, department_id, dependents):
+            data = {'name': name, 'department_id': department_id, 'dependents': dependents}
+            response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+            return json.loads(response.data)['employee_id']
+
+        ana_id = post_employee('Ana', ti.id, ['Bia'])
+        bruno_id = post_employee('Bruno', ti.id, [])
+        carla_id = post_employee('Carla', rh.id, ['Davi', 'Eva'])
+        version = json.loads(self.client.get(f'/colaborador/busca_por_id/{ana_id}').data)['version']
+
+        data = {'target_department_id': rh.id, 'employee_ids': [ana_id, bruno_id, carla_id, 999999]}
+        response = self.client.post('/colaborador/mover', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)
+        self.assertEqual(sorted(result['moved']), sorted([ana_id, bruno_id]))
+        self.assertEqual(result['unchanged'], [carla_id])
+        self.assertEqual(result['not_found'], [999999])
+
+        employee = json.loads(self.client.get(f'/colaborador/busca_por_id/{ana_id}').data)
+        self.assertEqual(employee['department']['id'], rh.id)
+        self.assertEqual(employee['version'], version + 1)
+
+        stats = {d['name']: d for d in json.loads(self.client.get('/departament/estatisticas').data)}
+        self.assertEqual(stats['TI']['employee_count'], 0)
+        self.assertEqual(stats['TI']['dependent_count'], 0)
+        self.assertEqual(stats['RH']['employee_count'], 3)
+        self.assertEqual(stats['RH']['dependent_count'], 3)
+
+    def test_move_employees_by_filter_and_validation(self):
+        """Move por filtro do departamento de origem; destino inexistente responde 422 e corpo inválido 400"""
+
+        from app.models import Department
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+        for name, dependents in [('Mário', ['Filho']), ('Marta', []), ('Paula', [])]:
+            data = {'name': name, 'department_id': ti.id, 'dependents': dependents}
+            self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+
+        data = {'target_department_id': rh.id, 'filter': {'department_id': ti.id, 'name_prefix': 'Mar', 'have_dependents': False}}
+        response = self.client.post('/colaborador/mover', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['moved']), 1)
+        response = self.client.get(f'/colaborador/departamento/{rh.id}/colaboradores')
+        self.assertEqual([employee['name'] for employee in json.loads(response.data)], ['Marta'])
+
+        data = {'target_department_id': 999999, 'filter': {'department_id': ti.id}}
+        response = self.client.post('/colaborador/mover', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 422)
+
+        for data in ({'employee_ids': [1]}, {'target_department_id': rh.id},
+                     {'target_department_id': rh.id, 'employee_ids': [1], 'filter': {'department_id': ti.id}},
+                     {'target_department_id': rh.id, 'employee_ids': []},
+                     {'target_department_id': rh.id, 'employee_ids': ['1']},
+                     {'target_department_id': rh.id, 'filter': {'have_dependents': True}},
+                     {'target_department_id': rh.id, 'filter': {'department_id': ti.id, 'have_dependents': 'sim'}}):
+            response = self.client.post('/colaborador/mover', data=json.dumps(data), content_type='application/json')
+            self.assertEqual(response.status_code, 400, data)
+
+    def test_name_prefix_index_declared(self):
+        """O índice do filtro name_prefix é declarado na tabela (visto pelo `flask db migrate`), com varchar_pattern_ops"""
+
+        from sqlalchemy.schema import CreateIndex
+        from sqlalchemy.dialects import postgresql
+        from app.models import Employee
+        index = next(index for index in Employee.__table__.indexes if index.name == 'ix_employee_department_name_pattern')
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        self.assertIn('(department_id, name varchar_pattern_ops)', ddl)
+
+
+
+    ######## Testes da rota /colaborador/excluir_em_lote ########
+    def test_delete_employees_by_ids(self):
+        """Exclusão em lote por IDs remove colaboradores e dependentes e informa os não encontrados"""
+
+        from app.models import Department, Dependent, ChangeLog
+        ti = Department(name="TI")
+        rh = Department(name="RH")
+        db.session.add_all([ti, rh])
+        db.session.commit()
+
+        ids = []
+        for name, department_id, dependents in [('Ana', ti.id, ['Bia']), ('Bruno', ti.id, []), ('Carla', rh.id, ['Davi', 'Eva'])]:
+            data = {'name': name, 'department_id': department_id, 'dependents': dependents}
+            response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+            ids.append(json.loads(response.data)['employee_id'])
+
+        data = {'employee_ids': [ids[0], ids[2], 999999]}
+        response = self.client.post('/colaborador/excluir_em_lote', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.data)
+        self.assertEqual(result['deleted'], sorted([ids[0], ids[2]]))
+        self.assertEqual(result['not_found'], [999999])
+
+        self.assertEqual(self.client.get(f'/colaborador/busca_por_id/{ids[0]}').status_code, 404)
+        self.assertEqual(self.client.get(f'/colaborador/busca_por_id/{ids[1]}').status_code, 200)
+        self.assertEqual(Dependent.query.count(), 0)
+        self.assertEqual(ChangeLog.query.filter_by(entity='employee', action='deleted').count(), 2)
+
+        stats = {d['name']: d for d in json.loads(self.client.get('/departament/estatisticas').data)}
+        self.assertEqual((stats['TI']['employee_count'], stats['TI']['dependent_count']), (1, 0))
+        self.assertEqual((stats['RH']['employee_count'], stats['RH']['dependent_count']), (0, 0))
+
+    def test_delete_employees_by_filter_and_validation(self):
+        """Exclusão em lote por filtro do departamento; corpo inválido responde 400"""
+
+        from app.models import Department
+        ti = Department(name="TI")
+        db.session.add(ti)
+        db.session.commit()
+        for name, dependents in [('Mário', ['Filho']), ('Marta', []), ('Paula', [])]:
+            data = {'name': name, 'department_id': ti.id, 'dependents': dependents}
+            self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+
+        data = {'filter': {'department_id': ti.id, 'have_dependents': False}}
+        response = self.client.post('/colaborador/excluir_em_lote', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['deleted']), 2)
+        response = self.client.get(f'/colaborador/departamento/{ti.id}/colaboradores')
+        self.assertEqual([employee['name'] for employee in json.loads(response.data)], ['Mário'])
+
+        for data in ({}, {'employee_ids': []}, {'employee_ids': [0]}, {'filter': {}},
+                     {'employee_ids': [1], 'filter': {'department_id': ti.id}}):
+            response = self.client.post('/colaborador/excluir_em_lote', data=json.dumps(data), content_type='application/json')
+            self.assertEqual(response.status_code, 400, data)
+
+    def test_concurrent_overlapping_bulk_operations(self):
+        """Exclusão por IDs e movimentação por filtro sobre os mesmos colaboradores, ao mesmo tempo, não entram em deadlock"""
+
+        if db.engine.dialect.name != 'postgresql':
+            self.skipTest('Travas de linha concorrentes requerem Postgres')
+
+        import threading, time
+        from sqlalchemy import insert, text
+        from app.models import Department, Employee
+        from app.routes.employee import employee_repository
+        source, target, others = Department(name="Origem"), Department(name="Destino"), Department(name="Outros")
+        db.session.add_all([source, target, others])
+        db.session.commit()
+        # Volume suficiente para os dois SELECT ... FOR UPDATE usarem índices: pelo id e por (departamento, nome)
+        db.session.execute(insert(Employee), [{'name': f'Outro {i}', 'department_id': others.id} for i in range(2000)])
+        ids = []
+        for name in ('Lote C', 'Lote B', 'Lote A'):  # Ordem dos nomes inversa à dos ids
+            employee = Employee(name=name, department_id=source.id)
+            db.session.add(employee)
+            db.session.commit()
+            ids.append(employee.id)
+        db.session.execute(text('ANALYZE employee'))
+        db.session.commit()
+
+        # Segura a linha do meio: as duas operações travam a sua primeira linha e esperam por ela
+        blocker = db.engine.connect()
+        transaction = blocker.begin()
+        blocker.execute(text('SELECT id FROM employee WHERE id = :id FOR UPDATE'), {'id': ids[1]})
+
+        results = {}
+        def run(name, operation):
+            with self.app.app_context():
+                results[name] = operation()
+                db.session.remove()
+        threads = [
+            threading.Thread(target=run, args=('delete', lambda: employee_repository.delete_employees(employee_ids=ids))),
+            threading.Thread(target=run, args=('move', lambda: employee_repository.move_employees(
+                target.id, source_department_id=source.id, name_prefix='Lote'))),
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        with db.engine.connect() as monitor:
+            while time.monotonic() < deadline:
+                waiting = monitor.execute(text(
+                    "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()"
+                )).scalar()
+                monitor.rollback()
+                if waiting >= 2:
+                    break
+                time.sleep(0.02)
+        transaction.commit()
+        blocker.close()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertIsNotNone(results['delete'])
+        self.assertIsNotNone(results['move'])
+        db.session.expire_all()
+        self.assertEqual(Employee.query.filter(Employee.id.in_(ids)).count(), 3 - len(results['delete']))
+
+
+
     ######## Testes da rota /colaborador/editar/<int:employee_id> ########    
     def test_update_employee_success(self):
         """Teste verifica se um colaborador é atualizado corretamente"""
@@ -155,6 +543,91 @@ class EmployeeTestCase(unittest.TestCase):
 
 
 
+    def test_update_employee_deleted_department(self):
+        """Departamento excluído sai do cache de IDs e é rejeitado com 422 sem consultar o banco"""
+
+        from sqlalchemy import event
+        from app.models import Department, Employee
+        from app.routes.employee import department_id_cache
+        self.department = Department(name="Desenvolvimento")
+        removed_department = Department(name="Marketing")
+        db.session.add_all([self.department, removed_department])
+        db.session.commit()
+        removed_id = removed_department.id
+
+        self.employee = Employee(name="Tiago", department_id=self.department.id)
+        db.session.add(self.employee)
+        db.session.commit()
+
+        department_id_cache.invalidate()
+        self.assertTrue(department_id_cache.contains(removed_id))
+
+        response = self.client.delete(f'/departament/excluir/{removed_id}')
+        self.assertEqual(response.status_code, 200)
+
+        statements = []
+        def count_statement(*args):
+            statements.append(args)
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            self.assertFalse(department_id_cache.contains(removed_id))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+        self.assertEqual(statements, [])
+
+        data = {'department_id': removed_id}
+        response = self.client.put(f'/colaborador/editar/{self.employee.id}', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 422)
+        response_data = json.loads(response.data)
+        self.assertEqual(response_data['error'], 'Departamento não encontrado')
+
+    def test_create_employee_department_committed_out_of_order(self):
+        """Departamento de outro processo com ID menor que um já conhecido é encontrado na próxima recarga"""
+
+        from sqlalchemy import insert
+        from app.models import Department
+        from app.routes.employee import department_id_cache
+
+        department_id_cache.invalidate()
+        self.assertFalse(department_id_cache.contains(0))
+
+        # Cadastro de outro processo (sem sinal neste), com ID menor que o de um cadastro feito por este processo
+        db.session.execute(insert(Department).values(name='Jurídico'))
+        db.session.commit()
+        other_id = Department.query.filter_by(name='Jurídico').one().id
+        response = self.client.post('/departament/cadastrar', data=json.dumps({'name': 'Financeiro'}), content_type='application/json')
+        self.assertLess(other_id, json.loads(response.data)['department_id'])
+
+        # Passado o intervalo mínimo entre recargas
+        department_id_cache._loaded_at -= department_id_cache.min_reload_interval
+        data = {'name': 'Ana', 'department_id': other_id}
+        response = self.client.post('/colaborador/cadastrar', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_department_id_cache_signals_during_load(self):
+        """Uma exclusão sinalizada durante a carga não é desfeita por ela; uma invalidação não quebra a consulta"""
+
+        from app.cache import DepartmentIdCache
+
+        def load_then_delete():
+            # A leitura do conjunto acontece antes de a exclusão do departamento 2 ser confirmada e sinalizada
+            cache._on_department_changed('deleted', items=[(2, 'RH')])
+            return [1, 2]
+        cache = DepartmentIdCache(load_then_delete)
+        self.assertEqual(cache.missing([1, 2]), {2})
+        self.assertFalse(cache.contains(2))
+
+        def load_then_flush():
+            # caches_flush chega pela thread do canal de invalidação no meio da consulta
+            cache.invalidate()
+            return [1, 2]
+        cache = DepartmentIdCache(load_then_flush)
+        self.assertTrue(cache.contains(1))
+        self.assertIsNone(cache._ids)
+
+
+
+
     ######## Testes da rota /colaborador/excluir/<int:employee_id> ########    
     def test_delete_employee_success(self):
         """Teste para verificar se um colaborador é excluido corretamente"""
@@ -215,6 +688,55 @@ class EmployeeTestCase(unittest.TestCase):
         self.assertEqual(response_data['id'], self.employee.id)
         self.assertEqual(response_data['name'], 'Tiago Oliveira')
 
+    def test_get_employee_conditional_and_if_match(self):
+        """ETag do colaborador: 304 enquanto não muda, 412 ao editar ou excluir com versão desatualizada"""
+
+        from app.models import Department, Employee
+        self.department = Department(name="Desenvolvimento")
+        db.session.add(self.department)
+        db.session.commit()
+
+        self.employee = Employee(name="Tiago Oliveira", department_id=self.department.id)
+        db.session.add(self.employee)
+        db.session.commit()
+        employee_id = self.employee.id
+
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}')
+        etag = response.headers['ETag']
+        self.assertTrue(etag)
+
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        data = json.dumps({'name': 'Tiago Silva'})
+        response = self.client.put(f'/colaborador/editar/{employee_id}', data=data, content_type='application/json',
+                                   headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        # A mesma versão lida antes da edição não vale mais
+        response = self.client.put(f'/colaborador/editar/{employee_id}', data=json.dumps({'name': 'Outro'}),
+                                   content_type='application/json', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+        response = self.client.delete(f'/colaborador/excluir/{employee_id}', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['name'], 'Tiago Silva')
+        new_etag = response.headers['ETag']
+        self.assertNotEqual(new_etag, etag)
+
+        # Renomear o departamento também muda o ETag, pois o nome do departamento faz parte da resposta
+        self.client.put(f'/departament/editar/{self.department.id}', data=json.dumps({'name': 'Engenharia'}),
+                        content_type='application/json')
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}', headers={'If-None-Match': new_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['department']['name'], 'Engenharia')
+
+        response = self.client.delete(f'/colaborador/excluir/{employee_id}', headers={'If-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+
     def test_get_employee_not_found(self):
         """Teste para quando tenta buscar um colaborador que não existe"""
 
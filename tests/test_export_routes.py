@@ -0,0 +1,90 @@
+from flask import Flask, json
+import unittest
+import sys
+import os
+import csv
+import io
+import logging
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class ExportTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para exportação")
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        from app.models import Department, Employee, Dependent
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+        self.employee = Employee(name="Tiago", department_id=self.department.id)
+        db.session.add(self.employee)
+        db.session.commit()
+        db.session.add(Dependent(name="Bia", employee_id=self.employee.id))
+        db.session.commit()
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+
+
+
+    ######## Testes da rota /exportar/csv ########
+    def test_export_csv(self):
+        """Exporta as três entidades em um único CSV, lido em lotes pequenos"""
+
+        response = self.client.get('/exportar/csv?lote=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/csv')
+
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(rows[0], ['entity', 'id', 'name', 'department_id', 'employee_id'])
+        self.assertEqual(rows[1], ['department', str(self.department.id), 'TI', '', ''])
+        self.assertEqual(rows[2], ['employee', str(self.employee.id), 'Tiago', str(self.department.id), ''])
+        self.assertEqual(rows[3][0], 'dependent')
+        self.assertEqual(rows[3][4], str(self.employee.id))
+
+    def test_export_csv_invalid_batch_size(self):
+        """Tamanho de lote fora do intervalo retorna erro de validação"""
+
+        response = self.client.get('/exportar/csv?lote=0')
+        self.assertEqual(response.status_code, 400)
+
+
+
+    ######## Testes do comando flask export-org ########
+    def test_export_org_command_parquet(self):
+        """Comando grava o Parquet em row groups e informa linhas por segundo"""
+
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest('pyarrow não instalado')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'organizacao.parquet')
+            result = self.app.test_cli_runner().invoke(
+                args=['export-org', '--format', 'parquet', '--output', path, '--row-group-size', '2']
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn('linhas/s', result.output)
+
+            parquet_file = pq.ParquetFile(path)
+            self.assertEqual(parquet_file.metadata.num_rows, 3)
+            self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+from flask import Flask, json
+import unittest
+import sys
+import os
+import csv
+import io
+import logging
+import time
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.routes.jobs import job_service
+
+class JobsTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para tarefas de fundo")
+        self.app = create_app({'JOB_IMPORT_BATCH_SIZE': 2})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        from app.models import Department
+        self.department = Department(name="TI")
+        db.session.add(self.department)
+        db.session.commit()
+        self.department_id = self.department.id
+
+    def tearDown(self):
+        job_service.shutdown()
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+
+    def wait_for(self, job_id, statuses=('succeeded', 'failed', 'cancelled'), timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = json.loads(self.client.get(f'/jobs/{job_id}').data)
+            if job['status'] in statuses:
+                return job
+            time.sleep(0.02)
+        self.fail(f'Tarefa {job_id} não chegou a {statuses}: {job}')
+
+
+
+    ######## Testes da rota /colaborador/importar ########
+    def test_import_employees(self):
+        """Importação em lotes: cria os válidos e informa os que falharam por item"""
+
+        from app.models import Employee
+        db.session.add(Employee(name="Tiago", department_id=self.department_id))
+        db.session.commit()
+
+        employees = [
+            {'name': 'Ana', 'department_id': self.department_id, 'dependents': ['Bia']},
+            {'name': 'Tiago', 'department_id': self.department_id},
+            {'name': 'Bruno', 'department_id': 999999},
+            {'name': 'Ana', 'department_id': self.department_id},
+            {'name': 'Carla', 'department_id': self.department_id},
+        ]
+        response = self.client.post('/colaborador/importar', data=json.dumps({'employees': employees}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.data)
+        self.assertEqual(response.headers['Location'], data['status_url'])
+
+        job = self.wait_for(data['job_id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual((job['progress'], job['total']), (5, 5))
+        self.assertEqual(job['result']['created'], 2)
+        self.assertEqual(job['result']['failed'], 3)
+        self.assertEqual([(error['index'], error['error']) for error in job['result']['errors']],
+                         [(1, 'Colaborador já existe'), (2, 'Departamento não encontrado'), (3, 'Colaborador já existe')])
+
+        stats = {d['name']: d for d in json.loads(self.client.get('/departament/estatisticas').data)}
+        self.assertEqual(stats['TI']['employee_count'], 3)
+        self.assertEqual(stats['TI']['dependent_count'], 1)
+
+    def test_import_employees_validation(self):
+        """Corpo inválido é rejeitado antes de criar a tarefa"""
+
+        for data in ({}, {'employees': []}, {'employees': [{'name': 'Ana'}]},
+                     {'employees': [{'name': 'Ana', 'department_id': self.department_id, 'dependents': 'Bia'}]}):
+            response = self.client.post('/colaborador/importar', data=json.dumps(data), content_type='application/json')
+            self.assertEqual(response.status_code, 400, data)
+
+    def test_job_queue_full(self):
+        """Acima de JOB_MAX_ACTIVE tarefas ativas, a rota responde 503"""
+
+        self.app.config['JOB_MAX_ACTIVE'] = 0
+        data = {'employees': [{'name': 'Ana', 'department_id': self.department_id}]}
+        response = self.client.post('/colaborador/importar', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+
+
+
+    ######## Testes da rota /exportar/tarefa ########
+    def test_export_job_and_download(self):
+        """Exportação em segundo plano informa o progresso e disponibiliza o arquivo"""
+
+        from app.models import Employee
+        db.session.add_all([Employee(name=f'Colaborador {i}', department_id=self.department_id) for i in range(5)])
+        db.session.commit()
+
+        response = self.client.post('/exportar/tarefa', data=json.dumps({'lote': 2}), content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        job_id = json.loads(response.data)['job_id']
+
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual((job['progress'], job['total'], job['result']['rows']), (6, 6, 6))
+
+        response = self.client.get(f'/jobs/{job_id}/arquivo')
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        response.close()
+        self.assertEqual(len(rows), 7)
+        self.assertEqual([row[0] for row in rows[1:]], ['department'] + ['employee'] * 5)
+
+        self.assertEqual(self.client.post('/exportar/tarefa', data=json.dumps({'format': 'xml'}),
+                                          content_type='application/json').status_code, 400)
+
+    def test_export_files_expire(self):
+        """Arquivos de exportações concluídas há mais de JOB_OUTPUT_RETENTION_SECONDS são removidos na inicialização"""
+
+        from app.models import Job
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        finished = {'antiga': datetime.utcnow() - timedelta(days=2), 'recente': datetime.utcnow()}
+        for job_id, finished_at in finished.items():
+            with open(os.path.join(output_dir, f'{job_id}.csv'), 'w') as output:
+                output.write('entity\n')
+            db.session.add(Job(id=job_id, kind='export_org', status='succeeded', attempts=1, progress=1,
+                               params={'format': 'csv', 'batch_size': 2, 'output_dir': output_dir},
+                               result={'file': f'{job_id}.csv', 'rows': 1}, created_at=finished_at,
+                               finished_at=finished_at))
+        db.session.commit()
+
+        app = create_app({'JOB_OUTPUT_DIR': output_dir, 'JOB_OUTPUT_RETENTION_SECONDS': 86400})  # Reinício do processo
+        self.assertEqual(sorted(os.listdir(output_dir)), ['recente.csv'])
+
+        client = app.test_client()
+        response = client.get('/jobs/antiga/arquivo')
+        self.assertEqual(response.status_code, 410)
+        job = json.loads(client.get('/jobs/antiga').data)
+        self.assertEqual(job['result'], {'rows': 1, 'file_expired': True})
+
+        response = client.get('/jobs/recente/arquivo')
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+
+
+    ######## Testes da rota /jobs/<job_id> ########
+    def test_cancel_job(self):
+        """Tarefa em execução para no próximo ponto de progresso; encerrada não pode ser cancelada"""
+
+        def slow(job):
+            for step in range(job.progress, 500):
+                job.report(step + 1, total=500)
+                time.sleep(0.01)
+            return {'done': True}
+        job_service.register('test_slow', slow)
+
+        job_id, message = job_service.submit('test_slow', {})
+        self.wait_for(job_id, statuses=('running',))
+        response = self.client.post(f'/jobs/{job_id}/cancelar')
+        self.assertEqual(response.status_code, 202)
+
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertLess(job['progress'], 500)
+
+        response = self.client.post(f'/jobs/{job_id}/cancelar')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get('/jobs/naoexiste').status_code, 404)
+        self.assertEqual(self.client.post('/jobs/naoexiste/cancelar').status_code, 404)
+
+    def test_recover_interrupted_jobs(self):
+        """Na inicialização, tarefas sem batimento são retomadas do último lote confirmado ou, esgotadas as tentativas, falham"""
+
+        from app.models import Job, Employee
+        employees = [{'name': name, 'department_id': self.department_id, 'dependents': []}
+                     for name in ('Ana', 'Bruno', 'Carla', 'Davi')]
+        stale = datetime.utcnow() - timedelta(hours=1)
+        db.session.add_all([
+            # Os dois primeiros já tinham sido confirmados quando o processo caiu
+            Job(id='interrompida', kind='import_employees', status='running', attempts=1, progress=2,
+                params={'employees': employees, 'batch_size': 2}, result={'created': 2, 'failed': 0, 'errors': []},
+                created_at=stale, heartbeat_at=stale),
+            Job(id='esgotada', kind='import_employees', status='running', attempts=3, progress=0,
+                params={'employees': employees, 'batch_size': 2}, created_at=stale, heartbeat_at=stale),
+        ])
+        db.session.commit()
+
+        create_app()  # Reinício do processo
+        job = self.wait_for('interrompida')
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['attempts'], 2)
+        self.assertEqual(job['result']['created'], 4)
+        self.assertEqual(sorted(Employee.query.with_entities(Employee.name).all()), [('Carla',), ('Davi',)])
+
+        job = self.wait_for('esgotada')
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'Tarefa interrompida')
+
+    def test_recovered_job_lost_by_previous_run(self):
+        """Uma execução viva dada como interrompida perde a tarefa: não grava progresso nem o status final"""
+
+        from threading import Event
+        started, resume = Event(), Event()
+
+        def slow_start(job):
+            started.set()
+            resume.wait(5)  # ex.: contagem demorada antes do primeiro ponto de progresso
+            job.report(1)
+            return {'attempt': job.attempt}
+        job_service.register('test_slow_start', slow_start)
+
+        job_id, message = job_service.submit('test_slow_start', {})
+        self.assertTrue(started.wait(5))
+
+        # Outro processo reinicia, dá a tarefa como interrompida e a assume
+        repository = job_service.repository
+        repository.recover(datetime.utcnow() + timedelta(seconds=1), max_attempts=3)
+        self.assertEqual(repository.claim(job_id)['attempts'], 2)
+
+        resume.set()
+        job_service.shutdown()
+        db.session.expire_all()
+        job = repository.get_job(job_id)
+        self.assertEqual((job['status'], job['progress'], job['result']), ('running', 0, None))
+
+        repository.finish(job_id, 2, 'succeeded', result={'attempt': 2})
+        self.assertEqual(repository.get_job(job_id)['result'], {'attempt': 2})
+
+    def test_cli_commands_do_not_run_jobs(self):
+        """Um comando `flask` de curta duração não recupera nem executa tarefas"""
+
+        import click
+        from app.models import Job
+        stale = datetime.utcnow() - timedelta(hours=1)
+        db.session.add(Job(id='interrompida', kind='import_employees', status='running', attempts=1, progress=0,
+                           params={'employees': [], 'batch_size': 2}, created_at=stale, heartbeat_at=stale))
+        db.session.commit()
+
+        with click.Context(click.Group('flask'), info_name='flask'):
+            create_app()  # flask db upgrade, flask rebuild-department-stats...
+        self.assertEqual(job_service.submit('import_employees', {})[1], 'Tarefas em segundo plano desativadas')
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Job, 'interrompida').status, 'running')
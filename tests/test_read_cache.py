@@ -0,0 +1,201 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import fnmatch
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.cache import read_cache, LRUCache, SQLiteCache, NetworkCache, TieredCache
+from sqlalchemy import text
+
+
+class FakeRedis:
+    """Substituto em memória do cliente redis-py, com as operações usadas pelo NetworkCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match='*'):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+class BrokenTier:
+    def __getattr__(self, name):
+        def fail(*args):
+            raise ConnectionError('cache fora do ar')
+        return fail
+
+
+class ReadCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para o cache de leituras")
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.redis = FakeRedis()
+        self.app = create_app({'CACHE_L2_PATH': os.path.join(self.cache_dir.name, 'cache.sqlite3'),
+                               'CACHE_NETWORK_CLIENT': self.redis})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        read_cache.clear()
+        self.cache_dir.cleanup()
+
+    def rename_in_database(self, table, row_id, name):
+        """Altera o banco sem passar pelos repositórios, como faria outra aplicação: o cache não fica sabendo."""
+        db.session.execute(text(f'UPDATE {table} SET name = :name WHERE id = :id'), {'name': name, 'id': row_id})
+        db.session.commit()
+
+    def create_department(self, name):
+        response = self.client.post('/departament/cadastrar', json={'name': name})
+        return response.get_json()['department_id']
+
+
+
+    def test_tiers_backfill_and_share(self):
+        """Um valor encontrado no L2 preenche o L1; dois L2 no mesmo arquivo enxergam as mesmas escritas"""
+
+        path = os.path.join(self.cache_dir.name, 'shared.sqlite3')
+        worker_a = TieredCache()
+        worker_a.tiers = [LRUCache(), SQLiteCache(path)]
+        worker_b = TieredCache()
+        worker_b.tiers = [LRUCache(), SQLiteCache(path)]
+
+        worker_a.set('department:1', {'id': 1, 'name': 'TI'})
+        self.assertEqual(worker_b.get('department:1'), {'id': 1, 'name': 'TI'})
+        self.assertEqual(worker_b.tiers[0].get('department:1'), {'id': 1, 'name': 'TI'})
+
+        worker_a.delete_prefix('department:')
+        worker_b.tiers[0].clear()
+        self.assertIsNone(worker_b.get('department:1'))
+
+    def test_load_racing_invalidation_not_cached(self):
+        """Um valor carregado enquanto uma escrita o invalidava não fica em cache"""
+
+        cache = TieredCache()
+        cache.tiers = [LRUCache(), SQLiteCache(os.path.join(self.cache_dir.name, 'race.sqlite3'))]
+
+        def load_before_write():
+            # A escrita confirma (e invalida a chave) entre a leitura e o set
+            cache.delete('department:1')
+            return {'id': 1, 'name': 'Antigo'}
+        self.assertEqual(cache.get_or_load('department:1', load_before_write), {'id': 1, 'name': 'Antigo'})
+        self.assertIsNone(cache.get('department:1'))
+
+        self.assertEqual(cache.get_or_load('department:1', lambda: {'id': 1, 'name': 'Novo'}), {'id': 1, 'name': 'Novo'})
+        self.assertEqual(cache.get('department:1'), {'id': 1, 'name': 'Novo'})
+
+    def test_l2_values_never_unpickled(self):
+        """O L2 grava MessagePack: um pickle plantado no arquivo não é executado, vira apenas falha da camada"""
+
+        path = os.path.join(self.cache_dir.name, 'planted.sqlite3')
+        cache = TieredCache()
+        cache.tiers = [SQLiteCache(path)]
+        cache.set('department:1', {'id': 1, 'name': 'TI', 'body': b'\x00\x01'})
+        self.assertEqual(cache.get('department:1'), {'id': 1, 'name': 'TI', 'body': b'\x00\x01'})
+
+        planted = []
+        class Exploit:
+            def __reduce__(self):
+                return planted.append, ('executado',)
+        import pickle, sqlite3
+        with sqlite3.connect(path) as connection:
+            connection.execute('UPDATE cache SET value = ? WHERE key = ?', (pickle.dumps(Exploit()), 'department:1'))
+        self.assertNotEqual(cache.get('department:1'), {'id': 1, 'name': 'TI', 'body': b'\x00\x01'})
+        self.assertEqual(planted, [])
+
+    def test_default_l2_path_private_directory(self):
+        """O arquivo padrão fica em um diretório 0700 do usuário; um diretório alheio ou aberto desliga o L2"""
+
+        previous = tempfile.tempdir
+        tempfile.tempdir = self.cache_dir.name
+        try:
+            path = TieredCache.default_l2_path(self.app)
+            directory = os.path.dirname(path)
+            self.assertEqual(os.path.dirname(directory), self.cache_dir.name)
+            self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
+
+            os.chmod(directory, 0o777)
+            self.assertIsNone(TieredCache.default_l2_path(self.app))
+        finally:
+            tempfile.tempdir = previous
+
+    def test_network_tier_and_failures(self):
+        """O cache em rede entra como última camada e uma camada fora do ar vira apenas ausência do valor"""
+
+        cache = TieredCache()
+        cache.tiers = [LRUCache(), NetworkCache(self.redis)]
+        self.assertEqual(cache.get_or_load('employee:7', lambda: {'id': 7}), {'id': 7})
+        self.assertIn('telavita:employee:7', self.redis.data)
+
+        cache.tiers = [BrokenTier(), LRUCache(), NetworkCache(self.redis)]
+        self.assertEqual(cache.get('employee:7'), {'id': 7})
+        cache.delete_prefix('employee:')
+        self.assertEqual(self.redis.data, {})
+
+    def test_department_read_cached_and_invalidated_on_write(self):
+        """A leitura vem do cache até uma escrita pelo repositório invalidar todas as camadas"""
+
+        department_id = self.create_department('Financeiro')
+        response = self.client.get(f'/departament/busca_por_id/{department_id}')
+        self.assertEqual(response.get_json()['name'], 'Financeiro')
+        response = self.client.get('/departament/listar')
+        self.assertEqual(response.get_json(), [{'id': department_id, 'name': 'Financeiro'}])
+
+        self.rename_in_database('department', department_id, 'Alterado fora da API')
+        response = self.client.get(f'/departament/busca_por_id/{department_id}')
+        self.assertEqual(response.get_json()['name'], 'Financeiro')
+        self.assertEqual(self.client.get('/departament/listar').get_json()[0]['name'], 'Financeiro')
+
+        response = self.client.put(f'/departament/editar/{department_id}', json={'name': 'Contabilidade'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([key for key in self.redis.data if key.startswith('telavita:department')])
+        response = self.client.get(f'/departament/busca_por_id/{department_id}')
+        self.assertEqual(response.get_json()['name'], 'Contabilidade')
+        self.assertEqual(self.client.get('/departament/listar').get_json()[0]['name'], 'Contabilidade')
+
+    def test_employee_read_invalidated_by_department_rename(self):
+        """Os dados do colaborador incluem o departamento: renomeá-lo invalida o colaborador em cache"""
+
+        department_id = self.create_department('Vendas')
+        response = self.client.post('/colaborador/cadastrar', json={'name': 'Bruna', 'department_id': department_id})
+        employee_id = response.get_json()['employee_id']
+
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}')
+        self.assertEqual(response.get_json()['department']['name'], 'Vendas')
+        self.assertEqual(len(self.client.get(f'/colaborador/departamento/{department_id}/colaboradores').get_json()), 1)
+
+        self.rename_in_database('employee', employee_id, 'Alterado fora da API')
+        self.assertEqual(self.client.get(f'/colaborador/busca_por_id/{employee_id}').get_json()['name'], 'Bruna')
+
+        self.client.put(f'/departament/editar/{department_id}', json={'name': 'Comercial'})
+        employee = self.client.get(f'/colaborador/busca_por_id/{employee_id}').get_json()
+        self.assertEqual(employee['name'], 'Alterado fora da API')
+        self.assertEqual(employee['department']['name'], 'Comercial')
+
+        self.client.post('/colaborador/cadastrar', json={'name': 'Caio', 'department_id': department_id})
+        self.assertEqual(len(self.client.get(f'/colaborador/departamento/{department_id}/colaboradores').get_json()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
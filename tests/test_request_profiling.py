@@ -0,0 +1,81 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import pstats
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class RequestProfilingTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para perfil de requisições")
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.app = create_app({'PROFILING_ENABLED': True, 'PROFILING_DIR': self.profile_dir.name, 'PROFILING_MAX_DUMPS': 2})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.profiler = self.app.extensions['request_profiler']
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        self.profile_dir.cleanup()
+
+    def dumps(self):
+        return sorted(name for name in os.listdir(self.profile_dir.name) if name.endswith('.prof'))
+
+
+
+    def test_disabled_by_default(self):
+        """Sem PROFILING_ENABLED a aplicação não é envolvida pelo profiler"""
+
+        app = create_app()
+        self.assertNotIn('request_profiler', app.extensions)
+        self.assertNotIsInstance(app.wsgi_app, type(self.profiler))
+
+    def test_signed_header_profiles_request(self):
+        """Só requisições com token válido são perfiladas, em qualquer blueprint"""
+
+        response = self.client.get('/departament/listar')
+        self.assertNotIn('X-Profile-Dump', response.headers)
+        response = self.client.get('/departament/listar', headers={'X-Profile-Token': 'token-falso'})
+        self.assertNotIn('X-Profile-Dump', response.headers)
+        self.assertEqual(self.dumps(), [])
+
+        headers = {'X-Profile-Token': self.profiler.create_token()}
+        response = self.client.get('/colaborador/busca_por_id/1', headers=headers)
+        self.assertEqual(response.status_code, 404)
+        dump = response.headers['X-Profile-Dump']
+        self.assertEqual(self.dumps(), [dump])
+
+        stats = pstats.Stats(os.path.join(self.profile_dir.name, dump))
+        self.assertTrue(any(function == 'get_employee_by_id' for _, _, function in stats.stats))
+
+    def test_sampling_and_dump_limit(self):
+        """Com amostragem de 100% toda requisição é perfilada, mantendo só os PROFILING_MAX_DUMPS mais recentes"""
+
+        self.profiler.sample_rate = 1.0
+        names = [self.client.get('/departament/listar').headers['X-Profile-Dump'] for _ in range(4)]
+        self.assertEqual(self.dumps(), sorted(names[-2:]))
+
+    def test_profile_token_command(self):
+        """`flask profile-token` gera um token aceito pelo profiler"""
+
+        result = self.app.test_cli_runner().invoke(args=['profile-token'])
+        header, token = result.output.strip().split(': ')
+        self.assertEqual(header, 'X-Profile-Token')
+        response = self.client.get('/departament/listar', headers={header: token})
+        self.assertIn('X-Profile-Dump', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
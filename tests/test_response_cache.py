@@ -0,0 +1,136 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import gzip
+import msgpack
+import sys
+import os
+import logging
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.cache import read_cache
+from sqlalchemy import text
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para o cache de respostas")
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.app = create_app({'CACHE_L2_PATH': os.path.join(self.cache_dir.name, 'cache.sqlite3'),
+                               'RESPONSE_CACHE_GZIP_MIN_BYTES': 0})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        read_cache.clear()
+        self.cache_dir.cleanup()
+
+    def create_department(self, name):
+        return self.client.post('/departament/cadastrar', json={'name': name}).get_json()['department_id']
+
+    def rename_in_database(self, table, row_id, name):
+        db.session.execute(text(f'UPDATE {table} SET name = :name WHERE id = :id'), {'name': name, 'id': row_id})
+        db.session.commit()
+
+
+
+    def test_list_served_from_cached_bytes(self):
+        """A segunda leitura devolve os bytes guardados, com ETag, sem consultar o banco"""
+
+        department_id = self.create_department('Marketing')
+        first = self.client.get('/departament/listar')
+        self.assertEqual(first.get_json(), [{'id': department_id, 'name': 'Marketing'}])
+        etag = first.headers['ETag']
+
+        self.rename_in_database('department', department_id, 'Alterado fora da API')
+        second = self.client.get('/departament/listar')
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers['ETag'], etag)
+
+        response = self.client.get('/departament/listar', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_variants_by_format_and_encoding(self):
+        """JSON, MessagePack e gzip são variantes separadas da mesma rota"""
+
+        self.create_department('Compras')
+        as_json = self.client.get('/departament/listar')
+        as_msgpack = self.client.get('/departament/listar', headers={'Accept': 'application/msgpack'})
+        self.assertEqual(msgpack.unpackb(as_msgpack.get_data()), as_json.get_json())
+
+        compressed = self.client.get('/departament/listar', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.get_data()), as_json.get_data())
+        self.assertIn('Accept-Encoding', compressed.headers['Vary'])
+
+        columnar = self.client.get('/departament/listar?format=columnar')
+        self.assertEqual(columnar.get_json()['name'], ['Compras'])
+
+    def test_writes_invalidate_cached_responses(self):
+        """Escritas pelos repositórios descartam as respostas afetadas; o ETag do colaborador continua o da versão"""
+
+        department_id = self.create_department('Logística')
+        employee_id = self.client.post('/colaborador/cadastrar', json={'name': 'Davi', 'department_id': department_id}).get_json()['employee_id']
+
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}')
+        etag = response.headers['ETag']
+        self.assertEqual(etag, '"1.1"')
+        self.assertEqual(self.client.get(f'/colaborador/busca_por_id/{employee_id}').headers['ETag'], etag)
+
+        response = self.client.put(f'/colaborador/editar/{employee_id}', json={'name': 'Davi Souza'}, headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}')
+        self.assertEqual(response.get_json()['name'], 'Davi Souza')
+
+        self.client.put(f'/departament/editar/{department_id}', json={'name': 'Expedição'})
+        response = self.client.get(f'/colaborador/busca_por_id/{employee_id}')
+        self.assertEqual(response.get_json()['department']['name'], 'Expedição')
+        self.assertEqual(self.client.get('/departament/listar').get_json()[0]['name'], 'Expedição')
+
+    def test_response_racing_invalidation_not_cached(self):
+        """Uma resposta montada enquanto uma escrita a invalidava não fica em cache"""
+
+        from app.routes.resouces.response_cache import response_cache
+        calls = []
+
+        @self.app.route('/teste/corrida')
+        @response_cache.cached('race')
+        def race():
+            calls.append(1)
+            # A escrita confirma (e invalida as respostas) entre a leitura e o set
+            read_cache.delete_prefix('response:')
+            return 'antigo'
+
+        self.client.get('/teste/corrida')
+        self.client.get('/teste/corrida')
+        self.assertEqual(len(calls), 2)
+
+    def test_write_marker_bypasses_cached_response(self):
+        """O cliente que acabou de escrever não recebe a resposta guardada"""
+
+        department_id = self.create_department('Marketing')
+        self.client.get('/departament/listar')
+        self.rename_in_database('department', department_id, 'Alterado')
+
+        marker = {'X-Read-Primary-Until': f'{time.time() + 1:.3f}'}
+        response = self.client.get('/departament/listar', headers=marker)
+        self.assertEqual(response.get_json()[0]['name'], 'Alterado')
+
+    def test_errors_not_cached(self):
+        """Respostas de erro não são guardadas"""
+
+        self.assertEqual(self.client.get('/colaborador/busca_por_id/999').status_code, 404)
+        self.assertFalse([key for key in read_cache.tiers[0]._items if key.startswith('response:')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+
+class SlowQueryLogTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para o log de consultas lentas")
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.log_dir.name, 'slow.log')
+        self.app = create_app({'SLOW_QUERY_ENABLED': True, 'SLOW_QUERY_THRESHOLD_MS': 0,
+                               'SLOW_QUERY_EXPLAIN_SAMPLE_RATE': 1.0, 'SLOW_QUERY_LOG_FILE': self.log_file})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.slow_query_logger = self.app.extensions['slow_query_logger']
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        self.slow_query_logger.flush()
+        for handler in self.slow_query_logger.logger.handlers:
+            handler.close()
+        self.log_dir.cleanup()
+
+    def entries(self):
+        self.slow_query_logger.flush()
+        with open(self.log_file, encoding='utf-8') as log:
+            return [json.loads(line) for line in log if line.strip()]
+
+
+
+    def test_disabled_by_default(self):
+        """Sem SLOW_QUERY_ENABLED nenhum listener é registrado"""
+
+        app = create_app()
+        self.assertNotIn('slow_query_logger', app.extensions)
+
+    def test_entry_tagged_with_repository_and_route(self):
+        """A entrada identifica o método de repositório e a rota que executaram a consulta"""
+
+        response = self.client.post('/departament/cadastrar', json={'name': 'Financeiro'})
+        self.assertEqual(response.status_code, 201)
+        department_id = response.get_json()['department_id']
+
+        response = self.client.post('/colaborador/cadastrar', json={'name': 'Ana', 'department_id': department_id})
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(f'/colaborador/departamento/{department_id}/colaboradores')
+        self.assertEqual(response.status_code, 200)
+
+        entries = [entry for entry in self.entries()
+                   if entry['repository_method'] == 'EmployeeRepository.get_employees_by_department']
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertGreaterEqual(entry['duration_ms'], 0)
+        self.assertIn('SELECT', entry['statement'])
+        self.assertEqual(entry['route']['endpoint'], 'routes.colaborador.get_employees_by_department')
+        self.assertEqual(entry['route']['method'], 'GET')
+        # EXPLAIN (FORMAT JSON) só existe no Postgres
+        if db.engine.dialect.name == 'postgresql':
+            self.assertIn('Plan', entry['explain'][0])
+        else:
+            self.assertNotIn('explain', entry)
+
+    def test_fast_queries_not_logged(self):
+        """Consultas abaixo do limite não geram entradas"""
+
+        logged = len(self.entries())
+        self.slow_query_logger.threshold = 60
+        response = self.client.get('/departament/listar')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.entries()), logged)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import subprocess
+import json
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Meta de cold start: importar o app e executar create_app() em um processo novo.
+# Em máquinas de CI mais lentas, ajuste com STARTUP_TARGET_SECONDS.
+STARTUP_TARGET_SECONDS = float(os.environ.get('STARTUP_TARGET_SECONDS', '1.5'))
+
+# Só são necessários nos comandos `flask db` ou ao gerar a documentação em /swagger
+CLI_ONLY_MODULES = ('flask_migrate', 'alembic', 'flask_swagger', 'app.swagger.docstrings_departament',
+                    'app.swagger.docstrings_employee')
+
+STARTUP_CODE = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+print(json.dumps({'seconds': time.perf_counter() - started, 'modules': sorted(sys.modules)}))
+'''
+
+# Como o `flask run` do Dockerfile: create_app() dentro do contexto click do comando `run`
+FLASK_RUN_CODE = '''
+import click, json, sys
+from app import create_app
+with click.Context(click.Command('run'), info_name='run'):
+    create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+print(json.dumps({'modules': sorted(sys.modules)}))
+'''
+
+
+class StartupTestCase(unittest.TestCase):
+    def start_app(self, code=STARTUP_CODE):
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_create_app_does_not_import_cli_only_modules(self):
+        """Processos que só atendem requisições não importam Migrate/Alembic nem o Swagger"""
+
+        modules = set(self.start_app()['modules'])
+        self.assertEqual([module for module in CLI_ONLY_MODULES if module in modules], [])
+
+    def test_flask_run_does_not_import_migrate(self):
+        """`flask run` também não importa Migrate/Alembic; o grupo `flask db` os carrega quando usado"""
+
+        modules = set(self.start_app(FLASK_RUN_CODE)['modules'])
+        self.assertEqual([module for module in ('flask_migrate', 'alembic') if module in modules], [])
+
+        sys.path.insert(0, ROOT)
+        from app import create_app
+        app = create_app()
+        result = app.test_cli_runner().invoke(args=['db', '--help'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('upgrade', result.output)
+        self.assertIn('migrate', app.extensions)
+
+    def test_app_creation_time_within_target(self):
+        """Importar o app e executar create_app() fica dentro da meta de cold start (melhor de 3)"""
+
+        seconds = min(self.start_app()['seconds'] for _ in range(3))
+        self.assertLess(seconds, STARTUP_TARGET_SECONDS)
+
+    def test_swagger_attaches_docstrings_on_demand(self):
+        """As docstrings do Swagger são aplicadas quando /swagger é acessado"""
+
+        sys.path.insert(0, ROOT)
+        from app import create_app
+        app = create_app()
+        response = app.test_client().get('/swagger')
+        self.assertEqual(response.status_code, 200)
+        paths = json.loads(response.data)['paths']
+        self.assertIn('Departamentos', paths['/departament/listar']['get']['tags'])
+        self.assertIn('Colaboradores', paths['/colaborador/busca_por_id/{employee_id}']['get']['tags'])
+
+
+if __name__ == '__main__':
+    unittest.main()
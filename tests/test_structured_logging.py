@@ -0,0 +1,109 @@
+from flask import Flask, json
+import unittest
+import tempfile
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.middleware.structured_logging import RepeatedErrorFilter
+
+ERROR_MESSAGE = 'Erro ao acessar o banco: conexão recusada'
+
+class StructuredLoggingTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.DEBUG)
+        logging.debug("Setup de testes para o logging estruturado")
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.log_dir.name, 'app.log')
+        self.app = create_app({'LOG_FILE': self.log_file, 'LOG_ERROR_RATE_LIMIT_SECONDS': 60})
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.structured_logging = self.app.extensions['structured_logging']
+
+        @self.app.route('/teste/erro')
+        def log_error():
+            logging.error(ERROR_MESSAGE)
+            return 'ok'
+
+    def tearDown(self):
+        with self.app_context:
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        db.session.remove()
+        self.app_context.pop()
+        self.structured_logging.flush()
+        for handler in self.structured_logging.listener.handlers:
+            handler.close()
+        self.log_dir.cleanup()
+
+    def entries(self):
+        self.structured_logging.flush()
+        with open(self.log_file, encoding='utf-8') as log:
+            return [json.loads(line) for line in log if line.strip()]
+
+    def route_errors(self):
+        # Só os erros da rota de teste: threads de fundo (canal de invalidação, tarefas) também logam no raiz
+        return [entry for entry in self.entries() if entry['level'] == 'ERROR' and entry['message'] == ERROR_MESSAGE]
+
+
+
+    def test_records_are_queued_not_handled_inline(self):
+        """O logger raiz só enfileira; a escrita fica com o QueueListener"""
+
+        handlers = logging.getLogger().handlers
+        self.assertEqual(handlers, [self.structured_logging.queue_handler])
+
+    def test_request_id_route_and_duration(self):
+        """Registros de uma requisição levam o id, a rota e a duração; a resposta devolve o X-Request-ID"""
+
+        response = self.client.get('/teste/erro', headers={'X-Request-ID': 'abc123'})
+        self.assertEqual(response.headers['X-Request-ID'], 'abc123')
+
+        errors = self.route_errors()
+        self.assertEqual(len(errors), 1)
+        error = errors[0]
+        self.assertEqual(error['request_id'], 'abc123')
+        self.assertEqual(error['route'], 'log_error')
+        self.assertGreaterEqual(error['duration_ms'], 0)
+
+        access = next(entry for entry in self.entries()
+                      if entry['logger'] == 'app.request' and entry.get('request_id') == 'abc123')
+        self.assertEqual(access['status'], 200)
+        self.assertEqual(access['request_id'], 'abc123')
+
+        response = self.client.get('/departament/listar')
+        self.assertEqual(len(response.headers['X-Request-ID']), 32)
+
+    def test_repeated_errors_rate_limited(self):
+        """Erros idênticos repetidos dentro da janela são descartados antes de entrar na fila"""
+
+        for _ in range(5):
+            self.client.get('/teste/erro')
+        self.assertEqual(len(self.route_errors()), 1)
+
+    def test_suppressed_count_reported(self):
+        """Depois da janela, o erro volta a ser registrado com a contagem de descartados"""
+
+        rate_limit = RepeatedErrorFilter(interval=60)
+        record = logging.makeLogRecord({'name': 'app', 'levelno': logging.ERROR, 'msg': 'falha'})
+        self.assertTrue(rate_limit.filter(record))
+        self.assertFalse(rate_limit.filter(logging.makeLogRecord(record.__dict__)))
+        self.assertFalse(rate_limit.filter(logging.makeLogRecord(record.__dict__)))
+
+        # Simula o fim da janela
+        last, suppressed = rate_limit._seen[('app', logging.ERROR, 'falha')]
+        rate_limit._seen[('app', logging.ERROR, 'falha')] = (last - 61, suppressed)
+        later = logging.makeLogRecord(record.__dict__)
+        self.assertTrue(rate_limit.filter(later))
+        self.assertEqual(later.suppressed, 2)
+
+        warning = logging.makeLogRecord({'name': 'app', 'levelno': logging.WARNING, 'msg': 'falha'})
+        self.assertTrue(rate_limit.filter(warning))
+
+if __name__ == '__main__':
+    unittest.main()